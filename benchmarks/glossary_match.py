@@ -0,0 +1,76 @@
+"""Micro-benchmark: glossary matching cost against a 100k-entry glossary.
+
+Compares GlossaryMatcher (prefix-bucketed hash probes) with the naive approach
+of testing every glossary term against every sentence.
+
+Run from the repository root:
+    python -m benchmarks.glossary_match --entries 100000 --sentences 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from src.siminterp.dictionary import GlossaryMatcher
+
+
+def build_glossary(entries: int, rng: random.Random) -> dict[str, str]:
+    glossary: dict[str, str] = {}
+    while len(glossary) < entries:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(rng.randint(1, 3))]
+        term = " ".join(words)
+        glossary[term] = term.upper()
+    return glossary
+
+
+def build_sentences(glossary: dict[str, str], count: int, rng: random.Random) -> list[str]:
+    terms = list(glossary)
+    filler = "the speaker said that we should review this quarter and the next one".split()
+    sentences = []
+    for _ in range(count):
+        words = rng.choices(filler, k=rng.randint(10, 25))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(terms))
+        sentences.append(" ".join(words))
+    return sentences
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--sentences", type=int, default=500)
+    parser.add_argument("--naive-sentences", type=int, default=20, help="Sentences timed with the naive scan.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    glossary = build_glossary(args.entries, rng)
+    sentences = build_sentences(glossary, args.sentences, rng)
+
+    started = time.perf_counter()
+    matcher = GlossaryMatcher(glossary)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    hits = sum(len(matcher.relevant(sentence)) for sentence in sentences)
+    match_seconds = time.perf_counter() - started
+
+    sample = sentences[: args.naive_sentences]
+    started = time.perf_counter()
+    for sentence in sample:
+        lowered = sentence.lower()
+        [term for term in glossary if term in lowered]
+    naive_seconds = time.perf_counter() - started
+
+    print(f"glossary entries:      {len(glossary):>10,}")
+    print(f"index build:               {build_seconds * 1000:>10.1f} ms (once per session)")
+    print(f"matched sentences:     {len(sentences):>10,} ({hits} hits)")
+    print(f"matcher per sentence:  {match_seconds / len(sentences) * 1e6:>10.1f} us")
+    print(f"naive per sentence:    {naive_seconds / max(len(sample), 1) * 1e6:>10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
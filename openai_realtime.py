@@ -8,6 +8,8 @@ import ssl
 import time
 from array import array
 from urllib.parse import urlparse
+
+from src.siminterp.audio.echo import PlaybackMonitor
 try:
     import certifi
     HAVE_CERTIFI = True
@@ -44,8 +46,9 @@ class RealtimeTranslator:
         self._translation_printed = False
         self._transcript_done = False
         self._translation_done = False
-        self._mute_input_until = 0.0
-        self._mute_ms = int(os.environ.get("OPENAI_MUTE_DURING_PLAY_MS", "1200") or "800")
+        # 扬声器实际发声的时间段；麦克风只在外放期间（加上混响余音）静音，而不是每次写入后固定静音一段时间
+        self.playback = PlaybackMonitor()
+        self._echo_tail = int(os.environ.get("OPENAI_ECHO_TAIL_MS", "300") or "300") / 1000.0
 
     def setup_audio(self):
         """初始化麦克风输入和扬声器输出流"""
@@ -91,7 +94,7 @@ class RealtimeTranslator:
                     await asyncio.sleep(0)
                     continue
                 now = time.monotonic()
-                if now < self._mute_input_until:
+                if self._playing(now - CHUNK / RATE - self._echo_tail, now):
                     frames_since_commit = 0
                     speaking = False
                     await asyncio.sleep(0)
@@ -164,8 +167,10 @@ class RealtimeTranslator:
                     if audio_content:
                         # 解码 base64 并写入扬声器流
                         audio_data = base64.b64decode(audio_content)
-                        self.audio_out_stream.write(audio_data)
-                        self._mute_input_until = time.monotonic() + (self._mute_ms / 1000.0)
+                        # 写入的音频排在输出缓冲之后，约一个输出延迟后才真正发声
+                        delay = self.audio_out_stream.get_output_latency()
+                        self.playback.record(audio_data, RATE, CHANNELS, delay=delay)
+                        await asyncio.to_thread(self.audio_out_stream.write, audio_data)
                 
                 elif event_type == "response.audio_transcript.delta":
                     self._emit_translation(event.get("delta", ""))
@@ -268,6 +273,11 @@ class RealtimeTranslator:
                 self.receive_audio(websocket)
             )
 
+    def _playing(self, start: float, end: float) -> bool:
+        """扬声器在 [start, end)（monotonic 秒）内是否在播放翻译语音"""
+        _, playing = self.playback.envelope(start, end)
+        return bool(playing.any())
+
     def close(self):
         if self.audio_in_stream:
             self.audio_in_stream.stop_stream()
@@ -1,71 +1,351 @@
 from __future__ import annotations
 
-from openai import OpenAI
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Mapping, Optional, Sequence
+
 from rich.console import Console
 
-from .audio.devices import print_devices
 from .cli import parse_args
 from .config import AppConfig, build_config
-from .dictionary import load_dictionary
-from .logging_utils import RichLogger
-from .pipeline import InterpretationPipeline
-from .transcription.engines import create_transcriber
-from .translation.openai_translator import OpenAITranslator
-from .tts.speech import OpenAITTSEngine, CoquiTTSEngine, EdgeTTSEngine, TTSEngineProtocol
+from .logging_utils import RichLogger, configure_log_rotation
+from .startup import startup_phase, startup_profile
+
+# Everything else is imported where it is used, so each command loads only what it needs:
+# --list-devices never imports the OpenAI SDK, and the speech model loads while it does.
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+    from .transcription.engines import Transcriber
+    from .translation.base import Translator
+    from .translation.summarizer import ContextSummarizer
+    from .tts.speech import TTSEngineProtocol
+
 
+def build_client(config: AppConfig, base_url: Optional[str] = None) -> OpenAI:
+    """Create an OpenAI client whose requests share the process-wide limiter for its endpoint."""
+
+    from openai import DefaultHttpxClient, OpenAI
+
+    from .ratelimit import RateLimitedTransport, shared_limiter
+
+    base_url = base_url or config.base_url
+    if not config.rate_limit:
+        return OpenAI(api_key=config.api_key, base_url=base_url)
+    limiter = shared_limiter(
+        base_url or "https://api.openai.com/v1",
+        rate=config.api_rate,
+        max_concurrency=config.api_concurrency,
+    )
+    http_client = DefaultHttpxClient(transport=RateLimitedTransport(limiter))
+    return OpenAI(api_key=config.api_key, base_url=base_url, http_client=http_client)
 
-def build_translator(config: AppConfig, client: OpenAI) -> OpenAITranslator | None:
+
+def build_translator(
+    config: AppConfig,
+    client: Optional[OpenAI],
+    dictionary: Optional[Mapping[str, str]] = None,
+    source_language: Optional[str] = None,
+    target_language: Optional[str] = None,
+) -> Translator | None:
     if not config.enable_translation:
         return None
-    return OpenAITranslator(client=client, model=config.openai_model, temperature=config.translation_temperature)
+    from .translation.hedging import HedgePolicy
+    from .translation.openai_translator import OpenAITranslator
+
+    if config.translator_backend == "ctranslate2":
+        from .translation.local_translator import CTranslate2Translator
 
+        translator = CTranslate2Translator(
+            source_language=source_language or config.input_language,
+            model=config.local_mt_model,
+            device=config.whisper_device,
+            local_files_only=config.offline,
+        )
+        translator.warm_up(target_language or config.translation_language)
+        return translator
+    hedge = None
+    hedge_client = None
+    if config.hedge_translation:
+        hedge = HedgePolicy(percentile=config.hedge_percentile, max_rate=config.hedge_max_rate)
+        if config.hedge_base_url:
+            hedge_client = build_client(config, config.hedge_base_url)
+    return OpenAITranslator(
+        client=client,
+        model=config.openai_model,
+        temperature=config.translation_temperature,
+        glossary=dict(dictionary or {}),
+        context_token_budget=config.context_token_budget,
+        hedge=hedge,
+        hedge_client=hedge_client,
+        hedge_model=config.hedge_model,
+    )
 
-def build_tts_engine(config: AppConfig, client: OpenAI) -> TTSEngineProtocol | None:
+
+def build_summarizer(config: AppConfig, client: Optional[OpenAI]) -> ContextSummarizer | None:
+    if not (config.enable_translation and config.summarize_context):
+        return None
+    if config.translator_backend != "openai":
+        # Sentence-level MT models cannot use a running brief.
+        return None
+    from .translation.openai_translator import OpenAITranslator
+    from .translation.summarizer import ContextSummarizer
+
+    writer = OpenAITranslator(
+        client=client,
+        model=config.summary_model or config.openai_model,
+        temperature=0.0,
+    )
+    return ContextSummarizer(
+        complete=writer.complete,
+        language=config.translation_language,
+        interval=config.summary_interval,
+    )
+
+
+def build_tts_engine(
+    config: AppConfig, client: Optional[OpenAI], language: Optional[str] = None, voice: Optional[str] = None
+) -> TTSEngineProtocol | None:
     if not config.enable_tts:
         return None
-    
-    if config.tts_provider == "coqui":
+    from .tts.failover import FailoverTTSEngine
+    from .tts.segmenter import SegmentedTTSEngine
+
+    language = language or config.translation_language
+
+    engine = _build_tts_provider(config, client, config.tts_provider, language, voice)
+    fallbacks = [provider for provider in config.tts_fallback if provider != config.tts_provider]
+    if fallbacks:
+        providers = [(config.tts_provider, engine)]
+        providers += [(name, _build_tts_provider(config, client, name, language, None)) for name in fallbacks]
+        engine = FailoverTTSEngine(
+            providers, first_byte_timeout=config.tts_first_byte_timeout, race=config.tts_race
+        )
+    if not config.tts_split:
+        return engine
+    # A local model runs one synthesis at a time; it still benefits from sentence-sized requests.
+    local = "coqui" in [config.tts_provider, *fallbacks]
+    workers = 1 if local else config.tts_parallelism
+    return SegmentedTTSEngine(engine, language=language, max_workers=workers)
+
+
+def _build_tts_provider(
+    config: AppConfig, client: Optional[OpenAI], provider: str, language: str, voice: Optional[str]
+) -> TTSEngineProtocol:
+    from .language import normalize_language
+    from .openai_models import DEFAULT_TTS_MODEL
+    from .tts.cache import DEFAULT_CACHE_DIR as DEFAULT_TTS_CACHE_DIR, CachedTTSEngine, shared_cache
+    from .tts.speech import EDGE_DEFAULT_VOICES, CoquiTTSEngine, EdgeTTSEngine, OpenAITTSEngine
+
+    # --voice belongs to the primary provider; fallbacks use their own defaults.
+    if voice is None and provider == config.tts_provider and language == config.translation_language:
+        voice = config.tts_voice
+
+    engine: TTSEngineProtocol
+    if provider == "coqui":
         # Use user-provided model or default to XTTS v2
         model_name = config.tts_model if config.tts_model != "tts-1" else "tts_models/multilingual/multi-dataset/xtts_v2"
-        return CoquiTTSEngine(model_name=model_name, speed=config.tts_speed)
+        if provider != config.tts_provider:
+            model_name = "tts_models/multilingual/multi-dataset/xtts_v2"
+        # --voice is an XTTS speaker name or a reference WAV to clone; "alloy" is the OpenAI default.
+        speaker = voice if voice != "alloy" else None
+        engine = CoquiTTSEngine(model_name=model_name, speaker=speaker, speed=config.tts_speed, language=language)
+    elif provider == "edge-tts":
+        # --voice is the voice for the target language; otherwise use a stock voice for the language,
+        # since the default "alloy" is an OpenAI voice.
+        if voice == "alloy":
+            voice = None
+        voice = voice or EDGE_DEFAULT_VOICES.get(normalize_language(language), "en-US-AriaNeural")
+        engine = EdgeTTSEngine(voice=voice, speed=config.tts_speed)
+    else:
+        model = config.tts_model if provider == config.tts_provider else DEFAULT_TTS_MODEL
+        if voice is None and provider == config.tts_provider:
+            voice = config.tts_voice
+        engine = OpenAITTSEngine(client=client, model=model, voice=voice or "alloy", speed=config.tts_speed)
+
+    if config.tts_cache:
+        cache = shared_cache(
+            config.tts_cache_dir or DEFAULT_TTS_CACHE_DIR,
+            max_bytes=config.tts_cache_mb * 1024 * 1024,
+            compress=config.tts_cache_compress,
+        )
+        # Inside the splitter, so sentences are cached one by one and recur more often.
+        engine = CachedTTSEngine(engine, cache)
+    return engine
 
-    if config.tts_provider == "edge-tts":
-        # Use user-provided voice or default to en-US-AriaNeural if default "alloy" is still set
-        voice = config.tts_voice if config.tts_voice != "alloy" else "en-US-AriaNeural"
-        return EdgeTTSEngine(voice=voice, speed=config.tts_speed)
 
-    return OpenAITTSEngine(client=client, model=config.tts_model, voice=config.tts_voice, speed=config.tts_speed)
+def prewarm_tts(config: AppConfig, engines: Sequence[TTSEngineProtocol | None], logger: RichLogger) -> None:
+    """Fill the TTS cache with every phrase of ``config.prewarm_path`` for each engine."""
+
+    from .tts.cache import CachedTTSEngine
+    from .tts.failover import FailoverTTSEngine
+    from .tts.segmenter import SegmentedTTSEngine
+
+    assert config.prewarm_path is not None
+    phrases = config.prewarm_path.read_text(encoding="utf-8").splitlines()
+    for engine in engines:
+        segments = phrases
+        if isinstance(engine, SegmentedTTSEngine):
+            # Cache what playback will look up: the phrases as the splitter cuts them.
+            segments = [segment for phrase in phrases for segment in engine.split(phrase)]
+            engine = engine.engine
+        if isinstance(engine, FailoverTTSEngine):
+            # Fallbacks only speak when the primary fails; warm the voice that normally plays.
+            engine = engine.providers[0][1]
+        if not isinstance(engine, CachedTTSEngine):
+            continue
+        synthesized, cached = engine.prewarm(segments)
+        logger.log_panel(
+            f"{type(engine.engine).__name__}: synthesized {synthesized} phrases, {cached} already cached "
+            f"({len(engine.cache)} clips, {engine.cache.size_bytes / 1e6:.1f} MB in {engine.cache.directory})",
+            "INFO",
+            "cyan",
+        )
+
+
+def build_reverse_components(
+    config: AppConfig,
+    client: Optional[OpenAI],
+    dictionary: Optional[Mapping[str, str]],
+    translator: Translator | None,
+    tts_engine: TTSEngineProtocol | None,
+) -> tuple[Translator | None, TTSEngineProtocol | None]:
+    """Return the translator and TTS engine for the target-to-input direction of --bidirectional.
+
+    ``None`` means the pipeline reuses the forward component. OpenAI translators take the target
+    language per request, so only a glossary needs a second instance; local MT models are per pair.
+    """
+
+    if not config.bidirectional:
+        return None, None
+    from .dictionary import invert_dictionary
+
+    reverse_translator = None
+    if translator is not None and (config.translator_backend != "openai" or dictionary):
+        reverse_translator = build_translator(
+            config,
+            client,
+            invert_dictionary(dictionary or {}),
+            source_language=config.translation_language,
+            target_language=config.input_language,
+        )
+    reverse_tts = None
+    if tts_engine is not None:
+        reverse_tts = build_tts_engine(config, client, language=config.input_language, voice=config.reverse_voice)
+    return reverse_translator, reverse_tts
+
+
+def apply_offline_mode() -> None:
+    """Stop Hugging Face libraries from reaching the network for model files."""
+
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+
+def uses_openai(config: AppConfig) -> bool:
+    """Whether any configured component talks to an OpenAI-compatible API (local-only setups skip the SDK)."""
+
+    translation = config.enable_translation and config.translator_backend == "openai"
+    tts = config.enable_tts and "openai" in (config.tts_provider, *config.tts_fallback)
+    return translation or tts
+
+
+def load_transcriber(config: AppConfig) -> Transcriber:
+    with startup_phase("transcriber", "import"):
+        from .transcription.engines import create_transcriber
+    with startup_phase("transcriber", "load"):
+        transcriber = create_transcriber(config)
+    warm_up = getattr(transcriber, "warm_up", None)
+    if warm_up is not None:
+        with startup_phase("transcriber", "warm-up"):
+            warm_up()
+    return transcriber
 
 
 def main() -> None:
     args = parse_args()
 
     if args.list_devices:
+        with startup_phase("audio devices", "import"):
+            from .audio.devices import print_devices
         console = Console()
-        print_devices(console)
+        with startup_phase("audio devices", "list"):
+            print_devices(console)
+        if args.profile_startup:
+            console.print(startup_profile().summary(), highlight=False)
         return
 
     config = build_config(args)
+    if config.offline:
+        apply_offline_mode()
+    with startup_phase("audio output", "import"):
+        from .audio.player import configure_output
+    configure_output(config.output_sink, config.output_rate, config.output_roll_seconds)
+    configure_log_rotation(config.log_max_bytes, config.log_rotate_seconds, config.log_backups)
+    if config.event_log is not None or config.metrics_port is not None:
+        from .metrics import REGISTRY, MetricsServer, configure_events
+
+        configure_events(config.event_log)
+        if config.metrics_port is not None:
+            server = MetricsServer(REGISTRY, config.metrics_host, config.metrics_port)
+            Console(stderr=True).print(f"Metrics: {server.url}")
+
+    if config.prewarm_path is not None:
+        logger = RichLogger(log_file=config.log_file)
+        if not config.tts_cache:
+            raise ValueError("--prewarm-tts fills the TTS cache; it cannot be combined with --no-tts-cache")
+        client = build_client(config) if uses_openai(config) else None
+        engines = [build_tts_engine(config, client)]
+        if config.bidirectional:
+            engines.append(
+                build_tts_engine(config, client, language=config.input_language, voice=config.reverse_voice)
+            )
+        prewarm_tts(config, engines, logger)
+        return
 
     if args.gui:
         from .gui import run_gui
         run_gui(config)
         return
 
-    logger = RichLogger(log_file=config.log_file)
+    # Raw audio on stdout leaves the console output to stderr.
+    console = Console(stderr=True) if config.output_sink in ("-", "stdout") else Console()
+    logger = RichLogger(log_file=config.log_file, console=console)
 
-    dictionary = load_dictionary(config.dictionary_path)
-    if dictionary:
-        logger.log_panel(
-            f"Loaded {len(dictionary)} custom terms from {config.dictionary_path}",
-            "INFO",
-            "cyan",
-        )
+    # The speech model is the slowest component to start; it loads while the rest are imported and built.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup") as loader:
+        pending_transcriber = loader.submit(load_transcriber, config)
+
+        from .dictionary import load_dictionary
+
+        dictionary = load_dictionary(config.dictionary_path)
+        if dictionary:
+            logger.log_panel(
+                f"Loaded {len(dictionary)} custom terms from {config.dictionary_path}",
+                "INFO",
+                "cyan",
+            )
 
-    client = OpenAI(api_key=config.api_key, base_url=config.base_url)
-    transcriber = create_transcriber(config)
-    translator = build_translator(config, client)
-    tts_engine = build_tts_engine(config, client)
+        client = None
+        if uses_openai(config):
+            with startup_phase("openai", "import"):
+                import openai  # noqa: F401
+            with startup_phase("openai", "client"):
+                client = build_client(config)
+        with startup_phase("translator"):
+            translator = build_translator(config, client, dictionary)
+        with startup_phase("tts"):
+            tts_engine = build_tts_engine(config, client)
+        with startup_phase("summarizer"):
+            summarizer = build_summarizer(config, client) if translator is not None else None
+        with startup_phase("reverse direction"):
+            reverse_translator, reverse_tts_engine = build_reverse_components(
+                config, client, dictionary, translator, tts_engine
+            )
+        with startup_phase("pipeline", "import"):
+            from .pipeline import InterpretationPipeline
+        with startup_phase("transcriber", "wait"):
+            transcriber = pending_transcriber.result()
 
     if config.enable_translation and translator is None:
         logger.log_panel("Translation disabled because no translator could be created.", "WARN", "yellow")
@@ -79,6 +359,9 @@ def main() -> None:
         dictionary=dictionary,
         translator=translator,
         tts_engine=tts_engine,
+        summarizer=summarizer,
+        reverse_translator=reverse_translator,
+        reverse_tts_engine=reverse_tts_engine,
     )
     pipeline.run()
 
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pyaudio
 from rich.console import Console
@@ -12,32 +13,262 @@ class AudioDevice:
     index: int
     name: str
     channels: int
+    host_api: str = ""
+    default_rate: int = 0
 
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Identity that survives re-enumeration, unlike ``index`` which shifts on hot-plug."""
 
-def enumerate_devices() -> Tuple[List[AudioDevice], List[AudioDevice]]:
-    audio = pyaudio.PyAudio()
-    input_devices: List[AudioDevice] = []
-    output_devices: List[AudioDevice] = []
-    try:
+        return (self.host_api, self.name)
+
+
+# Rates tried when probing a device, most common first.
+CANDIDATE_RATES = (48000, 44100, 24000, 32000, 22050, 16000, 96000, 11025, 8000)
+
+
+class DeviceRegistry:
+    """Audio devices enumerated once per PortAudio session, with probed capabilities.
+
+    One ``PyAudio`` instance is kept open for enumeration, probing and playback
+    instead of initialising PortAudio for every query. The 16-bit rates a device
+    accepts are probed with ``is_format_supported`` the first time they are asked
+    for and cached by host API and device name, so they survive :meth:`refresh`
+    (which re-initialises PortAudio to pick up hot-plugged devices) even when the
+    device indices change.
+
+    PortAudio only re-scans devices once every session is terminated, so output
+    streams are opened through :meth:`open_stream` / :meth:`close_stream` and a
+    refresh requested while any is open waits until the last one closes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._audio: Optional[pyaudio.PyAudio] = None
+        self._streams = 0
+        self._refresh_pending = False
+        self._inputs: List[AudioDevice] = []
+        self._outputs: List[AudioDevice] = []
+        self._by_index: Dict[int, AudioDevice] = {}
+        self._default_input: Optional[int] = None
+        self._default_output: Optional[int] = None
+        # (host API, device name, "input"/"output", channels) -> supported rates
+        self._rates: Dict[Tuple[str, str, str, int], List[int]] = {}
+
+    @property
+    def audio(self) -> pyaudio.PyAudio:
+        """The shared PortAudio session; streams for playback are opened on it."""
+
+        with self._lock:
+            if self._audio is None:
+                self._enumerate(pyaudio.PyAudio())
+            assert self._audio is not None
+            return self._audio
+
+    def devices(self) -> Tuple[List[AudioDevice], List[AudioDevice]]:
+        """Return ``(input_devices, output_devices)``."""
+
+        with self._lock:
+            _ = self.audio
+            return list(self._inputs), list(self._outputs)
+
+    def device(self, index: Optional[int], output: bool = True) -> Optional[AudioDevice]:
+        """Return the device at ``index``, or the default device when ``index`` is ``None``."""
+
+        with self._lock:
+            _ = self.audio
+            if index is None:
+                index = self._default_output if output else self._default_input
+            return self._by_index.get(index) if index is not None else None
+
+    def find(self, key: Tuple[str, str], output: bool = True) -> Optional[int]:
+        """Return the current index of the device with ``key`` (host API, name), if still present."""
+
+        with self._lock:
+            _ = self.audio
+            for device in self._outputs if output else self._inputs:
+                if device.key == key:
+                    return device.index
+            return None
+
+    def refresh(self) -> bool:
+        """Re-enumerate devices (PortAudio only sees hot-plugged devices after re-initialising).
+
+        Returns whether the device list changed. While streams are open on the current
+        session the refresh is deferred until the last one is closed, and ``False`` is
+        returned. A microphone opened by ``speech_recognition`` holds its own session,
+        which also keeps PortAudio from re-scanning until it is closed.
+        """
+
+        with self._lock:
+            if self._streams:
+                self._refresh_pending = True
+                return False
+            return self._reinitialise()
+
+    def open_stream(self, **options) -> pyaudio.Stream:
+        """Open a stream on the shared session (``PyAudio.open`` arguments); close it with :meth:`close_stream`."""
+
+        with self._lock:
+            stream = self.audio.open(**options)
+            self._streams += 1
+            return stream
+
+    def close_stream(self, stream: pyaudio.Stream) -> None:
+        try:
+            stream.close()
+        finally:
+            with self._lock:
+                self._streams = max(0, self._streams - 1)
+                if not self._streams and self._refresh_pending:
+                    self._reinitialise()
+
+    def output_rates(self, index: Optional[int], channels: int = 1) -> List[int]:
+        """Return the 16-bit output rates the device accepts (empty if it could not be probed)."""
+
+        return self._probe(index, channels, output=True)
+
+    def input_rates(self, index: Optional[int], channels: int = 1) -> List[int]:
+        return self._probe(index, channels, output=False)
+
+    def forget_rate(self, index: Optional[int], channels: int, rate: int, output: bool = True) -> None:
+        """Drop ``rate`` from the cache after the device refused to open a stream at it."""
+
+        with self._lock:
+            device = self.device(index, output)
+            if device is None:
+                return
+            rates = self._rates.get((*device.key, "output" if output else "input", channels))
+            if rates and rate in rates:
+                rates.remove(rate)
+
+    def close(self) -> None:
+        """Terminate the PortAudio session; the next query starts a new one."""
+
+        with self._lock:
+            session, self._audio = self._audio, None
+            self._streams = 0
+            self._refresh_pending = False
+            if session is not None:
+                session.terminate()
+
+    def _reinitialise(self) -> bool:
+        before = [device.key for device in self._inputs + self._outputs]
+        self._refresh_pending = False
+        # Terminate first: while any session is open, a new one reuses the old device list.
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
+        self._enumerate(pyaudio.PyAudio())
+        return before != [device.key for device in self._inputs + self._outputs]
+
+    def _probe(self, index: Optional[int], channels: int, output: bool) -> List[int]:
+        with self._lock:
+            device = self.device(index, output)
+            if device is None:
+                return []
+            key = (*device.key, "output" if output else "input", channels)
+            cached = self._rates.get(key)
+            if cached is not None:
+                return list(cached)
+            audio = self.audio
+            rates: List[int] = []
+            for rate in CANDIDATE_RATES:
+                if output:
+                    options = dict(output_device=device.index, output_channels=channels, output_format=pyaudio.paInt16)
+                else:
+                    options = dict(input_device=device.index, input_channels=channels, input_format=pyaudio.paInt16)
+                try:
+                    if audio.is_format_supported(rate, **options):
+                        rates.append(rate)
+                except ValueError:
+                    continue
+            self._rates[key] = rates
+            return list(rates)
+
+    def _enumerate(self, audio: pyaudio.PyAudio) -> None:
+        inputs: List[AudioDevice] = []
+        outputs: List[AudioDevice] = []
+        by_index: Dict[int, AudioDevice] = {}
         for idx in range(audio.get_device_count()):
             info = audio.get_device_info_by_index(idx)
             max_input = int(info.get("maxInputChannels", 0))
             max_output = int(info.get("maxOutputChannels", 0))
             name = str(info.get("name", f"Device {idx}"))
+            host_api = _host_api_name(audio, info)
+            rate = int(info.get("defaultSampleRate", 0) or 0)
             if max_input > 0:
-                input_devices.append(AudioDevice(idx, name, max_input))
+                inputs.append(AudioDevice(idx, name, max_input, host_api, rate))
             if max_output > 0:
-                output_devices.append(AudioDevice(idx, name, max_output))
-    finally:
-        audio.terminate()
-    return input_devices, output_devices
+                outputs.append(AudioDevice(idx, name, max_output, host_api, rate))
+            by_index[idx] = AudioDevice(idx, name, max(max_input, max_output), host_api, rate)
+        self._audio = audio
+        self._inputs, self._outputs, self._by_index = inputs, outputs, by_index
+        self._default_input = _default_index(audio.get_default_input_device_info)
+        self._default_output = _default_index(audio.get_default_output_device_info)
+
+
+def _host_api_name(audio: pyaudio.PyAudio, info: Dict) -> str:
+    try:
+        return str(audio.get_host_api_info_by_index(int(info.get("hostApi", 0))).get("name", ""))
+    except (IOError, OSError, AttributeError):
+        return ""
+
+
+def _default_index(lookup) -> Optional[int]:
+    try:
+        return int(lookup()["index"])
+    except (IOError, OSError, AttributeError):
+        return None
+
+
+_REGISTRY: Optional[DeviceRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def device_registry() -> DeviceRegistry:
+    """Return the process-wide device registry, creating it once."""
+
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = DeviceRegistry()
+        return _REGISTRY
+
+
+def enumerate_devices() -> Tuple[List[AudioDevice], List[AudioDevice]]:
+    return device_registry().devices()
+
+
+def preferred_output_rate(supported: List[int], rate: int) -> Optional[int]:
+    """Pick the rate to open for audio at ``rate``.
+
+    The rate itself if supported, else the smallest whole multiple of it (the cheapest
+    and cleanest conversion, e.g. 24 kHz to 48 kHz), else the closest rate above it.
+    """
+
+    if rate in supported:
+        return rate
+    multiples = sorted(candidate for candidate in supported if candidate % rate == 0)
+    if multiples:
+        return multiples[0]
+    higher = sorted(candidate for candidate in supported if candidate > rate)
+    if higher:
+        return higher[0]
+    return max(supported) if supported else None
 
 
 def print_devices(console: Console) -> None:
-    inputs, outputs = enumerate_devices()
+    registry = device_registry()
+    inputs, outputs = registry.devices()
     console.print("#### INPUT DEVICES")
     for device in inputs:
-        console.print(f"{device.index}: {device.name} (channels: {device.channels})")
+        console.print(_describe(device, registry.input_rates(device.index)))
     console.print("\n#### OUTPUT DEVICES")
     for device in outputs:
-        console.print(f"{device.index}: {device.name} (channels: {device.channels})")
+        console.print(_describe(device, registry.output_rates(device.index)))
+
+
+def _describe(device: AudioDevice, rates: List[int]) -> str:
+    listed = ", ".join(f"{rate / 1000:g}k" for rate in rates) or "unknown"
+    return f"{device.index}: {device.name} [{device.host_api}] (channels: {device.channels}; 16-bit rates: {listed})"
@@ -0,0 +1,178 @@
+"""Recognise our own synthesized speech when the microphone picks it up again."""
+
+from __future__ import annotations
+
+import audioop
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+FRAME_SECONDS = 0.01  # resolution of the loudness envelopes that are compared
+ECHO_MODES = ("off", "gate", "correlate")
+
+
+def _envelope(pcm: bytes, rate: int, channels: int = 1, sample_width: int = 2) -> np.ndarray:
+    """Log loudness of ``pcm`` per 10 ms frame (the last frame may be shorter)."""
+
+    if sample_width != 2:
+        pcm = audioop.lin2lin(pcm, sample_width, 2)
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    step = max(1, int(rate * FRAME_SECONDS))
+    count = -(-len(samples) // step)
+    padded = np.zeros(count * step, dtype=np.float32)
+    padded[: len(samples)] = samples
+    frames = padded.reshape(count, step)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return np.log1p(rms).astype(np.float32)
+
+
+class PlaybackMonitor:
+    """What the player sent to the speaker and when it became audible, as a loudness envelope.
+
+    The player calls :meth:`record` for every block it writes, with the delay
+    until the block is heard (the audio already buffered ahead of it). Only the
+    last ``history_seconds`` are kept.
+    """
+
+    def __init__(self, history_seconds: float = 30.0) -> None:
+        self.history = int(history_seconds / FRAME_SECONDS)
+        # (index of the first 10 ms frame on the monotonic clock, envelope)
+        self._blocks: Deque[Tuple[int, np.ndarray]] = deque()
+        self._next_frame = 0
+        self._lock = threading.Lock()
+
+    def record(self, pcm: bytes, rate: int, channels: int = 1, delay: float = 0.0) -> None:
+        if not pcm:
+            return
+        envelope = _envelope(pcm, rate, channels)
+        start = int((time.monotonic() + delay) / FRAME_SECONDS)
+        with self._lock:
+            # Blocks play back to back, so one that would start before its predecessor ends
+            # (clock jitter, a sink that does not report its buffer) follows it instead; a
+            # predecessor ending more than a second ahead was cut short by a cleared buffer.
+            if -2 <= self._next_frame - start <= 100:
+                start = self._next_frame
+            self._blocks.append((start, envelope))
+            self._next_frame = start + len(envelope)
+            while self._blocks and self._blocks[0][0] + len(self._blocks[0][1]) < start - self.history:
+                self._blocks.popleft()
+
+    def envelope(self, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the output envelope and a mask of frames with playback, over ``[start, end)`` seconds."""
+
+        first = int(start / FRAME_SECONDS)
+        count = max(0, int(end / FRAME_SECONDS) - first)
+        values = np.zeros(count, dtype=np.float32)
+        playing = np.zeros(count, dtype=bool)
+        with self._lock:
+            blocks = list(self._blocks)
+        for block_start, block in blocks:
+            lo = max(first, block_start)
+            hi = min(first + count, block_start + len(block))
+            if lo < hi:
+                values[lo - first : hi - first] = block[lo - block_start : hi - block_start]
+                playing[lo - first : hi - first] = True
+        return values, playing
+
+
+@dataclass(slots=True)
+class EchoStats:
+    """Captured segments checked against playback, and how many were dropped as our own speech."""
+
+    segments: int = 0
+    overlapping: int = 0
+    discarded: int = 0
+    discarded_seconds: float = 0.0
+
+
+class EchoGuard:
+    """Drop captured segments that are our own TTS output coming back through the microphone.
+
+    A segment is judged by how much of it was captured while the player was
+    audible (allowing ``tail`` seconds for the room's reverberation and the
+    input latency). In ``gate`` mode a segment that overlaps playback for at
+    least ``overlap`` of its length is dropped. In ``correlate`` mode such a
+    segment is dropped only if its loudness envelope follows the played speech,
+    with a correlation of at least ``threshold`` at some delay up to
+    ``max_delay`` seconds, so a person talking over the playback still gets
+    through.
+
+    Segment times are taken from the wall clock when capture ends, so the guard
+    is meant for live (real-time) input.
+    """
+
+    def __init__(
+        self,
+        monitor: PlaybackMonitor,
+        mode: str = "gate",
+        threshold: float = 0.5,
+        overlap: float = 0.5,
+        tail: float = 0.3,
+        max_delay: float = 0.5,
+    ) -> None:
+        if mode not in ECHO_MODES[1:]:
+            raise ValueError(f"Unknown echo guard mode {mode!r}; use one of {', '.join(ECHO_MODES[1:])}")
+        self.monitor = monitor
+        self.mode = mode
+        self.threshold = threshold
+        self.overlap = overlap
+        self.tail = tail
+        self.max_delay = max_delay
+        self.stats = EchoStats()
+
+    def is_echo(self, pcm: bytes, rate: int, sample_width: int = 2, end: Optional[float] = None) -> bool:
+        """Whether a segment whose capture ended at ``end`` (monotonic seconds, default now) is our own speech."""
+
+        end = time.monotonic() if end is None else end
+        duration = len(pcm) / (sample_width * rate)
+        start = end - duration
+        self.stats.segments += 1
+        lead = max(self.tail, self.max_delay)
+        reference, playing = self.monitor.envelope(start - lead, end)
+        frames = len(playing) - int(lead / FRAME_SECONDS)
+        if frames <= 0:
+            return False
+        # A frame counts as overlapping if playback was audible within the last ``tail`` seconds.
+        reach = int(self.tail / FRAME_SECONDS)
+        recent = np.convolve(playing.astype(np.int32), np.ones(reach + 1, dtype=np.int32))[: len(playing)] > 0
+        share = float(recent[-frames:].mean())
+        if share <= 0.0:
+            return False
+        self.stats.overlapping += 1
+        if share < self.overlap:
+            return False
+        if self.mode == "correlate" and self.correlation(pcm, rate, sample_width, reference, lead) < self.threshold:
+            return False
+        self.stats.discarded += 1
+        self.stats.discarded_seconds += duration
+        return True
+
+    def correlation(self, pcm: bytes, rate: int, sample_width: int, reference: np.ndarray, lead: float) -> float:
+        """Best correlation between the segment's envelope and the output envelope at any delay.
+
+        ``reference`` covers the segment plus ``lead`` seconds before it, so sliding
+        it over the segment tries every delay between playback and capture.
+        """
+
+        captured = _envelope(pcm, rate, 1, sample_width)
+        frames = min(len(captured), len(reference))
+        captured = captured[:frames]
+        if frames < 10 or len(reference) <= frames:
+            return 0.0
+        latest = int(lead / FRAME_SECONDS)  # window offset for a delay of zero
+        earliest = max(0, latest - int(self.max_delay / FRAME_SECONDS))
+        windows = sliding_window_view(reference, frames)[earliest : latest + 1]
+        if not len(windows):
+            return 0.0
+        captured = captured - captured.mean()
+        centred = windows - windows.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(centred, axis=1) * np.linalg.norm(captured)
+        scores = (centred @ captured) / np.maximum(norms, 1e-6)
+        return float(scores.max())
@@ -0,0 +1,277 @@
+"""Long-lived PCM playback shared by all text-to-speech engines."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from .sinks import SAMPLE_WIDTH, DeviceSink, OutputSink, SinkStream, open_sink
+
+if TYPE_CHECKING:
+    from .echo import PlaybackMonitor
+    from .resample import PolyphaseResampler
+    from .timestretch import CatchUpController, WSOLAStretcher
+
+
+class AudioPlayer:
+    """Play 16-bit PCM through an :class:`OutputSink` whose streams stay open.
+
+    :meth:`play` queues an utterance (an iterable of PCM chunks, so streamed TTS
+    can start playing before synthesis finishes) and returns once every chunk has
+    been queued. A dedicated thread moves the chunks into one open sink stream
+    per sample rate and channel count, in order: an utterance in a different
+    format starts after the previous one has drained. The default sink is the
+    output device; PortAudio is initialised once per player rather than once per
+    sentence, which removes the start-up delay and the click of opening a fresh
+    stream.
+
+    With a :class:`CatchUpController` in ``catch_up``, the player speeds speech up
+    with a pitch-preserving time-stretch while playback lags behind, and returns
+    to normal speed once the backlog has drained. With a :class:`PlaybackMonitor`
+    in ``monitor``, it records what it plays and when, for the echo guard.
+    """
+
+    def __init__(
+        self,
+        output_device_index: Optional[int] = None,
+        jitter_seconds: float = 0.08,
+        block_seconds: float = 0.02,
+        sink: Optional[OutputSink] = None,
+    ) -> None:
+        self.output_device_index = output_device_index
+        self.sink = sink or DeviceSink(output_device_index, jitter_seconds, block_seconds)
+        self._streams: Dict[Tuple[int, int], SinkStream] = {}
+        self._resamplers: Dict[Tuple[int, int], "PolyphaseResampler"] = {}
+        self._stretchers: Dict[Tuple[int, int], "WSOLAStretcher"] = {}
+        self.catch_up: Optional["CatchUpController"] = None
+        self.monitor: Optional["PlaybackMonitor"] = None
+        self._backlog = 0.0
+        self._current: Optional[SinkStream] = None
+        self._queue: "queue.Queue[Optional[Tuple[int, int, Optional[bytes]]]]" = queue.Queue()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._error: Optional[BaseException] = None
+
+    @property
+    def underruns(self) -> int:
+        return sum(stream.underruns for stream in self._unique_streams())
+
+    @property
+    def pending_seconds(self) -> float:
+        """Audio queued or buffered for playback but not played yet."""
+
+        current = self._current
+        return self._backlog + (current.buffered_seconds if current is not None else 0.0)
+
+    def play(self, chunks: Iterable[bytes], sample_rate: int, channels: int = 1) -> None:
+        """Queue one utterance for playback; blocks only while ``chunks`` is being produced.
+
+        Raises the error of a previous utterance that could not be played (for
+        example because the device could not be opened), so callers see it.
+        """
+
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+        self._ensure_thread()
+        generation = self._generation
+        remainder = b""
+        frame_bytes = SAMPLE_WIDTH * channels
+        try:
+            for chunk in chunks:
+                if generation != self._generation:
+                    # clear() was called while this utterance was still being synthesised.
+                    return
+                if not chunk:
+                    continue
+                data = remainder + bytes(chunk)
+                cut = len(data) - len(data) % frame_bytes
+                remainder = data[cut:]
+                if cut:
+                    with self._lock:
+                        self._backlog += cut / (frame_bytes * sample_rate)
+                    self._queue.put((sample_rate, channels, data[:cut]))
+        finally:
+            # Even when synthesis fails midway, what was queued must play out and end the utterance.
+            if generation == self._generation:
+                self._queue.put((sample_rate, channels, None))
+
+    def play_pcm(self, pcm: bytes, sample_rate: int, channels: int = 1) -> None:
+        self.play((pcm,), sample_rate, channels)
+
+    def prepare(self, sample_rate: int, channels: int = 1) -> None:
+        """Open the stream for this format ahead of time, so the first utterance starts at once."""
+
+        with self._lock:
+            if not self._closed:
+                self._stream_for(sample_rate, channels)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until everything queued so far has been played."""
+
+        self._queue.join()
+        current = self._current
+        if current is not None:
+            current.wait(timeout)
+
+    def clear(self) -> None:
+        """Drop queued and buffered audio, e.g. when the pipeline stops."""
+
+        self._generation += 1
+        with self._queue.mutex:
+            unfinished = len(self._queue.queue)
+            self._queue.queue.clear()
+            self._queue.unfinished_tasks = max(0, self._queue.unfinished_tasks - unfinished)
+            self._queue.all_tasks_done.notify_all()
+        with self._lock:
+            self._backlog = 0.0
+            for stream in self._unique_streams():
+                stream.clear()
+            for resampler in self._resamplers.values():
+                resampler.reset()
+            for stretcher in self._stretchers.values():
+                stretcher.reset()
+
+    def close(self) -> None:
+        self.clear()
+        with self._lock:
+            self._closed = True
+            streams = self._unique_streams()
+            self._streams.clear()
+            self._current = None
+        self._queue.put(None)
+        for stream in streams:
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self.sink.close()
+
+    def _unique_streams(self) -> List[SinkStream]:
+        # Fixed-format sinks hand the same stream out for every source format.
+        unique: Dict[int, SinkStream] = {id(stream): stream for stream in self._streams.values()}
+        return list(unique.values())
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AudioPlayer is closed")
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audio-player", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                rate, channels, data = item
+                with self._lock:
+                    if self._closed:
+                        return
+                    stream = self._stream_for(rate, channels)
+                    previous = self._current
+                if stream is not previous:
+                    if previous is not None:
+                        previous.wait()
+                    self._current = stream
+                resampler = self._resampler_for(rate, channels, stream.rate)
+                stretcher = self._stretchers.get((rate, channels)) if self.catch_up is not None else None
+                if data is None:
+                    tail = stretcher.flush() if stretcher is not None else b""
+                    if resampler is not None:
+                        tail = resampler.process(tail) + resampler.flush()
+                    if tail:
+                        self._write(stream, tail)
+                    stream.end()
+                    continue
+                with self._lock:
+                    self._backlog = max(0.0, self._backlog - len(data) / (stream.frame_bytes * rate))
+                if self.catch_up is not None:
+                    # Stretch before resampling, so the stretcher always sees the engine's own rate.
+                    speed = self.catch_up.update(self.pending_seconds)
+                    data = self._stretcher_for(rate, channels).process(data, speed)
+                if resampler is not None:
+                    # The device does not take the engine's rate; convert on the fly, chunk by chunk.
+                    data = resampler.process(data)
+                if data:
+                    self._write(stream, data)
+            except Exception as error:  # pragma: no cover - runtime safety
+                # A broken device must not kill the player thread; report it on the next play().
+                self._error = error
+                continue
+            finally:
+                self._queue.task_done()
+
+    def _write(self, stream: SinkStream, data: bytes) -> None:
+        monitor = self.monitor
+        if monitor is not None:
+            # Heard once the audio already buffered ahead of it has played.
+            monitor.record(data, stream.rate, stream.channels, stream.buffered_seconds)
+        stream.write(data)
+
+    def _stream_for(self, rate: int, channels: int) -> SinkStream:
+        stream = self._streams.get((rate, channels))
+        if stream is None:
+            stream = self.sink.open(rate, channels)
+            self._streams[(rate, channels)] = stream
+        return stream
+
+    def _resampler_for(self, rate: int, channels: int, device_rate: int) -> Optional["PolyphaseResampler"]:
+        if device_rate == rate:
+            return None
+        resampler = self._resamplers.get((rate, channels))
+        if resampler is None or resampler.target_rate != device_rate:
+            from .resample import PolyphaseResampler
+
+            resampler = PolyphaseResampler(rate, device_rate, channels)
+            self._resamplers[(rate, channels)] = resampler
+        return resampler
+
+    def _stretcher_for(self, rate: int, channels: int) -> "WSOLAStretcher":
+        stretcher = self._stretchers.get((rate, channels))
+        if stretcher is None:
+            from .timestretch import WSOLAStretcher
+
+            stretcher = WSOLAStretcher(rate, channels)
+            self._stretchers[(rate, channels)] = stretcher
+        return stretcher
+
+
+_PLAYERS: Dict[Optional[int], AudioPlayer] = {}
+_PLAYERS_LOCK = threading.Lock()
+# Set by configure_output(); None plays on the output device.
+_OUTPUT: Tuple[Optional[str], Optional[int], Optional[float]] = (None, None, None)
+
+
+def configure_output(spec: Optional[str], rate: Optional[int] = None, max_seconds: Optional[float] = None) -> None:
+    """Choose where shared players send speech (see :func:`open_sink`); call before the first playback."""
+
+    global _OUTPUT
+    _OUTPUT = (spec, rate, max_seconds)
+
+
+def shared_player(output_device_index: Optional[int]) -> AudioPlayer:
+    """Return the process-wide player for an output device, creating it once."""
+
+    with _PLAYERS_LOCK:
+        player = _PLAYERS.get(output_device_index)
+        if player is None:
+            spec, rate, max_seconds = _OUTPUT
+            player = AudioPlayer(output_device_index, sink=open_sink(spec, output_device_index, rate, max_seconds))
+            _PLAYERS[output_device_index] = player
+        return player
+
+
+def close_shared_players() -> None:
+    """Stop playback and release every shared output device."""
+
+    with _PLAYERS_LOCK:
+        players = list(_PLAYERS.values())
+        _PLAYERS.clear()
+    for player in players:
+        player.close()
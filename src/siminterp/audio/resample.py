@@ -0,0 +1,91 @@
+"""Streaming sample-rate conversion for 16-bit PCM."""
+
+from __future__ import annotations
+
+from math import gcd
+
+import numpy as np
+
+
+class PolyphaseResampler:
+    """Rational-ratio resampler that converts a PCM stream chunk by chunk.
+
+    The rate ratio is reduced to ``up / down`` and a windowed-sinc low-pass filter
+    of ``taps`` taps per phase is split into ``up`` polyphase branches. Every
+    output sample is one dot product of ``taps`` input samples with the branch for
+    its phase, computed for a whole chunk at once. The last ``taps - 1`` input
+    samples are carried between calls, so chunk boundaries are seamless. The
+    filter delay is compensated, and :meth:`flush` returns the tail that is still
+    in the delay line at the end of an utterance.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int, channels: int = 1, taps: int = 16) -> None:
+        if source_rate <= 0 or target_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+        divisor = gcd(source_rate, target_rate)
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        self.channels = channels
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        self.taps = max(2, taps)
+        self._bank = _design_bank(self.up, self.down, self.taps)
+        self._offsets = np.arange(self.taps)
+        self.reset()
+
+    def reset(self) -> None:
+        self._history = np.zeros((self.taps - 1, self.channels), dtype=np.float32)
+        # Upsampled-domain position of the next output, relative to the start of the next chunk.
+        # Starting at the filter's group delay lines the output up with the input.
+        self._position = (self.taps * self.up - 1) // 2
+
+    def process(self, data: bytes) -> bytes:
+        """Convert one chunk of interleaved int16 PCM; returns whatever output is ready."""
+
+        if not data:
+            return b""
+        samples = np.frombuffer(data, dtype=np.int16).reshape(-1, self.channels).astype(np.float32)
+        return self._run(samples)
+
+    def flush(self) -> bytes:
+        """Drain the delay line at the end of a stream and reset for the next one."""
+
+        tail = self._run(np.zeros((self.taps // 2 + 1, self.channels), dtype=np.float32))
+        self.reset()
+        return tail
+
+    def _run(self, samples: np.ndarray) -> bytes:
+        count = len(samples)
+        buffer = np.concatenate((self._history, samples))
+        end = count * self.up
+        positions = np.arange(self._position, end, self.down, dtype=np.int64)
+        if len(positions):
+            phases = positions % self.up
+            newest = positions // self.up + (self.taps - 1)
+            windows = buffer[newest[:, None] - self._offsets[None, :]]
+            output = np.einsum("nk,nkc->nc", self._bank[phases], windows)
+            self._position = int(positions[-1]) + self.down - end
+        else:
+            output = np.zeros((0, self.channels), dtype=np.float32)
+            self._position -= end
+        self._history = buffer[-(self.taps - 1):]
+        return np.clip(np.rint(output), -32768, 32767).astype(np.int16).tobytes()
+
+
+def _design_bank(up: int, down: int, taps: int) -> np.ndarray:
+    """Return the ``(up, taps)`` polyphase bank of a Kaiser-windowed sinc low-pass."""
+
+    length = taps * up
+    # Cut off just below the lower of the two Nyquist frequencies, in the upsampled domain.
+    cutoff = 0.5 / max(up, down) * 0.92
+    # Centre on a whole sample so the delay compensated in reset() is exact; with an even
+    # length the last tap falls outside the window and stays zero.
+    centre = (length - 1) // 2
+    n = np.arange(length) - centre
+    window = np.zeros(length)
+    window[: 2 * centre + 1] = np.kaiser(2 * centre + 1, 8.0)
+    prototype = 2.0 * cutoff * np.sinc(2.0 * cutoff * n) * window
+    # Zero-stuffing by ``up`` divides the signal energy by ``up``; the gain restores it.
+    prototype *= up / prototype.sum() if prototype.sum() else 1.0
+    # bank[p, k] = h[p + k * up]: the taps applied to x[n - k] for an output at phase p.
+    return prototype.reshape(taps, up).T.astype(np.float32).copy()
@@ -0,0 +1,542 @@
+"""Destinations for synthesized speech: a sound card, files, a byte stream or nowhere."""
+
+from __future__ import annotations
+
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Protocol, Tuple
+
+import pyaudio
+
+from .devices import DeviceRegistry, device_registry, preferred_output_rate
+
+SAMPLE_WIDTH = 2  # 16-bit signed PCM
+# Tried in order when the device could not be probed.
+FALLBACK_RATES = (48000, 44100)
+
+# PortAudio errors that mean "this device does not take this format", not "the device is gone".
+_FORMAT_ERRORS = (-9997, -9999)
+
+
+class SinkStream(Protocol):
+    """One open output in a fixed format, fed by the player thread."""
+
+    rate: int
+    channels: int
+    frame_bytes: int
+    underruns: int
+
+    @property
+    def buffered_seconds(self) -> float: ...
+
+    def write(self, data: bytes) -> None: ...
+
+    def end(self) -> None:
+        """Mark the end of an utterance."""
+
+    def clear(self) -> None: ...
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything written has been played out."""
+
+    def close(self) -> None: ...
+
+
+class OutputSink(Protocol):
+    def open(self, rate: int, channels: int) -> SinkStream:
+        """Open a stream for audio at ``rate``; the stream's own rate may differ (the player resamples)."""
+
+    def close(self) -> None: ...
+
+
+def _is_format_error(error: OSError) -> bool:
+    message = str(error)
+    return (
+        getattr(error, "errno", None) in _FORMAT_ERRORS
+        or "Invalid sample rate" in message
+        or "Unanticipated host error" in message
+    )
+
+
+class _OutputStream:
+    """One open callback-mode PortAudio stream with a jitter buffer in front of it.
+
+    The callback never blocks: it plays whatever is buffered and pads with silence.
+    Playback of an utterance starts once ``jitter_bytes`` are buffered (or the whole
+    utterance has arrived), and after an underrun the buffer is refilled to that
+    level again instead of stuttering chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        registry: DeviceRegistry,
+        device_index: Optional[int],
+        rate: int,
+        channels: int,
+        jitter_seconds: float,
+        block_seconds: float,
+    ) -> None:
+        self.device_index = device_index
+        self.rate = rate
+        self.channels = channels
+        self.frame_bytes = SAMPLE_WIDTH * channels
+        self.jitter_bytes = max(self.frame_bytes, int(rate * jitter_seconds) * self.frame_bytes)
+        self.underruns = 0
+        self._buffer = bytearray()
+        self._primed = False
+        self._ended = True
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._registry = registry
+        self._stream = registry.open_stream(
+            format=pyaudio.paInt16,
+            channels=channels,
+            rate=rate,
+            output=True,
+            output_device_index=device_index,
+            frames_per_buffer=max(64, int(rate * block_seconds)),
+            stream_callback=self._callback,
+        )
+
+    @property
+    def buffered_seconds(self) -> float:
+        return len(self._buffer) / (self.frame_bytes * self.rate)
+
+    def write(self, data: bytes) -> None:
+        with self._lock:
+            self._buffer += data
+            self._ended = False
+            self._idle.clear()
+            if len(self._buffer) >= self.jitter_bytes:
+                self._primed = True
+
+    def end(self) -> None:
+        """Mark the end of an utterance so its tail plays without waiting for more data."""
+
+        with self._lock:
+            self._ended = True
+            if self._buffer:
+                self._primed = True
+            else:
+                self._idle.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+            self._primed = False
+            self._ended = True
+            self._idle.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._idle.wait(timeout)
+
+    def close(self) -> None:
+        self.clear()
+        try:
+            self._stream.stop_stream()
+        finally:
+            self._registry.close_stream(self._stream)
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        wanted = frame_count * self.frame_bytes
+        with self._lock:
+            if not self._primed:
+                return bytes(wanted), pyaudio.paContinue
+            chunk = bytes(self._buffer[:wanted])
+            del self._buffer[:wanted]
+            if not self._buffer:
+                self._primed = False
+                if self._ended:
+                    self._idle.set()
+                elif len(chunk) < wanted:
+                    self.underruns += 1
+        if len(chunk) < wanted:
+            chunk += bytes(wanted - len(chunk))
+        return chunk, pyaudio.paContinue
+
+
+class DeviceSink:
+    """Play through a PortAudio output device, at a rate the device supports.
+
+    Streams are opened on the shared :func:`device_registry` session, whose probed
+    rates decide the stream rate up front. The device is remembered by host API
+    and name, so if it cannot be opened at all (for example after a hot-plug
+    shifted the indices), the registry is refreshed once and the device found
+    again, falling back to the default device.
+    """
+
+    def __init__(
+        self, output_device_index: Optional[int] = None, jitter_seconds: float = 0.08, block_seconds: float = 0.02
+    ) -> None:
+        self.output_device_index = output_device_index
+        self.jitter_seconds = jitter_seconds
+        self.block_seconds = block_seconds
+        self._key: Optional[Tuple[str, str]] = None
+        if output_device_index is not None:
+            device = device_registry().device(output_device_index)
+            self._key = device.key if device is not None else None
+
+    def open(self, rate: int, channels: int) -> _OutputStream:
+        try:
+            return self._open(rate, channels)
+        except OSError as error:
+            if _is_format_error(error):
+                raise
+            device_registry().refresh()
+            return self._open(rate, channels)
+
+    def _open(self, rate: int, channels: int) -> _OutputStream:
+        registry = device_registry()
+        index = self.output_device_index
+        if self._key is not None:
+            # The index may have moved since start-up; None (default device) if it is gone.
+            index = registry.find(self._key)
+        devices = [index]
+        if index is not None:
+            devices.append(None)
+        last_error: Optional[OSError] = None
+        for device in devices:
+            for candidate in _rates_to_try(registry.output_rates(device, channels), rate):
+                try:
+                    return _OutputStream(
+                        registry, device, candidate, channels, self.jitter_seconds, self.block_seconds
+                    )
+                except OSError as error:
+                    last_error = error
+                    registry.forget_rate(device, channels, candidate)
+                    if not _is_format_error(error):
+                        break
+        if last_error is None:
+            raise OSError(f"No usable output rate on device {index}")
+        raise last_error
+
+    def close(self) -> None:
+        # The PortAudio session belongs to the device registry and outlives the player.
+        pass
+
+
+def _rates_to_try(supported: List[int], rate: int) -> List[int]:
+    """Order the device's probed rates by preference for audio at ``rate``."""
+
+    if not supported:
+        return [rate] + [fallback for fallback in FALLBACK_RATES if fallback != rate]
+    first = preferred_output_rate(supported, rate)
+    rest = sorted((candidate for candidate in supported if candidate != first), key=lambda r: (r < rate, abs(r - rate)))
+    return [first] + rest if first is not None else rest
+
+
+class _ImmediateStream(ABC):
+    """Base for outputs that take audio as fast as it comes instead of in real time.
+
+    The format is fixed by the first :meth:`OutputSink.open` call (or the sink's
+    ``rate``), and every later open returns the same stream, so audio of all
+    utterances lands in one place and the player resamples what differs.
+    """
+
+    underruns = 0
+    buffered_seconds = 0.0
+
+    def __init__(self, rate: int, channels: int) -> None:
+        self.rate = rate
+        self.channels = channels
+        self.frame_bytes = SAMPLE_WIDTH * channels
+
+    @abstractmethod
+    def write(self, data: bytes) -> None:
+        """Take ``data`` (whole frames) without waiting for it to be played."""
+
+    def end(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class _FixedFormatSink(ABC):
+    def __init__(self, rate: Optional[int] = None) -> None:
+        self.rate = rate
+        self._stream: Optional[_ImmediateStream] = None
+        self._lock = threading.Lock()
+
+    def open(self, rate: int, channels: int) -> _ImmediateStream:
+        with self._lock:
+            if self._stream is None:
+                self._stream = self._create(self.rate or rate, channels)
+            elif channels != self._stream.channels:
+                raise ValueError(f"{type(self).__name__} is {self._stream.channels}-channel; got {channels} channels")
+            return self._stream
+
+    def close(self) -> None:
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close()
+
+    @abstractmethod
+    def _create(self, rate: int, channels: int) -> _ImmediateStream:
+        """Make the one stream this sink returns from every :meth:`open`."""
+
+
+@dataclass(slots=True)
+class SinkStats:
+    """What reached a :class:`NullSink`: audio produced and how fast it arrived."""
+
+    utterances: int = 0
+    frames: int = 0
+    rate: int = 0
+    first_write: Optional[float] = None
+    last_write: Optional[float] = None
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.frames / self.rate if self.rate else 0.0
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.first_write is None or self.last_write is None:
+            return 0.0
+        return self.last_write - self.first_write
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio produced per second of wall time (above 1 is faster than real time)."""
+
+        if not self.wall_seconds:
+            return 0.0
+        return self.audio_seconds / self.wall_seconds
+
+
+class _NullStream(_ImmediateStream):
+    def __init__(self, rate: int, channels: int, stats: SinkStats) -> None:
+        super().__init__(rate, channels)
+        self.stats = stats
+        stats.rate = rate
+        self._open_utterance = False
+
+    def write(self, data: bytes) -> None:
+        now = time.monotonic()
+        if self.stats.first_write is None:
+            self.stats.first_write = now
+        self.stats.last_write = now
+        self.stats.frames += len(data) // self.frame_bytes
+        self._open_utterance = True
+
+    def end(self) -> None:
+        if self._open_utterance:
+            self.stats.utterances += 1
+            self._open_utterance = False
+
+
+class NullSink(_FixedFormatSink):
+    """Discard audio, counting samples and timing; for benchmarks and machines without sound."""
+
+    def __init__(self, rate: Optional[int] = None) -> None:
+        super().__init__(rate)
+        self.stats = SinkStats()
+
+    def _create(self, rate: int, channels: int) -> _ImmediateStream:
+        return _NullStream(rate, channels, self.stats)
+
+
+class _RollingFileStream(_ImmediateStream):
+    """Write into numbered files, starting the next one every ``max_seconds`` of audio."""
+
+    def __init__(self, path: Path, rate: int, channels: int, max_seconds: Optional[float]) -> None:
+        super().__init__(rate, channels)
+        self.path = path
+        self.max_frames = int(max_seconds * rate) if max_seconds else 0
+        self.files: List[Path] = []
+        self._frames = 0
+        self._file_open = False
+
+    def write(self, data: bytes) -> None:
+        while data:
+            if not self._file_open:
+                self._open_file()
+            room = len(data)
+            if self.max_frames:
+                room = min(room, (self.max_frames - self._frames) * self.frame_bytes)
+            self._write_file(data[:room])
+            self._frames += room // self.frame_bytes
+            data = data[room:]
+            if self.max_frames and self._frames >= self.max_frames:
+                self._close_file()
+                self._file_open = False
+
+    def close(self) -> None:
+        if self._file_open:
+            self._close_file()
+            self._file_open = False
+
+    def _next_path(self) -> Path:
+        if not self.max_frames:
+            return self.path
+        return self.path.with_name(f"{self.path.stem}-{len(self.files) + 1:04d}{self.path.suffix}")
+
+    def _open_file(self) -> None:
+        path = self._next_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.files.append(path)
+        self._frames = 0
+        self._start(path)
+        self._file_open = True
+
+    @abstractmethod
+    def _start(self, path: Path) -> None:
+        """Open ``path`` as the current file."""
+
+    @abstractmethod
+    def _write_file(self, data: bytes) -> None:
+        """Append ``data`` to the current file."""
+
+    @abstractmethod
+    def _close_file(self) -> None:
+        """Finish the current file."""
+
+
+class _WaveStream(_RollingFileStream):
+    def _start(self, path: Path) -> None:
+        self._wave = wave.open(str(path), "wb")
+        self._wave.setnchannels(self.channels)
+        self._wave.setsampwidth(SAMPLE_WIDTH)
+        self._wave.setframerate(self.rate)
+
+    def _write_file(self, data: bytes) -> None:
+        self._wave.writeframes(data)
+
+    def _close_file(self) -> None:
+        self._wave.close()
+
+
+class _OpusStream(_RollingFileStream):
+    def __init__(self, path: Path, rate: int, channels: int, max_seconds: Optional[float], bitrate: str) -> None:
+        self.bitrate = bitrate
+        super().__init__(path, rate, channels, max_seconds)
+
+    def _start(self, path: Path) -> None:
+        # ffmpeg converts to a rate libopus accepts (48/24/16/12/8 kHz) by itself.
+        self._process = subprocess.Popen(
+            [
+                "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+                "-f", "s16le", "-ar", str(self.rate), "-ac", str(self.channels), "-i", "pipe:0",
+                "-c:a", "libopus", "-b:a", self.bitrate, "-application", "voip", str(path),
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def _write_file(self, data: bytes) -> None:
+        assert self._process.stdin is not None
+        self._process.stdin.write(data)
+
+    def _close_file(self) -> None:
+        assert self._process.stdin is not None
+        self._process.stdin.close()
+        self._process.wait()
+
+
+class WaveFileSink(_FixedFormatSink):
+    """Record speech to a WAV file, or to ``name-0001.wav``, ``name-0002.wav``… every ``max_seconds``."""
+
+    def __init__(self, path: Path, rate: Optional[int] = None, max_seconds: Optional[float] = None) -> None:
+        super().__init__(rate)
+        self.path = Path(path).expanduser()
+        self.max_seconds = max_seconds
+
+    def _create(self, rate: int, channels: int) -> _ImmediateStream:
+        return _WaveStream(self.path, rate, channels, self.max_seconds)
+
+
+class OpusFileSink(_FixedFormatSink):
+    """Record speech to Ogg/Opus through an ``ffmpeg`` process, optionally rolling like :class:`WaveFileSink`."""
+
+    def __init__(
+        self, path: Path, rate: Optional[int] = None, max_seconds: Optional[float] = None, bitrate: str = "32k"
+    ) -> None:
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg not found. Install it to record Ogg/Opus output, or record to a .wav file.")
+        super().__init__(rate)
+        self.path = Path(path).expanduser()
+        self.max_seconds = max_seconds
+        self.bitrate = bitrate
+
+    def _create(self, rate: int, channels: int) -> _ImmediateStream:
+        return _OpusStream(self.path, rate, channels, self.max_seconds, self.bitrate)
+
+
+class _ByteStream(_ImmediateStream):
+    def __init__(self, rate: int, channels: int, handle: BinaryIO, owner: Optional[socket.socket]) -> None:
+        super().__init__(rate, channels)
+        self._handle = handle
+        self._socket = owner
+
+    def write(self, data: bytes) -> None:
+        self._handle.write(data)
+        self._handle.flush()
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._handle.close()
+            self._socket.close()
+
+
+class StreamSink(_FixedFormatSink):
+    """Write raw 16-bit little-endian PCM to stdout (``-``) or a TCP listener (``host:port``).
+
+    There is no header; the receiver must know the format, which is the first
+    utterance's rate unless ``rate`` is given, e.g.
+    ``siminterp --output - --output-rate 24000 | ffplay -f s16le -ar 24000 -ac 1 -``.
+    """
+
+    def __init__(self, target: str, rate: Optional[int] = None) -> None:
+        super().__init__(rate)
+        self.target = target
+
+    def _create(self, rate: int, channels: int) -> _ImmediateStream:
+        if self.target == "-":
+            return _ByteStream(rate, channels, sys.stdout.buffer, None)
+        host, _, port = self.target.rpartition(":")
+        connection = socket.create_connection((host or "127.0.0.1", int(port)))
+        return _ByteStream(rate, channels, connection.makefile("wb"), connection)
+
+
+def open_sink(
+    spec: Optional[str],
+    output_device_index: Optional[int] = None,
+    rate: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+) -> OutputSink:
+    """Build the sink named by ``--output``: ``device`` (default), ``null``, ``-``, ``tcp://host:port``,
+    or a ``.wav`` / ``.ogg`` / ``.opus`` file path."""
+
+    if not spec or spec == "device":
+        return DeviceSink(output_device_index)
+    if spec == "null":
+        return NullSink(rate)
+    if spec in ("-", "stdout"):
+        return StreamSink("-", rate)
+    if spec.startswith("tcp://"):
+        return StreamSink(spec[len("tcp://") :], rate)
+    path = Path(spec)
+    suffix = path.suffix.lower()
+    if suffix == ".wav":
+        return WaveFileSink(path, rate, max_seconds)
+    if suffix in (".ogg", ".opus"):
+        return OpusFileSink(path, rate, max_seconds)
+    raise ValueError(
+        f"Unknown output {spec!r}; use device, null, -, tcp://host:port or a .wav/.ogg/.opus file path"
+    )
@@ -0,0 +1,247 @@
+"""Where captured speech comes from: a microphone, a recording, a raw PCM feed or a generator."""
+
+from __future__ import annotations
+
+import socket
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+import numpy as np
+import speech_recognition as sr
+
+SAMPLE_WIDTH = 2  # raw feeds and the generator are 16-bit signed little-endian mono
+DEFAULT_RATE = 16000
+
+
+class _PacedStream:
+    """Read frames from ``read`` no faster than ``speed`` times real time.
+
+    ``read(size)`` takes a size in frames, like the streams of ``sr.Microphone``
+    and ``sr.AudioFile``. A chunk is returned when it would have finished
+    arriving from a microphone, so the recognizer sees the same timing; with
+    ``speed`` 0 it is returned at once. An empty read marks the source as
+    exhausted.
+    """
+
+    def __init__(self, read: Callable[[int], bytes], rate: int, frame_bytes: int, speed: float = 1.0) -> None:
+        self._read = read
+        self.rate = rate
+        self.frame_bytes = frame_bytes
+        self.speed = max(0.0, speed)
+        self.exhausted = False
+        self.frames = 0
+        self._started_at: Optional[float] = None
+
+    @property
+    def seconds(self) -> float:
+        """Audio delivered so far, in seconds of the recording."""
+
+        return self.frames / self.rate
+
+    def read(self, size: int) -> bytes:
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        data = self._read(size)
+        data = data[: len(data) - len(data) % self.frame_bytes]
+        if not data:
+            self.exhausted = True
+            return b""
+        self.frames += len(data) // self.frame_bytes
+        if self.speed > 0:
+            delay = self._started_at + self.seconds / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+    def close(self) -> None:
+        pass
+
+
+class _InputSource(sr.AudioSource, ABC):
+    """An ``sr.AudioSource`` that can run out, for everything but the microphone.
+
+    It is entered once for the whole session (ambient-noise calibration and
+    listening share it, since a pipe or socket cannot be rewound), and
+    :attr:`exhausted` turns true after the last frame has been read.
+    """
+
+    CHUNK = 1024
+
+    def __init__(self, rate: int, sample_width: int = SAMPLE_WIDTH, speed: float = 1.0) -> None:
+        self.SAMPLE_RATE = rate
+        self.SAMPLE_WIDTH = sample_width
+        self.speed = speed
+        self.stream: Optional[_PacedStream] = None
+        self._last: Optional[_PacedStream] = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self._last is not None and self._last.exhausted
+
+    @property
+    def seconds(self) -> float:
+        return self._last.seconds if self._last is not None else 0.0
+
+    def __enter__(self) -> "_InputSource":
+        assert self.stream is None, "This audio source is already inside a context manager"
+        self.stream = self._last = _PacedStream(self._open(), self.SAMPLE_RATE, self.SAMPLE_WIDTH, self.speed)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stream = None
+        self._close()
+
+    @abstractmethod
+    def _open(self) -> Callable[[int], bytes]:
+        """Start reading and return a function reading up to ``size`` frames."""
+
+    def _close(self) -> None:
+        pass
+
+
+class FileSource(_InputSource):
+    """Replay a WAV, AIFF or FLAC recording, at ``speed`` times real time (0 for as fast as possible).
+
+    Decoding is done by ``sr.AudioFile``, which mixes stereo down to mono and
+    brings its own FLAC decoder, so a recording is segmented exactly like live
+    microphone audio.
+    """
+
+    def __init__(self, path: Path, speed: float = 1.0) -> None:
+        super().__init__(DEFAULT_RATE, speed=speed)
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise FileNotFoundError(f"Input recording not found: {self.path}")
+        self._file: Optional[sr.AudioFile] = None
+
+    def _open(self) -> Callable[[int], bytes]:
+        self._file = sr.AudioFile(str(self.path))
+        self._file.__enter__()
+        self.SAMPLE_RATE = self._file.SAMPLE_RATE
+        self.SAMPLE_WIDTH = self._file.SAMPLE_WIDTH
+        self.CHUNK = self._file.CHUNK
+        return self._file.stream.read
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.__exit__(None, None, None)
+            self._file = None
+
+
+class RawPCMSource(_InputSource):
+    """Read headerless 16-bit mono PCM at ``rate`` from stdin (``-``) or a TCP server (``host:port``).
+
+    The producer sets the pace, e.g.
+    ``ffmpeg -re -i talk.mp3 -f s16le -ar 16000 -ac 1 - | siminterp --input -``;
+    the source is exhausted when the pipe or connection closes.
+    """
+
+    def __init__(self, target: str, rate: int = DEFAULT_RATE, speed: float = 0.0) -> None:
+        super().__init__(rate, speed=speed)
+        self.target = target
+        self._reader: Optional[BinaryIO] = None
+        self._connection: Optional[socket.socket] = None
+
+    def _open(self) -> Callable[[int], bytes]:
+        if self.target == "-":
+            self._reader = sys.stdin.buffer
+        else:
+            host, _, port = self.target.rpartition(":")
+            self._connection = socket.create_connection((host or "127.0.0.1", int(port)))
+            self._reader = self._connection.makefile("rb")
+        reader = self._reader
+        return lambda size: reader.read(size * SAMPLE_WIDTH)
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            if self._reader is not None:
+                self._reader.close()
+            self._connection.close()
+            self._connection = None
+        self._reader = None
+
+
+class SyntheticSource(_InputSource):
+    """Generate speech-like test audio: voiced bursts of 1-3 s separated by pauses.
+
+    Each burst is a harmonic tone with a gliding pitch and a syllable-rate
+    envelope, loud enough to trip the recognizer's energy threshold; pauses,
+    including the one the audio starts with, hold faint noise. The sequence is
+    reproducible for a given ``seed``, and ``seconds`` bounds its length
+    (``None`` runs until stopped). Useful for load runs where only segmentation
+    and throughput matter.
+    """
+
+    def __init__(
+        self, rate: int = DEFAULT_RATE, seconds: Optional[float] = None, speed: float = 1.0, seed: int = 0
+    ) -> None:
+        super().__init__(rate, speed=speed)
+        self.duration = seconds
+        self.seed = seed
+
+    def _open(self) -> Callable[[int], bytes]:
+        rng = np.random.default_rng(self.seed)
+        rate = self.SAMPLE_RATE
+        total = None if self.duration is None else int(self.duration * rate)
+        # Open with a pause, so ambient-noise calibration measures the noise floor and not a voice.
+        pending = _pause(rng, rate)
+        produced = 0
+
+        def read(size: int) -> bytes:
+            nonlocal pending, produced
+            if total is not None:
+                size = min(size, total - produced)
+            while len(pending) < size:
+                pending = np.concatenate((pending, _burst(rng, rate), _pause(rng, rate)))
+            block, pending = pending[:size], pending[size:]
+            produced += size
+            return np.clip(np.rint(block * 32767), -32768, 32767).astype("<i2").tobytes()
+
+        return read
+
+
+def _burst(rng: np.random.Generator, rate: int) -> np.ndarray:
+    length = int(rng.uniform(1.0, 3.0) * rate)
+    t = np.arange(length) / rate
+    pitch = rng.uniform(110.0, 220.0) * (1.0 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.3, 0.8) * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    voice = sum(np.sin(harmonic * phase) / harmonic for harmonic in range(1, 6))
+    # Deep dips between syllables, as in real speech; a steady level would pull the
+    # recognizer's adaptive energy threshold up to it and end the phrase early.
+    syllables = 0.05 + 0.95 * np.sin(np.pi * rng.uniform(3.0, 5.0) * t) ** 4
+    edges = np.minimum(1.0, np.minimum(t, t[-1] - t) / 0.05)  # 50 ms fades avoid clicks
+    return (0.25 * voice * syllables * edges).astype(np.float32)
+
+
+def _pause(rng: np.random.Generator, rate: int) -> np.ndarray:
+    length = int(rng.uniform(0.9, 1.6) * rate)
+    return (rng.standard_normal(length) * 0.002).astype(np.float32)
+
+
+def open_source(
+    spec: Optional[str],
+    input_device_index: Optional[int] = None,
+    rate: Optional[int] = None,
+    speed: float = 1.0,
+) -> sr.AudioSource:
+    """Build the source named by ``--input``: ``mic`` (default), a WAV/AIFF/FLAC file path,
+    ``-`` (raw PCM on stdin), ``tcp://host:port``, or ``synth`` / ``synth:SECONDS``."""
+
+    if not spec or spec in ("mic", "microphone"):
+        return sr.Microphone(device_index=input_device_index)
+    if spec in ("-", "stdin"):
+        return RawPCMSource("-", rate or DEFAULT_RATE)
+    if spec.startswith("tcp://"):
+        return RawPCMSource(spec[len("tcp://") :], rate or DEFAULT_RATE)
+    if spec == "synth" or spec.startswith("synth:"):
+        _, _, seconds = spec.partition(":")
+        return SyntheticSource(rate or DEFAULT_RATE, float(seconds) if seconds else None, speed)
+    path = Path(spec)
+    if path.suffix.lower() in (".wav", ".wave", ".flac", ".aif", ".aiff"):
+        return FileSource(path, speed)
+    raise ValueError(
+        f"Unknown input {spec!r}; use mic, -, tcp://host:port, synth[:SECONDS] or a .wav/.flac/.aiff file path"
+    )
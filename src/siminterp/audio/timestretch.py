@@ -0,0 +1,173 @@
+"""Pitch-preserving time-stretch for speeding up a backlog of speech."""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class WSOLAStretcher:
+    """Streaming WSOLA (waveform-similarity overlap-add) time-stretch for 16-bit PCM.
+
+    Output is built from Hann-windowed frames overlapped by half. Consecutive
+    frames are taken ``speed`` times further apart in the input than in the
+    output, so the audio gets shorter without resampling, and each frame's exact
+    start is moved by up to ``tolerance_ms`` to where it best continues the
+    previous frame's waveform, which keeps pitch periods intact. The similarity
+    search for a frame is one matrix-vector product over all candidate offsets.
+    ``speed`` may change between calls. An utterance that starts at 1.0 is
+    passed through untouched until the speed first changes, and a stretched
+    utterance is trimmed at :meth:`flush` to its input length divided by the
+    speed, so the search past its end adds no audio.
+    """
+
+    def __init__(self, rate: int, channels: int = 1, frame_ms: float = 30.0, tolerance_ms: float = 8.0) -> None:
+        self.rate = rate
+        self.channels = channels
+        self.hop = max(16, int(rate * frame_ms / 2000.0))
+        self.frame = 2 * self.hop
+        self.tolerance = max(1, int(rate * tolerance_ms / 1000.0))
+        # A periodic Hann window overlapped by half sums to exactly one.
+        self._window = (0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(self.frame) / self.frame)).astype(np.float32)
+        self.speed = 1.0
+        self.reset()
+
+    def reset(self) -> None:
+        # Half a frame of leading silence gives the first frame a predecessor to overlap with;
+        # the output it produces is dropped, so the stream starts without a fade-in.
+        self._input = np.zeros((self.hop, self.channels), dtype=np.float32)
+        self._base = -self.hop  # absolute input index of self._input[0]
+        self._position = float(-self.hop)  # nominal input position of the next frame
+        self._previous: Optional[int] = None  # actual input start of the previous frame
+        self._tail = np.zeros((self.hop, self.channels), dtype=np.float32)
+        self._skip = self.hop
+        self._passthrough = True  # nothing stretched since the utterance started
+        self._expected = 0.0  # output frames the stretched input is worth at the speeds it came in at
+        self._produced = 0  # output frames returned so far
+
+    def process(self, data: bytes, speed: Optional[float] = None) -> bytes:
+        """Stretch one chunk of interleaved int16 PCM; returns whatever output is ready."""
+
+        if speed is not None:
+            self.speed = max(0.25, speed)
+        if not data:
+            return b""
+        if self._passthrough and self.speed == 1.0:
+            return data
+        self._passthrough = False
+        samples = np.frombuffer(data, dtype=np.int16).reshape(-1, self.channels).astype(np.float32)
+        self._input = np.concatenate((self._input, samples))
+        self._expected += len(samples) / self.speed
+        output = self._run(self._base + len(self._input))
+        self._produced += len(output) // (2 * self.channels)
+        return output
+
+    def flush(self) -> bytes:
+        """Emit the rest of the stream at the end of an utterance and reset for the next one."""
+
+        if self._passthrough:
+            self.reset()
+            return b""
+        end = self._base + len(self._input)
+        padding = np.zeros((self.frame + 2 * self.tolerance + self.hop, self.channels), dtype=np.float32)
+        self._input = np.concatenate((self._input, padding))
+        output = self._run(self._base + len(self._input), stop=end) + self._emit(self._tail)
+        # Frames searched for past the end stretch the padding, or repeat a periodic tail; cut them off.
+        remaining = max(0, int(round(self._expected)) - self._produced)
+        self.reset()
+        return output[: remaining * 2 * self.channels]
+
+    def _run(self, available: int, stop: Optional[int] = None) -> bytes:
+        parts: List[bytes] = []
+        hop, frame, tolerance = self.hop, self.frame, self.tolerance
+        while True:
+            nominal = int(round(self._position))
+            if stop is not None and nominal >= stop:
+                break
+            needed = nominal + tolerance + frame
+            if self._previous is not None:
+                needed = max(needed, self._previous + hop + frame)
+            if needed > available:
+                break
+            start = self._best_start(nominal)
+            segment = self._input[start - self._base : start - self._base + frame] * self._window[:, None]
+            parts.append(self._emit(self._tail + segment[:hop]))
+            self._tail = segment[hop:].copy()
+            self._previous = start
+            self._position += self.speed * hop
+        keep = int(round(self._position)) - tolerance
+        if self._previous is not None:
+            keep = min(keep, self._previous + hop)
+        drop = max(0, keep - self._base)
+        if drop:
+            self._input = self._input[drop:]
+            self._base += drop
+        return b"".join(parts)
+
+    def _best_start(self, nominal: int) -> int:
+        if self._previous is None:
+            return nominal
+        hop, frame = self.hop, self.frame
+        lowest = max(self._base, nominal - self.tolerance)
+        highest = nominal + self.tolerance
+        mono = self._input.mean(axis=1) if self.channels > 1 else self._input[:, 0]
+        # The natural continuation of the previous frame is what the next frame should resemble.
+        target = mono[self._previous + hop - self._base : self._previous + hop - self._base + frame]
+        region = mono[lowest - self._base : highest - self._base + frame]
+        candidates = sliding_window_view(region, frame)
+        correlation = candidates @ target
+        squares = np.concatenate(([0.0], np.cumsum(region.astype(np.float64) ** 2)))
+        energy = squares[frame:] - squares[:-frame]
+        score = correlation / np.sqrt(np.maximum(energy, 1e-3))
+        return lowest + int(np.argmax(score))
+
+    def _emit(self, block: np.ndarray) -> bytes:
+        if self._skip:
+            cut = min(self._skip, len(block))
+            block = block[cut:]
+            self._skip -= cut
+        return np.clip(np.rint(block), -32768, 32767).astype(np.int16).tobytes()
+
+
+class CatchUpController:
+    """Choose a playback speed from how far playback lags behind the speaker.
+
+    The lag is the audio queued in the player plus every registered backlog
+    source (for example text still waiting for synthesis). Below ``start_lag``
+    seconds speech plays at normal speed; the speed then rises linearly to
+    ``max_speed`` at ``full_lag`` seconds. Changes are smoothed with a time
+    constant of ``smoothing`` seconds so the voice never jumps between speeds.
+    """
+
+    def __init__(
+        self, max_speed: float = 1.4, start_lag: float = 4.0, full_lag: float = 12.0, smoothing: float = 1.0
+    ) -> None:
+        self.max_speed = max(1.0, max_speed)
+        self.start_lag = max(0.0, start_lag)
+        self.full_lag = max(self.start_lag + 0.1, full_lag)
+        self.smoothing = max(0.01, smoothing)
+        self.speed = 1.0
+        self.lag = 0.0
+        self.sources: List[Callable[[], float]] = []
+        self._updated_at: Optional[float] = None
+
+    def add_source(self, source: Callable[[], float]) -> None:
+        self.sources.append(source)
+
+    def update(self, pending_seconds: float) -> float:
+        """Return the speed for the next chunk given ``pending_seconds`` of queued audio."""
+
+        self.lag = pending_seconds + sum(source() for source in self.sources)
+        excess = (self.lag - self.start_lag) / (self.full_lag - self.start_lag)
+        target = 1.0 + (self.max_speed - 1.0) * min(1.0, max(0.0, excess))
+        now = time.monotonic()
+        elapsed = 0.0 if self._updated_at is None else now - self._updated_at
+        self._updated_at = now
+        self.speed += (target - self.speed) * (1.0 - math.exp(-elapsed / self.smoothing))
+        if target == 1.0 and self.speed < 1.01:
+            self.speed = 1.0
+        return self.speed
@@ -33,15 +33,58 @@ def build_parser() -> argparse.ArgumentParser:
         type=int,
         help="Index of the microphone to use. Defaults to the system default device.",
     )
+    parser.add_argument(
+        "--input",
+        metavar="SOURCE",
+        help=(
+            "Where to capture speech from instead of the microphone: a .wav / .flac / .aiff recording, "
+            "'-' (raw 16-bit mono PCM on stdin), 'tcp://HOST:PORT' (raw PCM from a server), or "
+            "'synth' / 'synth:SECONDS' (generated speech-like bursts, for load runs). "
+            "The pipeline drains and exits when the input ends."
+        ),
+    )
+    parser.add_argument(
+        "--input-rate",
+        type=int,
+        help="Sample rate of raw --input PCM and of generated audio (default: 16000).",
+    )
+    parser.add_argument(
+        "--input-speed",
+        type=float,
+        default=1.0,
+        help="Replay --input files and generated audio at this multiple of real time; 0 reads as fast as possible.",
+    )
     parser.add_argument(
         "--output-device",
         type=int,
         help="Index of the playback device to use for audio translation.",
     )
+    parser.add_argument(
+        "--output",
+        metavar="SINK",
+        help=(
+            "Where to send synthesized speech instead of the playback device: 'null' (count only, "
+            "for benchmarks), '-' (raw 16-bit PCM on stdout), 'tcp://HOST:PORT' (raw PCM to a listener), "
+            "or a .wav / .ogg / .opus file to record to (Opus needs ffmpeg)."
+        ),
+    )
+    parser.add_argument(
+        "--output-rate",
+        type=int,
+        help="Sample rate of --output files and streams. Defaults to the rate of the first utterance.",
+    )
+    parser.add_argument(
+        "--output-roll-seconds",
+        type=float,
+        help="Start a new numbered --output file after this many seconds of audio.",
+    )
     parser.add_argument(
         "--input-language",
         default="en",
-        help="Language code expected from the microphone input (e.g., en, zh).",
+        help=(
+            "Language code expected from the microphone input (e.g., en, zh), or 'auto' to let "
+            "faster-whisper detect it per utterance (needs a multilingual model, not *.en)."
+        ),
     )
     parser.add_argument(
         "--target-language",
@@ -53,10 +96,73 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Enable translation of transcripts using the OpenAI API.",
     )
+    parser.add_argument(
+        "--translator",
+        choices=["openai", "ctranslate2"],
+        default="openai",
+        help=(
+            "Translation backend: an OpenAI-compatible chat model, or a local CTranslate2 "
+            "machine-translation model running on this machine."
+        ),
+    )
+    parser.add_argument(
+        "--local-mt-model",
+        default="opus-mt",
+        help=(
+            "Model for --translator ctranslate2: opus-mt (per language pair, fastest), nllb "
+            "(multilingual), or a path / Hugging Face repo id."
+        ),
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Never download models; only use files already present in the local caches.",
+    )
+    parser.add_argument(
+        "--bidirectional",
+        action="store_true",
+        help=(
+            "Two-way interpretation between --input-language and --target-language: each utterance's "
+            "language is identified and it is translated into the other one."
+        ),
+    )
+    parser.add_argument(
+        "--no-language-bypass",
+        action="store_true",
+        help="Translate every utterance, even ones already spoken in the target language.",
+    )
+    parser.add_argument(
+        "--bypass-tts",
+        action="store_true",
+        help="Also skip text-to-speech for utterances already in the target language.",
+    )
+    parser.add_argument(
+        "--language-confidence",
+        type=float,
+        default=0.7,
+        help="Minimum language-detection confidence before an utterance is treated as already translated.",
+    )
     parser.add_argument(
         "--base-url",
         help="Base URL for the OpenAI API (e.g. for using a proxy or compatible service).",
     )
+    parser.add_argument(
+        "--api-rate",
+        type=float,
+        default=10.0,
+        help="Client-side request rate (per second) shared by all API calls to one endpoint in this process.",
+    )
+    parser.add_argument(
+        "--api-concurrency",
+        type=int,
+        default=8,
+        help="Upper bound for concurrent API requests; the limiter adapts below it on 429s and slowdowns.",
+    )
+    parser.add_argument(
+        "--no-rate-limit",
+        action="store_true",
+        help="Disable the client-side rate limiter and rely on the SDK's own retries.",
+    )
     parser.add_argument(
         "--tts",
         action="store_true",
@@ -76,12 +182,61 @@ def build_parser() -> argparse.ArgumentParser:
         default=0.0,
         help="Sampling temperature for translation responses.",
     )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help=(
+            "Stream translation requests and fire a duplicate when the first token is later than "
+            "usual, keeping whichever answers first."
+        ),
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=95.0,
+        help="Percentile of recent time-to-first-token used as the hedge delay.",
+    )
+    parser.add_argument(
+        "--hedge-max-rate",
+        type=float,
+        default=0.1,
+        help="Maximum fraction of translation requests that may be duplicated.",
+    )
+    parser.add_argument(
+        "--hedge-model",
+        help="Model for the duplicate request. Defaults to the translation model.",
+    )
+    parser.add_argument(
+        "--hedge-base-url",
+        help="Base URL for the duplicate request, e.g. a second provider or region.",
+    )
     parser.add_argument(
         "--tts-provider",
         choices=["openai", "coqui", "edge-tts"],
         default="openai",
         help="Text-to-speech provider to use (openai, coqui, or edge-tts).",
     )
+    parser.add_argument(
+        "--tts-fallback",
+        nargs="+",
+        choices=["openai", "coqui", "edge-tts"],
+        metavar="PROVIDER",
+        help=(
+            "Providers to fall back to, in order, when --tts-provider fails or misses the first-byte "
+            "deadline (e.g. --tts-fallback edge-tts coqui)."
+        ),
+    )
+    parser.add_argument(
+        "--tts-first-byte-timeout",
+        type=float,
+        default=2.0,
+        help="Seconds to wait for a provider's first audio before starting the next fallback (default: 2).",
+    )
+    parser.add_argument(
+        "--tts-race",
+        action="store_true",
+        help="Start the two fastest TTS providers for every sentence and play whichever answers first.",
+    )
     parser.add_argument(
         "--tts-model",
         help=(
@@ -93,7 +248,95 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--voice",
         default="alloy",
-        help="Voice preset for text-to-speech playback.",
+        help=(
+            "Voice preset for text-to-speech playback. For coqui XTTS this is a built-in speaker name "
+            "or the path of a reference WAV to clone."
+        ),
+    )
+    parser.add_argument(
+        "--reverse-voice",
+        help=(
+            "Voice for speech translated back into --input-language in --bidirectional mode. "
+            "Defaults to --voice for OpenAI and to a stock voice for that language for edge-tts."
+        ),
+    )
+    parser.add_argument(
+        "--no-tts-cache",
+        action="store_true",
+        help="Always synthesize speech instead of reusing clips from the on-disk TTS cache.",
+    )
+    parser.add_argument(
+        "--tts-cache-dir",
+        help="Directory of the TTS cache. Defaults to ~/.cache/siminterp/tts.",
+    )
+    parser.add_argument(
+        "--tts-cache-mb",
+        type=int,
+        default=256,
+        help="Size limit of the TTS cache in megabytes; least recently played clips are evicted first.",
+    )
+    parser.add_argument(
+        "--tts-cache-compress",
+        action="store_true",
+        help="Store cached clips gzip-compressed.",
+    )
+    parser.add_argument(
+        "--prewarm-tts",
+        metavar="PHRASES_FILE",
+        help=(
+            "Synthesize every line of PHRASES_FILE into the TTS cache with the configured voice(s), "
+            "then exit. Run it before an event for greetings, names and agenda items."
+        ),
+    )
+    parser.add_argument(
+        "--no-tts-split",
+        action="store_true",
+        help="Send each translation to TTS in one request instead of sentence by sentence.",
+    )
+    parser.add_argument(
+        "--tts-parallelism",
+        type=int,
+        default=3,
+        help="Number of sentences of one translation synthesized concurrently (default: 3).",
+    )
+    parser.add_argument(
+        "--echo-guard",
+        choices=["off", "gate", "correlate"],
+        default="off",
+        help=(
+            "Keep the microphone from re-interpreting our own speech when a loudspeaker is in the room: "
+            "'gate' drops input captured while speech is playing; 'correlate' drops it only if it follows "
+            "the played speech, so people can still talk over it (default: off)."
+        ),
+    )
+    parser.add_argument(
+        "--echo-threshold",
+        type=float,
+        default=0.5,
+        help="Correlation (0-1) above which --echo-guard correlate treats input as our own speech (default: 0.5).",
+    )
+    parser.add_argument(
+        "--catch-up",
+        action="store_true",
+        help=(
+            "Speed up speech (pitch-preserving time-stretch) while playback lags behind the speaker, "
+            "and return to normal speed once the backlog drains."
+        ),
+    )
+    parser.add_argument(
+        "--catch-up-max-speed",
+        type=float,
+        default=1.4,
+        help="Highest playback speed --catch-up may use (default: 1.4, at most 2.0).",
+    )
+    parser.add_argument(
+        "--catch-up-lag",
+        type=float,
+        default=4.0,
+        help=(
+            "Seconds of pending speech at which --catch-up starts speeding up; "
+            "the maximum speed is reached at three times this lag (default: 4)."
+        ),
     )
     parser.add_argument(
         "--tts-speed",
@@ -129,6 +372,36 @@ def build_parser() -> argparse.ArgumentParser:
         default=10,
         help="Number of previous translated chunks to include as context.",
     )
+    parser.add_argument(
+        "--context-tokens",
+        type=int,
+        default=1024,
+        help="Token budget for the previous-chunk context sent with each translation request.",
+    )
+    parser.add_argument(
+        "--summarize-context",
+        action="store_true",
+        help=(
+            "Condense older translations into a running brief in the background and send it "
+            "with only the most recent chunks, keeping prompt size flat in long sessions."
+        ),
+    )
+    parser.add_argument(
+        "--summary-interval",
+        type=int,
+        default=8,
+        help="Number of new translated chunks that triggers a refresh of the running brief.",
+    )
+    parser.add_argument(
+        "--summary-recent",
+        type=int,
+        default=3,
+        help="Number of raw previous chunks sent alongside the running brief.",
+    )
+    parser.add_argument(
+        "--summary-model",
+        help="Model used to write the running brief. Defaults to the translation model.",
+    )
     parser.add_argument(
         "--phrase-time-limit",
         type=int,
@@ -161,6 +434,65 @@ def build_parser() -> argparse.ArgumentParser:
         default="logfile.txt",
         help="Path to the file where transcripts and translations are appended.",
     )
+    parser.add_argument(
+        "--transcript-dir",
+        help="Directory for session transcripts (default: ./tmp).",
+    )
+    parser.add_argument(
+        "--transcript-export",
+        nargs="+",
+        choices=["srt", "vtt", "jsonl", "txt"],
+        metavar="FORMAT",
+        help=(
+            "Formats written live next to the transcript journal as utterances complete: "
+            "srt, vtt (subtitles), jsonl, txt (default: txt)."
+        ),
+    )
+    parser.add_argument(
+        "--subtitle-text",
+        choices=["translation", "source", "both"],
+        default="translation",
+        help="Text of exported subtitles: the translation, the source, or both lines (default: translation).",
+    )
+    parser.add_argument(
+        "--log-max-mb",
+        type=float,
+        default=10.0,
+        help=(
+            "Start a new --log-file once it reaches this size, keeping the old one as <name>.1 "
+            "(default: 10; 0 disables)."
+        ),
+    )
+    parser.add_argument(
+        "--log-rotate-hours",
+        type=float,
+        help="Also start a new --log-file after this many hours of logging.",
+    )
+    parser.add_argument(
+        "--log-backups",
+        type=int,
+        default=5,
+        help="Number of rotated log files to keep (default: 5).",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics at http://HOST:PORT/metrics (0 picks a free port).",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default="127.0.0.1",
+        help="Address the metrics endpoint listens on (default: 127.0.0.1, local only).",
+    )
+    parser.add_argument(
+        "--event-log",
+        help="Append structured pipeline events (utterances, stage timings, drops, errors) to this JSONL file.",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report the import and initialization time of each component once the session is ready to listen.",
+    )
     return parser
 
 
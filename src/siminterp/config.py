@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -40,6 +40,58 @@ class AppConfig:
     tts_speed: float
     log_file: Path
     translation_temperature: float
+    context_token_budget: int = 1024
+    summarize_context: bool = False
+    summary_interval: int = 8
+    summary_recent_chunks: int = 3
+    summary_model: Optional[str] = None
+    translator_backend: str = "openai"
+    local_mt_model: str = "opus-mt"
+    offline: bool = False
+    hedge_translation: bool = False
+    hedge_percentile: float = 95.0
+    hedge_max_rate: float = 0.1
+    hedge_model: Optional[str] = None
+    hedge_base_url: Optional[str] = None
+    rate_limit: bool = True
+    api_rate: float = 10.0
+    api_concurrency: int = 8
+    language_bypass: bool = True
+    language_bypass_tts: bool = False
+    language_confidence: float = 0.7
+    bidirectional: bool = False
+    reverse_voice: Optional[str] = None
+    tts_cache: bool = True
+    tts_cache_dir: Optional[Path] = None
+    tts_cache_mb: int = 256
+    tts_cache_compress: bool = False
+    prewarm_path: Optional[Path] = None
+    tts_split: bool = True
+    tts_parallelism: int = 3
+    catch_up: bool = False
+    catch_up_max_speed: float = 1.4
+    catch_up_lag: float = 4.0
+    tts_fallback: Tuple[str, ...] = ()
+    tts_first_byte_timeout: float = 2.0
+    tts_race: bool = False
+    output_sink: Optional[str] = None
+    output_rate: Optional[int] = None
+    output_roll_seconds: Optional[float] = None
+    input_source: Optional[str] = None
+    input_rate: Optional[int] = None
+    input_speed: float = 1.0
+    echo_guard: str = "off"
+    echo_threshold: float = 0.5
+    log_max_bytes: Optional[int] = 10 * 1024 * 1024
+    log_rotate_seconds: Optional[float] = None
+    log_backups: int = 5
+    transcript_dir: Path = Path("tmp")
+    transcript_exports: Tuple[str, ...] = ("txt",)
+    subtitle_text: str = "translation"
+    metrics_port: Optional[int] = None
+    metrics_host: str = "127.0.0.1"
+    event_log: Optional[Path] = None
+    profile_startup: bool = False
 
 
 def load_environment() -> None:
@@ -48,12 +100,29 @@ def load_environment() -> None:
     load_dotenv(override=False)
 
 
+def check_languages(input_language: str, bidirectional: bool, translator_backend: str, translate: bool) -> None:
+    """Raise ``ValueError`` for language settings the session cannot run with (shared by the CLI and the GUI)."""
+
+    auto_input = input_language.strip().lower() == "auto"
+    if bidirectional and auto_input:
+        raise ValueError("--bidirectional needs an explicit --input-language for the second language of the pair")
+    if auto_input and translator_backend != "openai" and translate:
+        # Local MT models are loaded per language pair at start-up, so the source language must be known.
+        raise ValueError(f"--translator {translator_backend} needs an explicit --input-language, not auto")
+
+
 def build_config(args) -> AppConfig:
     """Create an :class:`AppConfig` instance from parsed CLI arguments."""
 
     load_environment()
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    translator_backend = getattr(args, "translator", "openai")
+    tts_provider = getattr(args, "tts_provider", "openai")
+    enable_tts = bool(getattr(args, "tts", False)) or bool(getattr(args, "prewarm_tts", None))
+    needs_openai = (bool(getattr(args, "translate", False)) and translator_backend == "openai") or (
+        enable_tts and tts_provider == "openai"
+    )
+    api_key = os.getenv("OPENAI_API_KEY") or ""
+    if not api_key and needs_openai:
         raise ValueError(
             "OPENAI_API_KEY environment variable not set. Configure it in your environment or .env file."
         )
@@ -68,6 +137,10 @@ def build_config(args) -> AppConfig:
 
     log_file = Path(getattr(args, "log_file", "logfile.txt")).expanduser()
     log_file.parent.mkdir(parents=True, exist_ok=True)
+    log_max_mb = float(getattr(args, "log_max_mb", 10.0) or 0.0)
+    log_max_bytes = int(log_max_mb * 1024 * 1024) if log_max_mb > 0 else None
+    log_rotate_hours = getattr(args, "log_rotate_hours", None)
+    log_rotate_seconds = log_rotate_hours * 3600 if log_rotate_hours and log_rotate_hours > 0 else None
 
     whisper_threads = getattr(args, "whisper_threads", None)
     if whisper_threads is not None and whisper_threads <= 0:
@@ -75,6 +148,17 @@ def build_config(args) -> AppConfig:
 
     chunk_history = max(1, getattr(args, "history", 10))
 
+    prewarm_path: Optional[Path] = None
+    if getattr(args, "prewarm_tts", None):
+        prewarm_path = Path(args.prewarm_tts).expanduser()
+        if not prewarm_path.exists():
+            raise FileNotFoundError(f"Phrase list not found: {prewarm_path}")
+
+    bidirectional = bool(getattr(args, "bidirectional", False))
+    input_language = getattr(args, "input_language", "en")
+    translation_language = getattr(args, "target_language", "fr")
+    check_languages(input_language, bidirectional, translator_backend, bool(getattr(args, "translate", False)))
+
     # Priority: CLI args > Environment variables > Default values
     openai_model = (
         getattr(args, "model", None)
@@ -92,15 +176,15 @@ def build_config(args) -> AppConfig:
         base_url=base_url,
         input_device_index=getattr(args, "input_device", None),
         output_device_index=getattr(args, "output_device", None),
-        input_language=getattr(args, "input_language", "en"),
-        translation_language=getattr(args, "target_language", "fr"),
+        input_language=input_language,
+        translation_language=translation_language,
         enable_translation=bool(getattr(args, "translate", False)),
-        enable_tts=bool(getattr(args, "tts", False)),
+        enable_tts=enable_tts,
         dictionary_path=dictionary_path,
         topic=getattr(args, "topic", ""),
         openai_model=openai_model,
         tts_voice=getattr(args, "voice", "alloy"),
-        tts_provider=getattr(args, "tts_provider", "openai"),
+        tts_provider=tts_provider,
         tts_model=tts_model,
         transcriber=getattr(args, "transcriber", "faster-whisper"),
         whisper_model=getattr(args, "whisper_model", "base.en"),
@@ -113,4 +197,56 @@ def build_config(args) -> AppConfig:
         tts_speed=max(0.25, float(getattr(args, "tts_speed", 1.0))),
         log_file=log_file,
         translation_temperature=float(getattr(args, "temperature", 0.0)),
+        context_token_budget=max(0, int(getattr(args, "context_tokens", 1024))),
+        summarize_context=bool(getattr(args, "summarize_context", False)),
+        summary_interval=max(1, int(getattr(args, "summary_interval", 8))),
+        summary_recent_chunks=max(0, int(getattr(args, "summary_recent", 3))),
+        summary_model=getattr(args, "summary_model", None),
+        translator_backend=translator_backend,
+        local_mt_model=getattr(args, "local_mt_model", "opus-mt"),
+        offline=bool(getattr(args, "offline", False)),
+        hedge_translation=bool(getattr(args, "hedge", False)),
+        hedge_percentile=float(getattr(args, "hedge_percentile", 95.0)),
+        hedge_max_rate=min(1.0, max(0.0, float(getattr(args, "hedge_max_rate", 0.1)))),
+        hedge_model=getattr(args, "hedge_model", None),
+        hedge_base_url=getattr(args, "hedge_base_url", None),
+        rate_limit=not bool(getattr(args, "no_rate_limit", False)),
+        api_rate=max(0.1, float(getattr(args, "api_rate", 10.0))),
+        api_concurrency=max(1, int(getattr(args, "api_concurrency", 8))),
+        language_bypass=not bool(getattr(args, "no_language_bypass", False)),
+        language_bypass_tts=bool(getattr(args, "bypass_tts", False)),
+        language_confidence=min(1.0, max(0.0, float(getattr(args, "language_confidence", 0.7)))),
+        bidirectional=bidirectional,
+        reverse_voice=getattr(args, "reverse_voice", None),
+        tts_cache=not bool(getattr(args, "no_tts_cache", False)),
+        tts_cache_dir=Path(args.tts_cache_dir).expanduser() if getattr(args, "tts_cache_dir", None) else None,
+        tts_cache_mb=max(0, int(getattr(args, "tts_cache_mb", 256))),
+        tts_cache_compress=bool(getattr(args, "tts_cache_compress", False)),
+        prewarm_path=prewarm_path,
+        tts_split=not bool(getattr(args, "no_tts_split", False)),
+        tts_parallelism=max(1, int(getattr(args, "tts_parallelism", 3))),
+        catch_up=bool(getattr(args, "catch_up", False)),
+        catch_up_max_speed=min(2.0, max(1.0, float(getattr(args, "catch_up_max_speed", 1.4)))),
+        catch_up_lag=max(0.5, float(getattr(args, "catch_up_lag", 4.0))),
+        tts_fallback=tuple(getattr(args, "tts_fallback", None) or ()),
+        tts_first_byte_timeout=max(0.1, float(getattr(args, "tts_first_byte_timeout", 2.0))),
+        tts_race=bool(getattr(args, "tts_race", False)),
+        output_sink=getattr(args, "output", None),
+        output_rate=getattr(args, "output_rate", None),
+        output_roll_seconds=getattr(args, "output_roll_seconds", None),
+        input_source=getattr(args, "input", None),
+        input_rate=getattr(args, "input_rate", None),
+        input_speed=max(0.0, float(getattr(args, "input_speed", 1.0))),
+        echo_guard=getattr(args, "echo_guard", None) or "off",
+        echo_threshold=min(1.0, max(0.0, float(getattr(args, "echo_threshold", 0.5)))),
+        log_max_bytes=log_max_bytes,
+        log_rotate_seconds=log_rotate_seconds,
+        log_backups=max(1, int(getattr(args, "log_backups", 5))),
+        transcript_dir=Path(getattr(args, "transcript_dir", None) or "tmp").expanduser(),
+        transcript_exports=tuple(getattr(args, "transcript_export", None) or ("txt",)),
+        subtitle_text=getattr(args, "subtitle_text", None) or "translation",
+        metrics_port=getattr(args, "metrics_port", None),
+        metrics_host=getattr(args, "metrics_host", None) or "127.0.0.1",
+        event_log=Path(args.event_log).expanduser() if getattr(args, "event_log", None) else None,
+        profile_startup=bool(getattr(args, "profile_startup", False)),
     )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Mapping, Optional
+from typing import Dict, List, Mapping, Optional, Tuple
 
 
 def load_dictionary(path: Optional[Path]) -> Dict[str, str]:
@@ -23,13 +23,113 @@ def load_dictionary(path: Optional[Path]) -> Dict[str, str]:
     return custom
 
 
-def preprocess_text(text: str, mapping: Mapping[str, str]) -> str:
-    """Replace occurrences of dictionary keys with the mapped translation."""
+def invert_dictionary(mapping: Mapping[str, str]) -> Dict[str, str]:
+    """Return the ``translation=term`` glossary for translating in the opposite direction."""
 
-    if not mapping:
-        return text
-
-    processed = text
+    inverted: Dict[str, str] = {}
     for term, translation in mapping.items():
-        processed = processed.replace(term, translation)
-    return processed
+        if translation and translation not in inverted:
+            inverted[translation] = term
+    return inverted
+
+
+class GlossaryMatcher:
+    """Find glossary terms in a sentence without scanning the whole glossary.
+
+    Terms are bucketed by their first few characters, and each position of the
+    sentence only probes the lengths of terms that share its prefix, so the cost
+    per sentence depends on the sentence and the number of hits rather than on
+    the size of the glossary. Matching is case-insensitive, and terms that start
+    or end with an ASCII letter or digit only match at word boundaries (``cat``
+    does not fire inside ``category``) while CJK terms match anywhere.
+    """
+
+    _PREFIX = 3
+
+    def __init__(self, mapping: Mapping[str, str]) -> None:
+        self._entries: Dict[str, Tuple[str, str]] = {}
+        lengths: Dict[str, set] = {}
+        for term, translation in mapping.items():
+            key = _fold(term)
+            if not key or key in self._entries:
+                continue
+            self._entries[key] = (term, translation)
+            lengths.setdefault(key[: self._PREFIX], set()).add(len(key))
+        self._lengths: Dict[str, List[int]] = {
+            prefix: sorted(values, reverse=True) for prefix, values in lengths.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """Return ``(start, end, term, translation)`` for every boundary-respecting match."""
+
+        if not self._entries or not text:
+            return []
+        folded = _fold(text)
+        if len(folded) != len(text):
+            folded = "".join(_fold(char) if len(_fold(char)) == 1 else char for char in text)
+        entries, lengths, prefix_size = self._entries, self._lengths, self._PREFIX
+        size = len(folded)
+        matches: List[Tuple[int, int, str, str]] = []
+        for start in range(size):
+            if start and _is_ascii_word(folded[start]) and _is_ascii_word(folded[start - 1]):
+                continue
+            for width in range(1, prefix_size + 1):
+                prefix = folded[start : start + width]
+                if len(prefix) < width:
+                    break
+                for length in lengths.get(prefix, ()):
+                    # Terms shorter than the prefix are bucketed under their full key.
+                    if (length >= prefix_size) != (width == prefix_size):
+                        continue
+                    end = start + length
+                    if end > size:
+                        continue
+                    entry = entries.get(folded[start:end])
+                    if entry is not None and _at_boundary(text, start, end):
+                        matches.append((start, end, entry[0], entry[1]))
+        return matches
+
+    def relevant(self, text: str) -> Dict[str, str]:
+        """Return the glossary entries that occur in ``text``, in order of first appearance."""
+
+        found: Dict[str, str] = {}
+        for _, _, term, translation in self.find(text):
+            if term not in found and translation:
+                found[term] = translation
+        return found
+
+    def replace(self, text: str) -> str:
+        """Replace matched terms with their translations, preferring leftmost-longest matches."""
+
+        matches = sorted(self.find(text), key=lambda match: (match[0], match[0] - match[1]))
+        if not matches:
+            return text
+        parts: List[str] = []
+        cursor = 0
+        for start, end, _, translation in matches:
+            if start < cursor:
+                continue
+            parts.append(text[cursor:start])
+            parts.append(translation)
+            cursor = end
+        parts.append(text[cursor:])
+        return "".join(parts)
+
+
+def _fold(text: str) -> str:
+    return text.lower()
+
+
+def _is_ascii_word(char: str) -> bool:
+    return char.isascii() and (char.isalnum() or char == "_")
+
+
+def _at_boundary(text: str, start: int, end: int) -> bool:
+    if start > 0 and _is_ascii_word(text[start]) and _is_ascii_word(text[start - 1]):
+        return False
+    if end < len(text) and _is_ascii_word(text[end - 1]) and _is_ascii_word(text[end]):
+        return False
+    return True
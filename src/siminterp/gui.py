@@ -4,17 +4,22 @@ import threading
 import os
 from typing import Optional
 
-from openai import OpenAI
 from dotenv import load_dotenv
 
-from .config import AppConfig
-from .audio.devices import enumerate_devices
+from .config import AppConfig, check_languages
+from .audio.devices import device_registry
 from .pipeline import InterpretationPipeline
 from .logging_utils import RichLogger
 from .transcription.engines import create_transcriber
 from .dictionary import load_dictionary
 from .openai_models import TRANSLATION_MODELS
-from .__main__ import build_translator, build_tts_engine
+from .__main__ import (
+    build_client,
+    build_reverse_components,
+    build_summarizer,
+    build_translator,
+    build_tts_engine,
+)
 
 # TTS Voice Options
 TTS_VOICES = {
@@ -61,7 +66,7 @@ class SimInterpGUI:
         self.config = config
         self.pipeline: Optional[InterpretationPipeline] = None
         
-        self.input_devices, self.output_devices = enumerate_devices()
+        self.input_devices, self.output_devices = device_registry().devices()
         
         # Setup Notebook (Tabs)
         self.notebook = ttk.Notebook(self.root)
@@ -122,7 +127,10 @@ class SimInterpGUI:
 
         # Input Device
         self.input_device_var = tk.StringVar()
-        self.input_combo = ttk.Combobox(settings_frame, textvariable=self.input_device_var, state="readonly")
+        # Re-enumerate when a list is opened, so devices plugged in after start-up appear.
+        self.input_combo = ttk.Combobox(
+            settings_frame, textvariable=self.input_device_var, state="readonly", postcommand=self.refresh_devices
+        )
         self.input_combo['values'] = [f"{d.index}: {d.name}" for d in self.input_devices]
         if self.config.input_device_index is not None:
             for val in self.input_combo['values']:
@@ -135,7 +143,9 @@ class SimInterpGUI:
 
         # Output Device
         self.output_device_var = tk.StringVar()
-        self.output_combo = ttk.Combobox(settings_frame, textvariable=self.output_device_var, state="readonly")
+        self.output_combo = ttk.Combobox(
+            settings_frame, textvariable=self.output_device_var, state="readonly", postcommand=self.refresh_devices
+        )
         self.output_combo['values'] = [f"{d.index}: {d.name}" for d in self.output_devices]
         if self.config.output_device_index is not None:
             for val in self.output_combo['values']:
@@ -152,7 +162,7 @@ class SimInterpGUI:
         # Input Language
         self.input_lang_var = tk.StringVar(value=self.config.input_language)
         self.input_lang_combo = ttk.Combobox(settings_frame, textvariable=self.input_lang_var)
-        self.input_lang_combo['values'] = ['en', 'zh', 'fr', 'es', 'de', 'ja', 'ko']
+        self.input_lang_combo['values'] = ['auto', 'en', 'zh', 'fr', 'es', 'de', 'ja', 'ko']
         add_setting("输入语言", self.input_lang_combo)
 
         # Target Language
@@ -161,6 +171,17 @@ class SimInterpGUI:
         self.target_lang_combo['values'] = ['en', 'zh', 'fr', 'es', 'de', 'ja', 'ko']
         add_setting("目标语言", self.target_lang_combo)
 
+        # Two-way interpretation between the input and target language
+        self.bidirectional_var = tk.BooleanVar(value=self.config.bidirectional)
+        self.bidirectional_check = ttk.Checkbutton(settings_frame, text="双向互译", variable=self.bidirectional_var)
+        add_setting("", self.bidirectional_check, sticky="w")
+
+        # Translation Backend
+        self.translator_backend_var = tk.StringVar(value=self.config.translator_backend)
+        self.translator_backend_combo = ttk.Combobox(settings_frame, textvariable=self.translator_backend_var, state="readonly")
+        self.translator_backend_combo['values'] = ['openai', 'ctranslate2']
+        add_setting("翻译引擎", self.translator_backend_combo)
+
         # Translation Model
         self.translation_model_var = tk.StringVar(value=self.config.openai_model)
         self.translation_model_combo = ttk.Combobox(settings_frame, textvariable=self.translation_model_var)
@@ -303,6 +324,21 @@ class SimInterpGUI:
         except Exception as e:
             messagebox.showerror("错误", f"保存配置失败: {e}")
 
+    def refresh_devices(self) -> None:
+        registry = device_registry()
+        if self.pipeline is not None or not registry.refresh():
+            return
+        self.input_devices, self.output_devices = registry.devices()
+        for combo, devices in ((self.input_combo, self.input_devices), (self.output_combo, self.output_devices)):
+            # Indices shift on hot-plug; keep the selection by device name.
+            selected = combo.get().split(": ", 1)[-1]
+            combo['values'] = [f"{d.index}: {d.name}" for d in devices]
+            matches = [value for value in combo['values'] if value.split(": ", 1)[-1] == selected]
+            if matches:
+                combo.set(matches[0])
+            elif devices:
+                combo.current(0)
+
     def _get_device_index(self, combo_value: str) -> int:
         return int(combo_value.split(":")[0])
 
@@ -317,6 +353,18 @@ class SimInterpGUI:
         self.config.output_device_index = output_idx
         self.config.input_language = self.input_lang_var.get()
         self.config.translation_language = self.target_lang_var.get()
+        self.config.bidirectional = self.bidirectional_var.get()
+        self.config.translator_backend = self.translator_backend_var.get()
+        try:
+            check_languages(
+                self.config.input_language,
+                self.config.bidirectional,
+                self.config.translator_backend,
+                self.config.enable_translation,
+            )
+        except ValueError as e:
+            self.log_area.insert(tk.END, f"错误：{e}\n")
+            return
         self.config.openai_model = self.translation_model_var.get()
         self.config.whisper_device = self.device_var.get()
         self.config.tts_provider = self.tts_provider_var.get()
@@ -334,6 +382,8 @@ class SimInterpGUI:
         self.output_combo.config(state=tk.DISABLED)
         self.input_lang_combo.config(state=tk.DISABLED)
         self.target_lang_combo.config(state=tk.DISABLED)
+        self.bidirectional_check.config(state=tk.DISABLED)
+        self.translator_backend_combo.config(state=tk.DISABLED)
         self.translation_model_combo.config(state=tk.DISABLED)
         self.pause_threshold_entry.config(state=tk.DISABLED)
         self.tts_speed_entry.config(state=tk.DISABLED)
@@ -358,7 +408,7 @@ class SimInterpGUI:
             logger = GuiLogger(self.config.log_file, self.log_area)
             logger.log_text("开始初始化...")
             
-            client = OpenAI(api_key=self.config.api_key, base_url=self.config.base_url)
+            client = build_client(self.config)
             logger.log_text("OpenAI 客户端已初始化。")
             
             # Heavy lifting: loading models
@@ -366,9 +416,13 @@ class SimInterpGUI:
             transcriber = create_transcriber(self.config)
             logger.log_text("转录模型已加载。")
 
-            translator = build_translator(self.config, client)
-            tts_engine = build_tts_engine(self.config, client)
             dictionary = load_dictionary(self.config.dictionary_path)
+            translator = build_translator(self.config, client, dictionary)
+            tts_engine = build_tts_engine(self.config, client)
+            summarizer = build_summarizer(self.config, client)
+            reverse_translator, reverse_tts_engine = build_reverse_components(
+                self.config, client, dictionary, translator, tts_engine
+            )
 
             self.pipeline = InterpretationPipeline(
                 config=self.config,
@@ -377,6 +431,9 @@ class SimInterpGUI:
                 dictionary=dictionary,
                 translator=translator,
                 tts_engine=tts_engine,
+                summarizer=summarizer,
+                reverse_translator=reverse_translator,
+                reverse_tts_engine=reverse_tts_engine,
             )
             
             logger.log_text("流水线已创建。正在启动...")
@@ -410,6 +467,8 @@ class SimInterpGUI:
         self.output_combo.config(state="readonly")
         self.input_lang_combo.config(state=tk.NORMAL)
         self.target_lang_combo.config(state=tk.NORMAL)
+        self.bidirectional_check.config(state=tk.NORMAL)
+        self.translator_backend_combo.config(state="readonly")
         self.translation_model_combo.config(state=tk.NORMAL)
         self.pause_threshold_entry.config(state=tk.NORMAL)
         self.tts_speed_entry.config(state=tk.NORMAL)
@@ -0,0 +1,129 @@
+"""Language names and a fast script-based guess of which language a text is in."""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Optional, Tuple
+
+# Common language names accepted by --input-language / --target-language, mapped to ISO 639-1 codes.
+LANGUAGE_NAMES = {
+    "english": "en",
+    "chinese": "zh",
+    "mandarin": "zh",
+    "french": "fr",
+    "spanish": "es",
+    "german": "de",
+    "japanese": "ja",
+    "korean": "ko",
+    "russian": "ru",
+    "italian": "it",
+    "portuguese": "pt",
+    "arabic": "ar",
+    "hindi": "hi",
+    "vietnamese": "vi",
+    "thai": "th",
+    "indonesian": "id",
+    "turkish": "tr",
+    "dutch": "nl",
+    "polish": "pl",
+    "ukrainian": "uk",
+}
+
+# Unicode blocks whose script identifies (or nearly identifies) the language.
+_SCRIPT_RANGES: Tuple[Tuple[int, int, str], ...] = (
+    (0x3040, 0x30FF, "kana"),
+    (0x31F0, 0x31FF, "kana"),
+    (0x4E00, 0x9FFF, "han"),
+    (0x3400, 0x4DBF, "han"),
+    (0xF900, 0xFAFF, "han"),
+    (0xAC00, 0xD7AF, "hangul"),
+    (0x1100, 0x11FF, "hangul"),
+    (0x0400, 0x04FF, "cyrillic"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0E00, 0x0E7F, "thai"),
+)
+
+_SCRIPT_LANGUAGE = {"hangul": "ko", "arabic": "ar", "devanagari": "hi", "thai": "th"}
+
+# A handful of very frequent function words per Latin-script language. Enough to tell
+# short utterances apart; anything ambiguous is reported as unknown.
+_LATIN_WORDS: Dict[str, frozenset] = {
+    "en": frozenset("the and is are of to in that it you we this was for with have not be on".split()),
+    "fr": frozenset("le la les et est des une un que qui dans pour pas vous nous sur avec ce je".split()),
+    "es": frozenset("el la los las y es que de en un una por para con no se lo su como".split()),
+    "de": frozenset("der die das und ist nicht ein eine ich sie wir mit zu den auf für es".split()),
+    "it": frozenset("il lo la gli le e è che di un una per non con sono questo ci".split()),
+    "pt": frozenset("o a os as e é que de em um uma para com não se do da por".split()),
+    "nl": frozenset("de het een en is van dat niet ik je we met op zijn voor te".split()),
+}
+
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+def normalize_language(language: str) -> str:
+    """Return an ISO 639-1 code for ``language`` (``French``, ``fr``, ``fr-FR`` all give ``fr``)."""
+
+    value = language.strip().lower()
+    value = LANGUAGE_NAMES.get(value, value)
+    return re.split(r"[-_]", value, maxsplit=1)[0]
+
+
+def guess_language(text: str) -> Tuple[Optional[str], float]:
+    """Guess the language of ``text`` from its script and common words.
+
+    Returns ``(code, confidence)``; ``code`` is ``None`` when the text gives no
+    usable signal. This is a fallback for when the recogniser did not report a
+    language, so it favours saying "unknown" over guessing wrong.
+    """
+
+    counts: Dict[str, int] = {}
+    letters = 0
+    for char in text:
+        if not char.isalpha():
+            continue
+        letters += 1
+        code = ord(char)
+        if code < 0x0250:
+            counts["latin"] = counts.get("latin", 0) + 1
+            continue
+        for low, high, script in _SCRIPT_RANGES:
+            if low <= code <= high:
+                counts[script] = counts.get(script, 0) + 1
+                break
+    if not letters:
+        return None, 0.0
+
+    if counts.get("kana"):
+        return "ja", min(1.0, (counts["kana"] + counts.get("han", 0)) / letters)
+    script, count = max(counts.items(), key=lambda item: item[1]) if counts else ("", 0)
+    share = count / letters
+    if script == "han":
+        return "zh", share
+    if script == "cyrillic":
+        # Ukrainian-only letters; otherwise assume Russian.
+        if any(char in "іїєґІЇЄҐ" for char in text):
+            return "uk", share
+        return "ru", share * 0.9
+    if script in _SCRIPT_LANGUAGE:
+        return _SCRIPT_LANGUAGE[script], share
+    if script == "latin":
+        language, score = _guess_latin(text)
+        return language, share * score
+    return None, 0.0
+
+
+def _guess_latin(text: str) -> Tuple[Optional[str], float]:
+    words = [word.lower() for word in _WORD.findall(text)]
+    if not words:
+        return None, 0.0
+    hits = {language: sum(word in vocabulary for word in words) for language, vocabulary in _LATIN_WORDS.items()}
+    ranked = sorted(hits.items(), key=lambda item: item[1], reverse=True)
+    best, best_hits = ranked[0]
+    runner_up = ranked[1][1]
+    if best_hits == 0 or best_hits == runner_up:
+        return None, 0.0
+    # Confidence grows with the margin over the runner-up and with the share of function words.
+    margin = (best_hits - runner_up) / best_hits
+    coverage = min(1.0, best_hits / max(1.0, len(words) * 0.25))
+    return best, margin * coverage
@@ -1,26 +1,224 @@
 from __future__ import annotations
 
+import atexit
+import queue
+import sys
+import threading
+import time
 import traceback
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, TextIO, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
 
 
+class LogWriter:
+    """Append lines to a log file from a background thread, with rotation.
+
+    :meth:`write` only puts the line on an unbounded queue, so callers on the
+    translation and TTS path never wait for the disk. The thread writes lines in
+    batches, once ``flush_bytes`` have accumulated or ``flush_interval`` seconds
+    after the first pending line, through a file handle it keeps open. Before a
+    batch would take the file past ``max_bytes``, or once this process has been
+    writing to it for ``rotate_seconds``, the file is renamed to ``<name>.1``
+    (older ones move up to ``.<backups>``; the oldest is deleted) and a new one
+    is started.
+    :meth:`flush` and :meth:`close` return only after every line written before
+    them is on disk; open writers are closed at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: Optional[int] = None,
+        rotate_seconds: Optional[float] = None,
+        backups: int = 5,
+        flush_interval: float = 0.5,
+        flush_bytes: int = 64 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backups = max(1, backups)
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._handle: Optional[TextIO] = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._closed = False
+        self._reported = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str) -> None:
+        if self._closed:
+            raise RuntimeError("LogWriter is closed")
+        self._queue.put(line)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything written so far is on disk; returns ``False`` on timeout."""
+
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        pending: List[str] = []
+        size = 0
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+            if isinstance(item, str):
+                pending.append(item)
+                size += len(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if size < self.flush_bytes:
+                    continue
+            if pending:
+                written = self._write(pending)
+                pending = pending[written:]
+                size = sum(len(line) for line in pending)
+            deadline = time.monotonic() + self.flush_interval if pending else None
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                self._release()
+                return
+
+    def _write(self, lines: List[str]) -> int:
+        """Write ``lines``, rotating between them where needed; returns how many were written."""
+
+        written = 0
+        batch: List[str] = []
+        size = 0
+        try:
+            if self._handle is None:
+                self._open()
+            for line in lines:
+                length = len(line.encode("utf-8"))
+                if self._due(size, length):
+                    self._emit(batch, size)
+                    written += len(batch)
+                    batch, size = [], 0
+                    self._rotate()
+                batch.append(line)
+                size += length
+            self._emit(batch, size)
+            return written + len(batch)
+        except OSError as error:
+            # Keep the unwritten lines and try again with the next batch.
+            if not self._reported:
+                self._reported = True
+                print(f"Could not write log file {self.path}: {error}", file=sys.stderr)
+            self._release()
+            return written
+
+    def _emit(self, lines: List[str], size: int) -> None:
+        assert self._handle is not None
+        self._handle.write("".join(lines))
+        self._handle.flush()
+        self._size += size
+
+    def _due(self, batched: int, incoming: int) -> bool:
+        used = self._size + batched
+        if not used:
+            return False
+        if self.max_bytes is not None and used + incoming > self.max_bytes:
+            return True
+        return self.rotate_seconds is not None and time.time() - self._opened_at >= self.rotate_seconds
+
+    def _open(self) -> None:
+        self._handle = self.path.open("a", encoding="utf-8")
+        self._size = self._handle.tell()
+        self._opened_at = time.time()
+
+    def _rotate(self) -> None:
+        self._release()
+        for index in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        self._open()
+
+    def _release(self) -> None:
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+            self._handle = None
+
+
+_WRITERS: Dict[Path, LogWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+# Set by configure_log_rotation(): (max bytes, max age in seconds, backups kept).
+_ROTATION: Tuple[Optional[int], Optional[float], int] = (None, None, 5)
+
+
+def configure_log_rotation(
+    max_bytes: Optional[int] = None, rotate_seconds: Optional[float] = None, backups: int = 5
+) -> None:
+    """Choose when log files roll over; applies to writers created afterwards."""
+
+    global _ROTATION
+    _ROTATION = (max_bytes, rotate_seconds, backups)
+
+
+def log_writer(path: Path) -> LogWriter:
+    """Return the process-wide writer for a log file, creating it once."""
+
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(path)
+        if writer is None:
+            # Resolving touches the file system, so it happens once per spelling of the path.
+            resolved = Path(path).expanduser().resolve()
+            writer = next((known for known in _WRITERS.values() if known.path == resolved), None)
+            if writer is None:
+                max_bytes, rotate_seconds, backups = _ROTATION
+                writer = LogWriter(resolved, max_bytes, rotate_seconds, backups)
+            _WRITERS[path] = writer
+        return writer
+
+
+@atexit.register
+def close_log_writers() -> None:
+    """Write out every pending line and close the log files."""
+
+    with _WRITERS_LOCK:
+        writers = list({id(writer): writer for writer in _WRITERS.values()}.values())
+        _WRITERS.clear()
+    for writer in writers:
+        writer.close()
+
+
 @dataclass(slots=True)
 class RichLogger:
-    """Wrapper around Rich console logging with persistent transcripts."""
+    """Wrapper around Rich console logging with a persistent log file."""
 
     log_file: Path
     console: Console = field(default_factory=Console)
-    captured_output: List[str] = field(default_factory=list)
 
     def log_text(self, message: str) -> None:
         self.console.print(message)
-        self.captured_output.append(message)
         self._write_line(message)
 
     def log_panel(self, message: str, title: str, style: str) -> None:
@@ -28,37 +226,21 @@ class RichLogger:
         self.console.print(panel)
         self._write_line(f"{title}: {message}")
 
+    def log_debug(self, message: str) -> None:
+        """Record a diagnostic line in the log file without printing it."""
+
+        self._write_line(message)
+
     def log_exception(self, error: Exception) -> None:
         self.log_panel(str(error), "ERROR", "red")
         tb = traceback.format_exc()
         self._write_line(tb)
 
+    def flush(self) -> None:
+        """Wait until every line logged so far has reached the log file."""
+
+        log_writer(self.log_file).flush()
+
     def _write_line(self, message: str) -> None:
         timestamp = datetime.now().isoformat(timespec="seconds")
-        with self.log_file.open("a", encoding="utf-8") as handle:
-            handle.write(f"{timestamp} - {message}\n")
-
-    def build_transcript(self) -> str:
-        transcript_lines: List[str] = []
-        translation_lines: List[str] = []
-        for line in self.captured_output:
-            if line.startswith("Translated:"):
-                translation_lines.append(line.replace("Translated:", "", 1).strip())
-            else:
-                transcript_lines.append(line.strip())
-        transcript = ["Transcript:"]
-        transcript.extend(transcript_lines)
-        transcript.append("")
-        transcript.append("Translated:")
-        transcript.extend(translation_lines)
-        return "\n".join(transcript)
-
-    def save_transcript(self, directory: Optional[Path] = None) -> Path:
-        if directory is None:
-            directory = Path.cwd() / "tmp"
-        directory.mkdir(parents=True, exist_ok=True)
-        filename = datetime.now().strftime("%Y%m%d-%H%M%S.txt")
-        destination = directory / filename
-        destination.write_text(self.build_transcript(), encoding="utf-8")
-        self.log_panel(f"Transcription saved to {destination}", "LOG", "bold green")
-        return destination
+        log_writer(self.log_file).write(f"{timestamp} - {message}\n")
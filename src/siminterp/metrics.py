@@ -0,0 +1,331 @@
+"""Process-wide metrics with a Prometheus text endpoint, and a JSON event log."""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .logging_utils import log_writer
+
+LabelValues = Tuple[str, ...]
+# A callback returns the value of an unlabelled metric, or one value per label combination.
+Sampler = Callable[[], Union[float, Mapping[LabelValues, float]]]
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0)
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0)
+
+
+class _Cells:
+    """Per-thread accumulators: each thread only ever adds to its own cell, so updates take no lock.
+
+    A lock is taken once per thread, when its cell is created; cells of threads
+    that have exited are folded into ``retired`` at that point, so short-lived
+    threads do not accumulate.
+    """
+
+    __slots__ = ("size", "_local", "_cells", "_retired", "_lock")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._local = threading.local()
+        self._cells: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * size
+        self._lock = threading.Lock()
+
+    def cell(self) -> List[float]:
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = [0.0] * self.size
+            with self._lock:
+                alive = []
+                for thread, old in self._cells:
+                    if thread.is_alive():
+                        alive.append((thread, old))
+                    else:
+                        self._retired = [a + b for a, b in zip(self._retired, old)]
+                alive.append((threading.current_thread(), cell))
+                self._cells = alive
+            self._local.cell = cell
+        return cell
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            cells = [cell for _, cell in self._cells]
+            totals = list(self._retired)
+        for cell in cells:
+            for index, value in enumerate(list(cell)):
+                totals[index] += value
+        return totals
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, "_Metric"] = {}
+        self._lock = threading.Lock()
+        self._sampler: Optional[Sampler] = None
+
+    def labels(self, *values: object) -> "_Metric":
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._child())
+        return child
+
+    def set_function(self, sampler: Optional[Sampler]) -> None:
+        """Read the value from ``sampler`` at collection time instead of tracking it (``None`` stops)."""
+
+        self._sampler = sampler
+
+    def collect(self) -> List[Tuple[str, Dict[str, str], float]]:
+        samples: List[Tuple[str, Dict[str, str], float]] = []
+        sampler = self._sampler
+        if sampler is not None:
+            try:
+                value = sampler()
+            except Exception:  # pragma: no cover - a broken sampler must not break the endpoint
+                value = {}
+            if isinstance(value, Mapping):
+                for key, item in value.items():
+                    samples.append(("", dict(zip(self.labelnames, key)), float(item)))
+            else:
+                samples.append(("", {}, float(value)))
+        if self.labelnames:
+            for key, child in list(self._children.items()):
+                labels = dict(zip(self.labelnames, key))
+                samples.extend((suffix, {**labels, **extra}, value) for suffix, extra, value in child._own())
+        elif sampler is None:
+            samples.extend(self._own())
+        return samples
+
+    def _child(self) -> "_Metric":
+        return type(self)(self.name, self.documentation)
+
+    def _own(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return []
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+    def _own(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [("_total", {}, self.value)]
+
+    def collect(self) -> List[Tuple[str, Dict[str, str], float]]:
+        # Sampled counters are reported under the conventional ``_total`` name too.
+        return [(suffix or "_total", labels, value) for suffix, labels, value in super().collect()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value  # a single assignment, atomic without a lock
+
+    def _own(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [("", {}, self.value)]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket, one for +Inf, then the sum and the count.
+        self._cells = _Cells(len(self.buckets) + 3)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def _child(self) -> "_Metric":
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def _own(self) -> List[Tuple[str, Dict[str, str], float]]:
+        totals = self._cells.totals()
+        samples: List[Tuple[str, Dict[str, str], float]] = []
+        cumulative = 0.0
+        for bound, count in zip((*self.buckets, math.inf), totals):
+            cumulative += count
+            samples.append(("_bucket", {"le": _format_value(bound)}, cumulative))
+        samples.append(("_sum", {}, totals[-2]))
+        samples.append(("_count", {}, totals[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """Named metrics, rendered in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = "siminterp_") -> None:
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(self.prefix + name, documentation, labelnames, buckets)
+            return metric  # type: ignore[return-value]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            samples = metric.collect()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, kind: type, name: str, documentation: str, labelnames: Sequence[str]) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = kind(self.prefix + name, documentation, labelnames)
+            return metric
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass  # scrapes every few seconds would flood the console
+
+
+class MetricsServer:
+    """Serve ``GET /metrics`` from a background thread; ``port`` 0 picks a free port."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9464) -> None:
+        handler = type("Handler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class EventLog:
+    """Structured events as JSON lines (``{"ts": ..., "event": ..., ...}``), written off the calling thread.
+
+    The file is written by the process-wide :func:`log_writer`, so it rotates like
+    the other logs and pending events are written out at interpreter exit.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = log_writer(self.path)
+
+    def emit(self, event: str, **fields: object) -> None:
+        record = {"ts": round(time.time(), 3), "event": event, **fields}
+        self._writer.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def close(self) -> None:
+        # The writer is shared and closed by close_log_writers(); just write out what is pending.
+        self._writer.flush()
+
+
+_EVENTS: Optional[EventLog] = None
+
+
+def configure_events(path: Optional[Path]) -> None:
+    """Start (or with ``None`` stop) writing the JSON event log."""
+
+    global _EVENTS
+    previous, _EVENTS = _EVENTS, EventLog(path) if path is not None else None
+    if previous is not None:
+        previous.close()
+
+
+def emit(event: str, **fields: object) -> None:
+    """Record an event in the JSON event log, if one is configured; otherwise a no-op."""
+
+    events = _EVENTS
+    if events is not None:
+        events.emit(event, **fields)
@@ -0,0 +1,706 @@
+"""Local stand-in for the OpenAI endpoints used by this project.
+
+Implements just enough of ``/v1/chat/completions``, ``/v1/responses``,
+``/v1/audio/speech`` (PCM) and the ``/v1/realtime`` WebSocket to drive
+``OpenAITranslator``, ``OpenAITTSEngine`` and ``openai_realtime.py`` without
+an API key. Latency, streaming throughput and error injection are
+configurable so load tests can exercise the real client code paths.
+
+Run it with ``python -m src.siminterp.mock_server --port 8765`` and point the
+clients at ``--base-url http://127.0.0.1:8765/v1`` (or ``ws://127.0.0.1:8765``
+for ``openai_realtime.py``). Only the Python standard library is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+from array import array
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_SENTENCE = re.compile(r"Sentence:\s*(.*)\s*$", re.S)
+_STATUS_TEXT = {
+    200: "OK",
+    101: "Switching Protocols",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+@dataclass(slots=True)
+class MockSettings:
+    """Knobs for the simulated provider."""
+
+    latency: float = 0.05
+    jitter: float = 0.0
+    tokens_per_second: float = 200.0
+    audio_realtime_factor: float = 10.0
+    sample_rate: int = 24000
+    error_rate: float = 0.0
+    error_status: int = 500
+    rate_limit: float = 0.0
+    seed: Optional[int] = None
+
+
+class _RequestWindow:
+    """Sliding one-second window used to emulate a provider's request rate limit."""
+
+    def __init__(self, limit: float) -> None:
+        self.limit = limit
+        self._times: List[float] = []
+
+    def admit(self) -> Tuple[bool, int, float]:
+        now = time.monotonic()
+        self._times = [stamp for stamp in self._times if now - stamp < 1.0]
+        remaining = int(self.limit) - len(self._times)
+        if remaining <= 0:
+            reset = 1.0 - (now - self._times[0])
+            return False, 0, reset
+        self._times.append(now)
+        reset = 1.0 - (now - self._times[0])
+        return True, remaining - 1, reset
+
+
+class MockOpenAIServer:
+    def __init__(self, settings: Optional[MockSettings] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.settings = settings or MockSettings()
+        self.host = host
+        self.port = port
+        self.requests: Dict[str, int] = {}
+        self._random = random.Random(self.settings.seed)
+        self._window = _RequestWindow(self.settings.rate_limit) if self.settings.rate_limit > 0 else None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def serve(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Mock OpenAI server listening on {self.base_url}", flush=True)
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> str:
+        """Start serving on a background thread and return the ``/v1`` base URL."""
+
+        ready = threading.Event()
+
+        def _run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+
+            async def _start() -> None:
+                self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+                self.port = self._server.sockets[0].getsockname()[1]
+                ready.set()
+
+            self._loop.run_until_complete(_start())
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name="mock-openai-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.base_url
+
+    def stop(self) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+
+        async def _close() -> None:
+            if self._server is not None:
+                self._server.close()
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(_close(), loop)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self._loop = None
+
+    # ------------------------------------------------------------------ HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                route = path.split("?", 1)[0].rstrip("/")
+                self.requests[route] = self.requests.get(route, 0) + 1
+                if route.endswith("/realtime") and headers.get("upgrade", "").lower() == "websocket":
+                    await self._handle_realtime(reader, writer, headers)
+                    return
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._dispatch(method, route, headers, body, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutdown; finishing quietly keeps asyncio from logging every open connection.
+            pass
+        finally:
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def _dispatch(
+        self, method: str, route: str, headers: Dict[str, str], body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        if method == "GET" and route.endswith("/models"):
+            await _send_json(writer, 200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+            return
+        if method != "POST":
+            await _send_json(writer, 404, _error("Not found", "invalid_request_error"))
+            return
+
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            await _send_json(writer, 400, _error("Invalid JSON body", "invalid_request_error"))
+            return
+
+        extra_headers: Dict[str, str] = {}
+        if self._window is not None:
+            admitted, remaining, reset = self._window.admit()
+            extra_headers = {
+                "x-ratelimit-limit-requests": str(int(self._window.limit)),
+                "x-ratelimit-remaining-requests": str(max(0, remaining)),
+                "x-ratelimit-reset-requests": f"{max(reset, 0.0):.3f}s",
+            }
+            if not admitted:
+                extra_headers["retry-after-ms"] = str(int(max(reset, 0.0) * 1000))
+                await _send_json(writer, 429, _error("Rate limit reached", "rate_limit_exceeded"), extra_headers)
+                return
+        if self.settings.error_rate > 0 and self._random.random() < self.settings.error_rate:
+            status = self.settings.error_status
+            await _send_json(writer, status, _error("Injected failure", "server_error"), extra_headers)
+            return
+
+        await asyncio.sleep(self._first_byte_delay())
+        if route.endswith("/chat/completions"):
+            await self._chat_completions(payload, writer, extra_headers)
+        elif route.endswith("/responses"):
+            await self._responses(payload, writer, extra_headers)
+        elif route.endswith("/audio/speech"):
+            await self._speech(payload, writer, extra_headers)
+        else:
+            await _send_json(writer, 404, _error(f"Unknown route {route}", "invalid_request_error"))
+
+    def _first_byte_delay(self) -> float:
+        jitter = self._random.uniform(0.0, self.settings.jitter) if self.settings.jitter > 0 else 0.0
+        return max(0.0, self.settings.latency + jitter)
+
+    async def _stream_words(self, text: str) -> AsyncIterator[str]:
+        words = re.findall(r"\S+\s*", text) or [text]
+        delay = 1.0 / self.settings.tokens_per_second if self.settings.tokens_per_second > 0 else 0.0
+        for word in words:
+            yield word
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def _chat_completions(self, payload: Dict[str, Any], writer: asyncio.StreamWriter, headers: Dict[str, str]) -> None:
+        messages = payload.get("messages") or []
+        model = payload.get("model", "mock")
+        text = mock_translation(_last_user_text(messages))
+        prompt_tokens = sum(_count_tokens(_content_text(message.get("content"))) for message in messages)
+        usage = _chat_usage(prompt_tokens, _count_tokens(text))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if not payload.get("stream"):
+            await _send_json(
+                writer,
+                200,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+                    ],
+                    "usage": usage,
+                },
+                headers,
+            )
+            return
+
+        await _start_chunked(writer, 200, "text/event-stream", headers)
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> Dict[str, Any]:
+            return {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+
+        await _send_sse(writer, chunk({"role": "assistant", "content": ""}))
+        async for word in self._stream_words(text):
+            await _send_sse(writer, chunk({"content": word}))
+        await _send_sse(writer, chunk({}, "stop"))
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            await _send_sse(
+                writer,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage,
+                },
+            )
+        await _write_chunk(writer, b"data: [DONE]\n\n")
+        await _end_chunked(writer)
+
+    async def _responses(self, payload: Dict[str, Any], writer: asyncio.StreamWriter, headers: Dict[str, str]) -> None:
+        items = payload.get("input") or []
+        if isinstance(items, str):
+            items = [{"role": "user", "content": items}]
+        text = mock_translation(_last_user_text(items))
+        prompt_tokens = sum(_count_tokens(_content_text(item.get("content"))) for item in items)
+        completion_tokens = _count_tokens(text)
+        response_id = f"resp_{uuid.uuid4().hex[:12]}"
+        message_id = f"msg_{uuid.uuid4().hex[:12]}"
+
+        def response_object(status: str, output_text: str) -> Dict[str, Any]:
+            output = []
+            if output_text:
+                output.append(
+                    {
+                        "id": message_id,
+                        "type": "message",
+                        "role": "assistant",
+                        "status": status,
+                        "content": [{"type": "output_text", "text": output_text, "annotations": []}],
+                    }
+                )
+            return {
+                "id": response_id,
+                "object": "response",
+                "created_at": int(time.time()),
+                "status": status,
+                "model": payload.get("model", "mock"),
+                "output": output,
+                "usage": {
+                    "input_tokens": prompt_tokens,
+                    "input_tokens_details": {"cached_tokens": 0},
+                    "output_tokens": completion_tokens if status == "completed" else 0,
+                    "output_tokens_details": {"reasoning_tokens": 0},
+                    "total_tokens": prompt_tokens + (completion_tokens if status == "completed" else 0),
+                },
+            }
+
+        if not payload.get("stream"):
+            await _send_json(writer, 200, response_object("completed", text), headers)
+            return
+
+        await _start_chunked(writer, 200, "text/event-stream", headers)
+        sequence = 0
+
+        async def event(kind: str, body: Dict[str, Any]) -> None:
+            nonlocal sequence
+            await _send_sse(writer, {"type": kind, "sequence_number": sequence, **body}, event=kind)
+            sequence += 1
+
+        await event("response.created", {"response": response_object("in_progress", "")})
+        async for word in self._stream_words(text):
+            await event(
+                "response.output_text.delta",
+                {"item_id": message_id, "output_index": 0, "content_index": 0, "delta": word},
+            )
+        await event(
+            "response.output_text.done",
+            {"item_id": message_id, "output_index": 0, "content_index": 0, "text": text},
+        )
+        await event("response.completed", {"response": response_object("completed", text)})
+        await _end_chunked(writer)
+
+    async def _speech(self, payload: Dict[str, Any], writer: asyncio.StreamWriter, headers: Dict[str, str]) -> None:
+        response_format = payload.get("response_format", "mp3")
+        if response_format not in ("pcm", "wav"):
+            await _send_json(
+                writer, 400, _error(f"Mock server only produces pcm or wav, not {response_format}", "invalid_request_error")
+            )
+            return
+        speed = float(payload.get("speed") or 1.0)
+        pcm = synthesize_tone(str(payload.get("input", "")), self.settings.sample_rate, speed)
+        content_type = "audio/pcm"
+        if response_format == "wav":
+            pcm = _wav_header(len(pcm), self.settings.sample_rate) + pcm
+            content_type = "audio/wav"
+
+        await _start_chunked(writer, 200, content_type, headers)
+        chunk_bytes = self.settings.sample_rate // 50 * 2  # 20 ms of int16 mono
+        bytes_per_second = self.settings.sample_rate * 2 * max(self.settings.audio_realtime_factor, 0.01)
+        for offset in range(0, len(pcm), chunk_bytes):
+            piece = pcm[offset : offset + chunk_bytes]
+            await _write_chunk(writer, piece)
+            if self.settings.audio_realtime_factor > 0:
+                await asyncio.sleep(len(piece) / bytes_per_second)
+        await _end_chunked(writer)
+
+    # ------------------------------------------------------------------ Realtime WebSocket
+
+    async def _handle_realtime(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: Dict[str, str]
+    ) -> None:
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode("ascii")
+        )
+        await writer.drain()
+
+        session: Dict[str, Any] = {"id": f"sess_{uuid.uuid4().hex[:12]}", "turn_detection": {"type": "server_vad"}}
+        audio = bytearray()
+        silence_run = 0
+        heard_speech = False
+
+        async def send(event: Dict[str, Any]) -> None:
+            event.setdefault("event_id", f"event_{uuid.uuid4().hex[:12]}")
+            await _ws_send(writer, json.dumps(event).encode("utf-8"))
+
+        await send({"type": "session.created", "session": session})
+        while True:
+            frame = await _ws_receive(reader, writer)
+            if frame is None:
+                break
+            try:
+                event = json.loads(frame)
+            except json.JSONDecodeError:
+                await send({"type": "error", "error": {"type": "invalid_request_error", "message": "Invalid JSON"}})
+                continue
+            kind = event.get("type")
+            if kind == "session.update":
+                session.update(event.get("session") or {})
+                await send({"type": "session.updated", "session": session})
+            elif kind == "input_audio_buffer.append":
+                data = base64.b64decode(event.get("audio", ""))
+                audio.extend(data)
+                samples = array("h")
+                samples.frombytes(data[: len(data) - len(data) % 2])
+                peak = max((abs(value) for value in samples), default=0)
+                if peak >= 500:
+                    heard_speech = True
+                    silence_run = 0
+                else:
+                    silence_run += len(samples)
+                server_vad = (session.get("turn_detection") or {}).get("type") == "server_vad"
+                if server_vad and heard_speech and silence_run >= self.settings.sample_rate // 2:
+                    await self._realtime_turn(send, bytes(audio), session)
+                    audio.clear()
+                    silence_run = 0
+                    heard_speech = False
+            elif kind == "input_audio_buffer.commit":
+                await send({"type": "input_audio_buffer.committed", "item_id": f"item_{uuid.uuid4().hex[:12]}"})
+            elif kind == "input_audio_buffer.clear":
+                audio.clear()
+                await send({"type": "input_audio_buffer.cleared"})
+            elif kind == "response.create":
+                await self._realtime_turn(send, bytes(audio), session)
+                audio.clear()
+                heard_speech = False
+                silence_run = 0
+
+    async def _realtime_turn(self, send, audio: bytes, session: Dict[str, Any]) -> None:
+        seconds = len(audio) / 2 / self.settings.sample_rate
+        transcript = f"mock utterance of {seconds:.1f} seconds"
+        translation = mock_translation(transcript)
+        response_id = f"resp_{uuid.uuid4().hex[:12]}"
+        item_id = f"item_{uuid.uuid4().hex[:12]}"
+
+        await asyncio.sleep(self._first_byte_delay())
+        await send({"type": "response.created", "response": {"id": response_id, "status": "in_progress"}})
+        await send({"type": "response.input_audio_transcription.delta", "item_id": item_id, "delta": transcript})
+        await send({"type": "response.input_audio_transcription.done", "item_id": item_id, "transcript": transcript})
+        async for word in self._stream_words(translation):
+            await send({"type": "response.audio_transcript.delta", "response_id": response_id, "delta": word})
+        pcm = synthesize_tone(translation, self.settings.sample_rate, 1.0)
+        chunk_bytes = self.settings.sample_rate // 10 * 2
+        bytes_per_second = self.settings.sample_rate * 2 * max(self.settings.audio_realtime_factor, 0.01)
+        for offset in range(0, len(pcm), chunk_bytes):
+            piece = pcm[offset : offset + chunk_bytes]
+            await send(
+                {
+                    "type": "response.audio.delta",
+                    "response_id": response_id,
+                    "delta": base64.b64encode(piece).decode("ascii"),
+                }
+            )
+            await asyncio.sleep(len(piece) / bytes_per_second)
+        await send({"type": "response.audio.done", "response_id": response_id})
+        await send({"type": "response.audio_transcript.done", "response_id": response_id, "transcript": translation})
+        await send({"type": "response.done", "response": {"id": response_id, "status": "completed"}})
+
+
+# ---------------------------------------------------------------------- content helpers
+
+
+def mock_translation(text: str) -> str:
+    """Deterministic stand-in translation: the input wrapped so it is easy to recognise."""
+
+    text = text.strip() or "..."
+    return f"[translated] {text}"
+
+
+def synthesize_tone(text: str, sample_rate: int, speed: float = 1.0) -> bytes:
+    """Return int16 PCM whose length tracks ``text`` (about 15 characters per second)."""
+
+    seconds = max(0.2, len(text) / 15.0) / max(speed, 0.25)
+    total = int(seconds * sample_rate)
+    frequency = 220.0 + (sum(map(ord, text)) % 220)
+    step = 2.0 * math.pi * frequency / sample_rate
+    fade = max(1, sample_rate // 100)
+    samples = array("h")
+    for index in range(total):
+        envelope = min(1.0, index / fade, (total - index) / fade)
+        samples.append(int(8000 * envelope * math.sin(step * index)))
+    return samples.tobytes()
+
+
+def _wav_header(data_size: int, sample_rate: int) -> bytes:
+    return (
+        b"RIFF"
+        + struct.pack("<I", 36 + data_size)
+        + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b"data"
+        + struct.pack("<I", data_size)
+    )
+
+
+def _content_text(content: Any) -> str:
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(_content_text(part) for part in content)
+    if isinstance(content, dict):
+        return str(content.get("text", "")) or _content_text(content.get("content"))
+    return str(content)
+
+
+def _last_user_text(messages: List[Dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            text = _content_text(message.get("content"))
+            match = _SENTENCE.search(text)
+            return match.group(1) if match else text
+    return ""
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+def _chat_usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, Any]:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": 0},
+    }
+
+
+def _error(message: str, kind: str) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": kind, "param": None, "code": kind}}
+
+
+# ---------------------------------------------------------------------- wire helpers
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, _ = lines[0].split(" ", 2)
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    body = b""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        parts = []
+        while True:
+            size = int((await reader.readline()).strip() or b"0", 16)
+            if size == 0:
+                await reader.readline()
+                break
+            parts.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(parts)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    return method, path, headers, body
+
+
+def _status_line(status: int) -> str:
+    return f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, 'Unknown')}\r\n"
+
+
+async def _send_json(
+    writer: asyncio.StreamWriter, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+) -> None:
+    data = json.dumps(body).encode("utf-8")
+    head = _status_line(status) + "Content-Type: application/json\r\n" + f"Content-Length: {len(data)}\r\n"
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n"
+    writer.write(head.encode("latin-1") + b"\r\n" + data)
+    await writer.drain()
+
+
+async def _start_chunked(
+    writer: asyncio.StreamWriter, status: int, content_type: str, headers: Optional[Dict[str, str]] = None
+) -> None:
+    head = _status_line(status) + f"Content-Type: {content_type}\r\nTransfer-Encoding: chunked\r\n"
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n"
+    writer.write(head.encode("latin-1") + b"\r\n")
+    await writer.drain()
+
+
+async def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+    if not data:
+        return
+    writer.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+    await writer.drain()
+
+
+async def _end_chunked(writer: asyncio.StreamWriter) -> None:
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def _send_sse(writer: asyncio.StreamWriter, payload: Dict[str, Any], event: Optional[str] = None) -> None:
+    prefix = f"event: {event}\n" if event else ""
+    await _write_chunk(writer, f"{prefix}data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+
+async def _ws_send(writer: asyncio.StreamWriter, payload: bytes, opcode: int = 0x1) -> None:
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    writer.write(header + payload)
+    await writer.drain()
+
+
+async def _ws_receive(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Optional[bytes]:
+    """Return the next complete text/binary message, answering pings; ``None`` on close."""
+
+    message = bytearray()
+    while True:
+        first, second = await reader.readexactly(2)
+        fin = first & 0x80
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await reader.readexactly(8))
+        mask = await reader.readexactly(4) if second & 0x80 else None
+        payload = bytearray(await reader.readexactly(length))
+        if mask:
+            for index in range(length):
+                payload[index] ^= mask[index % 4]
+        if opcode == 0x8:
+            await _ws_send(writer, bytes(payload[:2]), opcode=0x8)
+            return None
+        if opcode == 0x9:
+            await _ws_send(writer, bytes(payload), opcode=0xA)
+            continue
+        if opcode == 0xA:
+            continue
+        message.extend(payload)
+        if fin:
+            return bytes(message)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock server for tests and benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before the first byte of every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay (0..jitter seconds) per response.")
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=200.0, help="Streaming speed for text responses (0 = unthrottled)."
+    )
+    parser.add_argument(
+        "--audio-realtime-factor",
+        type=float,
+        default=10.0,
+        help="Speech is streamed this many times faster than real time.",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP requests that fail.")
+    parser.add_argument("--error-status", type=int, default=500, help="Status code used for injected failures.")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="Requests per second before answering 429 (0 = unlimited)."
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible jitter and error injection.")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    settings = MockSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        audio_realtime_factor=args.audio_realtime_factor,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    server = MockOpenAIServer(settings, host=args.host, port=args.port)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
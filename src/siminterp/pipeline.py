@@ -1,21 +1,72 @@
 from __future__ import annotations
 
+import audioop
 import queue
 import threading
-import time
 import tempfile
+import time
 from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Deque, Dict, Optional
+from typing import Deque, Dict, Optional, Tuple
 
 import speech_recognition as sr
 
+from .audio.devices import device_registry
+from .audio.echo import EchoGuard, PlaybackMonitor
+from .audio.player import close_shared_players, shared_player
+from .audio.sources import open_source
+from .audio.timestretch import CatchUpController
 from .config import AppConfig
-from .dictionary import preprocess_text
+from .dictionary import GlossaryMatcher, invert_dictionary
+from .language import guess_language, normalize_language
 from .logging_utils import RichLogger
-from .transcription.engines import Transcriber
-from .translation.openai_translator import OpenAITranslator
-from .tts.speech import OpenAITTSEngine, TTSEngineProtocol
+from .metrics import RATIO_BUCKETS, REGISTRY, emit
+from .startup import startup_phase, startup_profile
+from .transcript import TranscriptStore
+from .transcription.engines import Transcriber, Transcription
+from .translation.base import Translator
+from .translation.summarizer import ContextSummarizer
+from .tts.speech import TTSEngineProtocol
+
+# Rough speaking rates used to estimate how long queued text will take to say.
+CHARS_PER_SECOND = 14.0
+CJK_CHARS_PER_SECOND = 5.0
+
+INPUT_SECONDS = REGISTRY.counter("input_audio_seconds", "Seconds of captured audio segments.")
+DROPPED = REGISTRY.counter("dropped_segments", "Captured segments or utterances dropped, by reason.", ("reason",))
+ERRORS = REGISTRY.counter("errors", "Exceptions caught in a pipeline stage.", ("stage",))
+STAGE_SECONDS = REGISTRY.histogram("stage_seconds", "Time per utterance in each pipeline stage.", ("stage",))
+STT_REALTIME_FACTOR = REGISTRY.histogram(
+    "stt_realtime_factor", "Transcription time divided by the length of the audio.", buckets=RATIO_BUCKETS
+)
+
+
+@dataclass(slots=True)
+class BypassStats:
+    """How many utterances skipped translation (and TTS) because they were already in the target language."""
+
+    utterances: int = 0
+    translation: int = 0
+    tts: int = 0
+
+    @property
+    def bypass_rate(self) -> float:
+        if not self.utterances:
+            return 0.0
+        return self.translation / self.utterances
+
+
+@dataclass(slots=True)
+class Route:
+    """One translation direction: the translator for it and the engine that speaks the result."""
+
+    source_language: str
+    target_language: str
+    translator: Optional[Translator]
+    tts_engine: Optional[TTSEngineProtocol]
+    glossary: Optional[GlossaryMatcher] = None
 
 
 class InterpretationPipeline:
@@ -25,8 +76,12 @@ class InterpretationPipeline:
         logger: RichLogger,
         transcriber: Transcriber,
         dictionary: Optional[Dict[str, str]] = None,
-        translator: Optional[OpenAITranslator] = None,
+        translator: Optional[Translator] = None,
         tts_engine: Optional[TTSEngineProtocol] = None,
+        summarizer: Optional[ContextSummarizer] = None,
+        reverse_translator: Optional[Translator] = None,
+        reverse_tts_engine: Optional[TTSEngineProtocol] = None,
+        source: Optional[sr.AudioSource] = None,
     ) -> None:
         self.config = config
         self.logger = logger
@@ -34,68 +89,218 @@ class InterpretationPipeline:
         self.dictionary = dictionary or {}
         self.translator = translator
         self.tts_engine = tts_engine
+        self.forward = Route(
+            source_language=config.input_language,
+            target_language=config.translation_language,
+            translator=translator,
+            tts_engine=tts_engine,
+            glossary=_source_glossary(self.dictionary, translator),
+        )
+        # Two-way mode: utterances in the target language are interpreted back into the
+        # input language. The reverse direction reuses the forward components unless
+        # direction-specific ones (a second local MT model, a voice for the other language) are given.
+        self.reverse: Optional[Route] = None
+        if config.bidirectional:
+            reverse_translator = reverse_translator or translator
+            self.reverse = Route(
+                source_language=config.translation_language,
+                target_language=config.input_language,
+                translator=reverse_translator,
+                tts_engine=reverse_tts_engine or tts_engine,
+                glossary=_source_glossary(invert_dictionary(self.dictionary), reverse_translator),
+            )
+        self._language_pair: Tuple[str, ...] = (
+            normalize_language(config.input_language),
+            normalize_language(config.translation_language),
+        )
+        self.summarizer = summarizer
+        if summarizer is not None and summarizer.on_error is None:
+            summarizer.on_error = logger.log_exception
+
+        self._target_language = normalize_language(config.translation_language)
+        self.bypass_stats = BypassStats()
 
         self.recognizer = sr.Recognizer()
-        self.transcription_queue: "queue.Queue[Optional[str]]" = queue.Queue()
-        self.translation_queue: Optional["queue.Queue[Optional[str]]"] = (
+        self.transcription_queue: "queue.Queue[Optional[Transcription]]" = queue.Queue()
+        # Items carry the utterance's index in the transcript, to attach the translation to it.
+        self.translation_queue: Optional["queue.Queue[Optional[Tuple[str, Route, int]]]"] = (
             queue.Queue() if translator is not None and config.enable_translation else None
         )
-        self.tts_queue: Optional["queue.Queue[Optional[str]]"] = (
+        self.tts_queue: Optional["queue.Queue[Optional[Tuple[str, Route]]]"] = (
             queue.Queue() if tts_engine is not None and config.enable_tts else None
         )
+        self.catch_up: Optional[CatchUpController] = None
+        if self.tts_queue is not None and config.catch_up:
+            self.catch_up = CatchUpController(
+                max_speed=config.catch_up_max_speed,
+                start_lag=config.catch_up_lag,
+                full_lag=config.catch_up_lag * 3,
+            )
+            self.catch_up.add_source(self._text_backlog_seconds)
+        # Our own speech picked up by the microphone must not be interpreted again.
+        self.echo_guard: Optional[EchoGuard] = None
+        if self.tts_queue is not None and config.echo_guard != "off":
+            self.echo_guard = EchoGuard(PlaybackMonitor(), config.echo_guard, threshold=config.echo_threshold)
         self.previous_chunks: Deque[str] = deque(maxlen=config.chunk_history)
         self.threads: list[threading.Thread] = []
-        self._stop_listening = None
+        self.source = source
+        self.transcript: Optional[TranscriptStore] = None
+        self.input_finished = threading.Event()
+        self._listening = threading.Event()
 
     def start(self) -> None:
-        microphone = sr.Microphone(device_index=self.config.input_device_index)
+        source = self.source or open_source(
+            self.config.input_source,
+            self.config.input_device_index,
+            rate=self.config.input_rate,
+            speed=self.config.input_speed,
+        )
+        self.source = source
+        self.transcript = TranscriptStore(
+            self.config.transcript_dir / datetime.now().strftime("%Y%m%d-%H%M%S.jsonl"),
+            exports=self.config.transcript_exports,
+            text=self.config.subtitle_text,
+        )
         self.recognizer.pause_threshold = self.config.pause_threshold
-        with microphone as source:
+        # Entered once for calibration and listening alike: a pipe or socket cannot be reopened.
+        with startup_phase("audio input", "open"):
+            source.__enter__()
+        try:
             self.logger.log_panel(
                 f"Adjusting for ambient noise... (Language: {self.config.input_language})",
                 "ACTION",
                 "blue1",
             )
-            self.recognizer.adjust_for_ambient_noise(source, duration=self.config.ambient_duration)
+            with startup_phase("audio input", "calibrate"):
+                self.recognizer.adjust_for_ambient_noise(source, duration=self.config.ambient_duration)
+        except BaseException:
+            source.__exit__(None, None, None)
+            raise
 
-        self._start_workers()
-        self._stop_listening = self.recognizer.listen_in_background(
-            sr.Microphone(device_index=self.config.input_device_index),
-            self._callback,
-            phrase_time_limit=self.config.phrase_time_limit,
-        )
+        with startup_phase("pipeline", "workers"):
+            self._start_workers()
+        self._register_metrics()
+        emit("session_start", input=self.config.input_source or "mic", transcript=str(self.transcript.path))
+        self.input_finished.clear()
+        self._listening.set()
+        listener = threading.Thread(target=self._listen_worker, args=(source,), name="listener", daemon=True)
+        listener.start()
+        startup_profile().ready()
+        if self.config.profile_startup:
+            self.logger.log_panel(startup_profile().summary(), "STARTUP", "cyan")
         self.logger.log_panel("Start speaking. Press Stop to exit", "ACTION", "green1")
 
     def stop(self) -> None:
-        if self._stop_listening:
-            self._stop_listening(wait_for_stop=False)
-            self._stop_listening = None
-        
+        self._listening.clear()
+
         # Clear all queues immediately to stop processing pending items
-        with self.transcription_queue.mutex:
-            self.transcription_queue.queue.clear()
-        if self.translation_queue:
-            with self.translation_queue.mutex:
-                self.translation_queue.queue.clear()
-        if self.tts_queue:
-            with self.tts_queue.mutex:
-                self.tts_queue.queue.clear()
+        for pending in (self.transcription_queue, self.translation_queue, self.tts_queue):
+            if pending is not None:
+                with pending.mutex:
+                    DROPPED.labels("stopped").inc(len(pending.queue))
+                    pending.queue.clear()
 
         self.logger.log_panel("Stopping listening...", "ACTION", "magenta3")
         self._shutdown_workers()
-        self.logger.save_transcript()
+        self._log_output_stats()
+        close_shared_players()
+        device_registry().close()
+        self._log_bypass_stats()
+        self._log_echo_stats()
+        self._log_tts_stats()
+        if self.transcript is not None:
+            self.transcript.close()
+            saved = ", ".join(str(path) for path in [self.transcript.path, *self.transcript.export_paths()])
+            self.logger.log_panel(f"Transcript saved to {saved}", "LOG", "bold green")
+        emit("session_stop", utterances=self.bypass_stats.utterances)
+        self.logger.flush()
 
     def run(self) -> None:
         self.start()
         self.logger.log_panel("Start speaking. Press CTRL+C to exit", "ACTION", "green1")
         try:
-            while True:
-                time.sleep(0.5)
+            while not self.input_finished.wait(0.5):
+                pass
+            if getattr(self.source, "exhausted", False):
+                self.logger.log_panel("Input finished; draining the pipeline...", "ACTION", "blue1")
+                self.wait_until_idle()
         except KeyboardInterrupt:
             pass
         finally:
             self.stop()
 
+    def wait_until_idle(self) -> None:
+        """Block until every captured utterance has been transcribed, translated and played."""
+
+        # Each stage hands its item on before marking it done, so joining in order drains them all.
+        self.transcription_queue.join()
+        if self.translation_queue is not None:
+            self.translation_queue.join()
+        if self.tts_queue is not None:
+            self.tts_queue.join()
+            shared_player(self.config.output_device_index).wait()
+
+    def _listen_worker(self, source: sr.AudioSource) -> None:
+        """Cut the input into phrases with the recognizer's energy detector until stopped or the source ends."""
+
+        try:
+            while self._listening.is_set():
+                try:
+                    audio = self.recognizer.listen(source, 1, self.config.phrase_time_limit)
+                except sr.WaitTimeoutError:
+                    continue
+                exhausted = getattr(source, "exhausted", False)
+                # At the end of a recording the last segment may be nothing but trailing silence.
+                wanted = self._listening.is_set() and (not exhausted or self._has_speech(audio))
+                if not wanted:
+                    self._drop("silence" if self._listening.is_set() else "stopped", audio)
+                elif not self._is_echo(audio):
+                    self._callback(self.recognizer, audio, self._span(source, audio))
+                if exhausted:
+                    break
+        except Exception as error:  # pragma: no cover - runtime safety
+            self._error("listen", error)
+        finally:
+            source.__exit__(None, None, None)
+            self.input_finished.set()
+
+    def _span(self, source: sr.AudioSource, audio: sr.AudioData) -> Tuple[float, float]:
+        """When a just-captured segment was spoken: on the recording's own clock when replaying one."""
+
+        position = getattr(source, "seconds", None)
+        if position is None:
+            position = self.transcript.elapsed if self.transcript is not None else 0.0
+        return max(0.0, position - _duration(audio)), position
+
+    def _is_echo(self, audio: sr.AudioData) -> bool:
+        if self.echo_guard is None:
+            return False
+        if not self.echo_guard.is_echo(audio.frame_data, audio.sample_rate, audio.sample_width):
+            return False
+        seconds = self._drop("echo", audio)
+        self.logger.log_debug(f"Dropped {seconds:.1f} s of input: our own speech picked up by the microphone")
+        return True
+
+    def _drop(self, reason: str, audio: sr.AudioData) -> float:
+        seconds = _duration(audio)
+        INPUT_SECONDS.inc(seconds)
+        DROPPED.labels(reason).inc()
+        emit("dropped", reason=reason, seconds=round(seconds, 3))
+        return seconds
+
+    def _error(self, stage: str, error: Exception) -> None:
+        ERRORS.labels(stage).inc()
+        emit("error", stage=stage, error=f"{type(error).__name__}: {error}")
+        self.logger.log_exception(error)
+
+    def _has_speech(self, audio: sr.AudioData) -> bool:
+        step = audio.sample_width * 1024
+        data = audio.frame_data
+        return any(
+            audioop.rms(data[start : start + step], audio.sample_width) > self.recognizer.energy_threshold
+            for start in range(0, len(data) - audio.sample_width + 1, step)
+        )
+
     def _start_workers(self) -> None:
         transcription_thread = threading.Thread(target=self._transcription_worker, daemon=True)
         transcription_thread.start()
@@ -105,8 +310,19 @@ class InterpretationPipeline:
             translation_thread = threading.Thread(target=self._translation_worker, daemon=True)
             translation_thread.start()
             self.threads.append(translation_thread)
+            if self.summarizer is not None:
+                self.summarizer.start()
 
         if self.tts_queue is not None and self.tts_engine:
+            player = shared_player(self.config.output_device_index)
+            if self.catch_up is not None:
+                player.catch_up = self.catch_up
+            if self.echo_guard is not None:
+                player.monitor = self.echo_guard.monitor
+            try:
+                player.prepare(self.tts_engine.sample_rate)
+            except OSError as error:
+                self._error("output", error)
             tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
             tts_thread.start()
             self.threads.append(tts_thread)
@@ -122,72 +338,349 @@ class InterpretationPipeline:
         # Wait for threads to finish with a timeout to avoid hanging
         for thread in self.threads:
             thread.join(timeout=1.0)
+        if self.summarizer is not None:
+            self.summarizer.stop()
 
-    def _callback(self, recognizer: sr.Recognizer, audio: sr.AudioData) -> None:
+    def _callback(
+        self, recognizer: sr.Recognizer, audio: sr.AudioData, span: Optional[Tuple[float, float]] = None
+    ) -> None:
         temp_path = None
         try:
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as buffer:
                 buffer.write(audio.get_wav_data())
                 temp_path = Path(buffer.name)
 
-            text = self.transcriber.transcribe_file(temp_path, self.config.input_language)
-            text = preprocess_text(text, self.dictionary)
-            cleaned = text.strip()
-            if cleaned:
-                self.transcription_queue.put(cleaned)
+            seconds = _duration(audio)
+            INPUT_SECONDS.inc(seconds)
+            started = time.perf_counter()
+            if self.reverse is not None:
+                transcription = self.transcriber.transcribe(
+                    temp_path, self.config.input_language, candidates=self._language_pair
+                )
+            else:
+                transcription = self.transcriber.transcribe(temp_path, self.config.input_language)
+            elapsed = time.perf_counter() - started
+            STAGE_SECONDS.labels("transcribe").observe(elapsed)
+            if seconds > 0:
+                STT_REALTIME_FACTOR.observe(elapsed / seconds)
+            transcription.text = transcription.text.strip()
+            if span is not None:
+                transcription.start, transcription.end = span
+            emit(
+                "transcribed",
+                seconds=round(seconds, 3),
+                elapsed=round(elapsed, 3),
+                language=transcription.language,
+                chars=len(transcription.text),
+            )
+            if transcription.text:
+                self.transcription_queue.put(transcription)
+            else:
+                DROPPED.labels("empty").inc()
         except Exception as error:  # pragma: no cover - runtime safety
-            self.logger.log_exception(error)
+            self._error("transcribe", error)
         finally:
             if temp_path:
                 temp_path.unlink(missing_ok=True)
 
     def _transcription_worker(self) -> None:
         while True:
-            text = self.transcription_queue.get()
-            if text is None:
+            transcription = self.transcription_queue.get()
+            if transcription is None:
                 self.transcription_queue.task_done()
                 break
+            text = transcription.text
+            route = self._route(transcription)
+            bypass = self.reverse is None and self.translation_queue is not None and self._in_target_language(
+                transcription
+            )
+            if route.glossary is not None and not bypass:
+                text = route.glossary.replace(text)
             self.logger.log_text(text)
-            if self.translation_queue is not None:
-                self.translation_queue.put(text)
+            self.bypass_stats.utterances += 1
+            index = self._record(text, transcription, route, translate=bypass or self.translation_queue is not None)
+            emit("utterance", index=index, language=transcription.language, bypass=bypass)
+            if bypass:
+                self._bypass_translation(text, transcription)
+                if self.transcript is not None:
+                    # Listeners hear the original, so it stands in for the translation.
+                    self.transcript.translate(index, text, self._target_language)
+            elif self.translation_queue is not None:
+                self.translation_queue.put((text, route, index))
             self.transcription_queue.task_done()
 
+    def _record(self, text: str, transcription: Transcription, route: Route, translate: bool) -> int:
+        if self.transcript is None:
+            return -1
+        language = normalize_language(transcription.language or route.source_language)
+        return self.transcript.add(text, transcription.start, transcription.end, language, translate)
+
+    def _route(self, transcription: Transcription) -> Route:
+        """Pick the translation direction for an utterance from its spoken language."""
+
+        if self.reverse is None:
+            return self.forward
+        language = transcription.language
+        if not language:
+            language, _ = guess_language(transcription.text)
+        if language and normalize_language(language) == self._language_pair[1]:
+            return self.reverse
+        return self.forward
+
+    def _in_target_language(self, transcription: Transcription) -> bool:
+        """Whether the utterance is already in the translation language and needs no translation."""
+
+        if not self.config.language_bypass:
+            return False
+        threshold = self.config.language_confidence
+        if transcription.language and transcription.language_probability >= threshold:
+            return normalize_language(transcription.language) == self._target_language
+        # No (confident) answer from the recogniser: fall back to the script of the text itself.
+        language, confidence = guess_language(transcription.text)
+        return language == self._target_language and confidence >= threshold
+
+    def _bypass_translation(self, text: str, transcription: Transcription) -> None:
+        self.bypass_stats.translation += 1
+        self.logger.log_debug(
+            f"Skipped translation: already {self._target_language} "
+            f"(detected={transcription.language or 'script'} p={transcription.language_probability:.2f})"
+        )
+        # The original is what listeners hear, so it is also the right context for what follows.
+        self.previous_chunks.append(text)
+        if self.summarizer is not None:
+            self.summarizer.observe(text)
+        if self.tts_queue is None:
+            return
+        if self.config.language_bypass_tts:
+            self.bypass_stats.tts += 1
+        else:
+            self.tts_queue.put((text, self.forward))
+
     def _translation_worker(self) -> None:
         assert self.translation_queue is not None
         assert self.translator is not None
         while True:
-            text = self.translation_queue.get()
-            if text is None:
+            item = self.translation_queue.get()
+            if item is None:
                 self.translation_queue.task_done()
                 break
+            text, route, index = item
+            translated = None
+            started = time.perf_counter()
             try:
-                translated = self.translator.translate(
+                translator = route.translator or self.translator
+                previous_chunks, summary = self._translation_context()
+                translated = translator.translate(
                     sentence=text,
-                    target_language=self.config.translation_language,
-                    previous_chunks=self.previous_chunks,
+                    target_language=route.target_language,
+                    previous_chunks=previous_chunks,
                     topic=self.config.topic,
+                    summary=summary,
                 )
+                elapsed = time.perf_counter() - started
+                STAGE_SECONDS.labels("translate").observe(elapsed)
+                emit("translated", index=index, elapsed=round(elapsed, 3), language=route.target_language)
                 message = f"Translated: {translated}"
                 self.logger.log_text(message)
+                self._log_translation_usage(translator)
                 self.previous_chunks.append(translated)
+                if self.summarizer is not None:
+                    self.summarizer.observe(translated)
                 if self.tts_queue is not None:
-                    self.tts_queue.put(translated)
+                    self.tts_queue.put((translated, route))
             except Exception as error:  # pragma: no cover - runtime safety
-                self.logger.log_exception(error)
+                self._error("translate", error)
             finally:
+                if self.transcript is not None:
+                    self.transcript.translate(index, translated, route.target_language)
                 self.translation_queue.task_done()
 
+    def _translation_context(self) -> tuple[list[str], str]:
+        if self.summarizer is None:
+            return list(self.previous_chunks), ""
+        # Everything newer than the brief, and at least the last few chunks for local coherence.
+        pending = self.summarizer.pending
+        recent = self.config.summary_recent_chunks
+        if len(pending) < recent:
+            return list(self.previous_chunks)[-recent:], self.summarizer.brief
+        return pending, self.summarizer.brief
+
+    def _log_translation_usage(self, translator: Translator) -> None:
+        usage = getattr(translator, "last_usage", None)
+        if usage is None:
+            return
+        total = translator.total_usage
+        self.logger.log_debug(
+            f"Translation usage: prompt={usage.prompt_tokens} cached={usage.cached_tokens} "
+            f"completion={usage.completion_tokens} "
+            f"(session prompt={total.prompt_tokens} cached={total.cached_tokens}, "
+            f"hit ratio {total.cache_hit_ratio:.0%})"
+        )
+        hedge = getattr(translator, "hedge", None)
+        if hedge is not None and hedge.stats.hedged:
+            stats = hedge.stats
+            self.logger.log_debug(
+                f"Translation hedging: {stats.hedged}/{stats.requests} hedged ({stats.hedge_rate:.0%}), "
+                f"{stats.hedge_wins} won by the hedge, extra prompt={stats.extra_prompt_tokens} "
+                f"completion={stats.extra_completion_tokens} tokens"
+            )
+
+    def _log_bypass_stats(self) -> None:
+        stats = self.bypass_stats
+        if not stats.translation:
+            return
+        self.logger.log_debug(
+            f"Same-language bypass: {stats.translation}/{stats.utterances} utterances "
+            f"({stats.bypass_rate:.0%}) skipped translation, {stats.tts} skipped TTS"
+        )
+
+    def _log_echo_stats(self) -> None:
+        if self.echo_guard is None or not self.echo_guard.stats.segments:
+            return
+        stats = self.echo_guard.stats
+        self.logger.log_debug(
+            f"Echo guard ({self.echo_guard.mode}): {stats.overlapping}/{stats.segments} segments overlapped "
+            f"playback, {stats.discarded} dropped ({stats.discarded_seconds:.1f} s)"
+        )
+
+    def _log_output_stats(self) -> None:
+        if self.tts_queue is None:
+            return
+        stats = getattr(shared_player(self.config.output_device_index).sink, "stats", None)
+        if stats is None or not stats.frames:
+            return
+        self.logger.log_debug(
+            f"Speech output: {stats.utterances} utterances, {stats.audio_seconds:.1f} s of audio in "
+            f"{stats.wall_seconds:.1f} s ({stats.realtime_factor:.1f}x real time)"
+        )
+
+    def _log_tts_stats(self) -> None:
+        # Failover sits under the sentence splitter.
+        for engine in self._tts_layers("provider_stats"):
+            self.logger.log_debug(f"TTS providers: {engine.summary()}")
+
+    def _tts_layers(self, attribute: str) -> list:
+        """The wrapper of each distinct TTS engine chain that has ``attribute`` (failover, cache, ...)."""
+
+        engines = {id(engine): engine for engine in (self.forward.tts_engine, self.reverse and self.reverse.tts_engine)}
+        layers = {}
+        for engine in engines.values():
+            while engine is not None and not hasattr(engine, attribute):
+                engine = getattr(engine, "engine", None)
+            if engine is not None:
+                layers[id(engine)] = engine
+        return list(layers.values())
+
+    def _register_metrics(self) -> None:
+        """Expose the counters the components already keep; they are read only when metrics are scraped."""
+
+        queues = {
+            "transcription": self.transcription_queue,
+            "translation": self.translation_queue,
+            "tts": self.tts_queue,
+        }
+        REGISTRY.gauge("queue_depth", "Items waiting in each pipeline queue.", ("queue",)).set_function(
+            lambda: {(name,): pending.qsize() for name, pending in queues.items() if pending is not None}
+        )
+        bypass = self.bypass_stats
+        REGISTRY.counter("utterances", "Recognised utterances.").set_function(lambda: bypass.utterances)
+        REGISTRY.counter(
+            "bypassed", "Utterances already in the target language, by skipped stage.", ("stage",)
+        ).set_function(lambda: {("translation",): bypass.translation, ("tts",): bypass.tts})
+        if self.echo_guard is not None:
+            echo = self.echo_guard.stats
+            REGISTRY.counter("echo_overlapping_segments", "Captured segments that overlapped playback.").set_function(
+                lambda: echo.overlapping
+            )
+        translators = {id(route.translator): route.translator for route in (self.forward, self.reverse) if route}
+        translators = {key: value for key, value in translators.items() if hasattr(value, "total_usage")}
+        if translators:
+            REGISTRY.counter("translation_tokens", "Tokens used by translation requests.", ("kind",)).set_function(
+                lambda: _token_totals(translators.values())
+            )
+        if self.tts_queue is None:
+            return
+        player = shared_player(self.config.output_device_index)
+        REGISTRY.counter("audio_underruns", "Times the output stream ran dry mid-utterance.").set_function(
+            lambda: player.underruns
+        )
+        REGISTRY.gauge("playback_pending_seconds", "Synthesized audio not played yet.").set_function(
+            lambda: player.pending_seconds
+        )
+        if self.catch_up is not None:
+            catch_up = self.catch_up
+            REGISTRY.gauge("playback_speed", "Current catch-up playback speed.").set_function(lambda: catch_up.speed)
+        caches = [layer.cache for layer in self._tts_layers("cache")]
+        if caches:
+            REGISTRY.counter("tts_cache", "TTS cache lookups by result.", ("result",)).set_function(
+                lambda: {("hit",): sum(c.hits for c in caches), ("miss",): sum(c.misses for c in caches)}
+            )
+        failovers = self._tts_layers("provider_stats")
+        if failovers:
+            REGISTRY.counter(
+                "tts_provider_requests", "TTS provider requests by outcome.", ("provider", "outcome")
+            ).set_function(lambda: _provider_totals(failovers))
+
+    def _text_backlog_seconds(self) -> float:
+        """Estimated speaking time of the translations still waiting for synthesis."""
+
+        if self.tts_queue is None:
+            return 0.0
+        with self.tts_queue.mutex:
+            items = [item for item in self.tts_queue.queue if item is not None]
+        seconds = 0.0
+        for text, route in items:
+            cjk = normalize_language(route.target_language) in ("zh", "ja", "ko")
+            seconds += len(text) / (CJK_CHARS_PER_SECOND if cjk else CHARS_PER_SECOND)
+        return seconds / max(self.config.tts_speed, 0.1)
+
     def _tts_worker(self) -> None:
         assert self.tts_queue is not None
         assert self.tts_engine is not None
         while True:
-            text = self.tts_queue.get()
-            if text is None:
+            item = self.tts_queue.get()
+            if item is None:
                 self.tts_queue.task_done()
                 break
+            text, route = item
+            started = time.perf_counter()
             try:
-                self.tts_engine.speak(text, self.config.output_device_index)
+                (route.tts_engine or self.tts_engine).speak(text, self.config.output_device_index)
+                elapsed = time.perf_counter() - started
+                STAGE_SECONDS.labels("tts").observe(elapsed)
+                emit("spoken", chars=len(text), elapsed=round(elapsed, 3))
             except Exception as error:  # pragma: no cover - runtime safety
-                self.logger.log_exception(error)
+                self._error("tts", error)
             finally:
                 self.tts_queue.task_done()
+
+
+def _source_glossary(dictionary: Dict[str, str], translator: Optional[Translator]) -> Optional[GlossaryMatcher]:
+    # A translator that receives the glossary applies it itself; rewriting the source
+    # sentence first would hide the terms it looks for.
+    if dictionary and not getattr(translator, "glossary", None):
+        return GlossaryMatcher(dictionary)
+    return None
+
+
+def _duration(audio: sr.AudioData) -> float:
+    return len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+
+
+def _token_totals(translators) -> Dict[Tuple[str, ...], float]:
+    totals = {("prompt",): 0.0, ("cached",): 0.0, ("completion",): 0.0}
+    for translator in translators:
+        usage = translator.total_usage
+        totals[("prompt",)] += usage.prompt_tokens
+        totals[("cached",)] += usage.cached_tokens
+        totals[("completion",)] += usage.completion_tokens
+    return totals
+
+
+def _provider_totals(engines) -> Dict[Tuple[str, ...], float]:
+    totals: Dict[Tuple[str, ...], float] = {}
+    for engine in engines:
+        for name, stats in engine.provider_stats.items():
+            for outcome in ("served", "failures", "deadline_misses", "race_losses"):
+                totals[(name, outcome)] = totals.get((name, outcome), 0) + getattr(stats, outcome)
+    return totals
@@ -0,0 +1,262 @@
+"""Process-wide client-side rate limiting for OpenAI-compatible API calls."""
+
+from __future__ import annotations
+
+import importlib
+import re
+import threading
+import time
+from types import ModuleType
+from typing import Any, Dict, Mapping, Optional
+
+from .metrics import REGISTRY
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse ``x-ratelimit-reset-*`` values such as ``1s``, ``6m0s`` or ``250ms``."""
+
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket plus AIMD concurrency control, fed by response status and headers.
+
+    Every request takes a bucket token (``rate`` per second, up to ``burst``) and a
+    concurrency slot. The concurrency limit grows by roughly one per round trip
+    while requests succeed at normal latency, and is cut multiplicatively on 429s
+    or when latency climbs well above the best seen recently. ``Retry-After`` and
+    exhausted ``x-ratelimit-remaining-*`` headers pause all callers until the
+    provider's window resets, so SDK retries queue here instead of storming.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        backoff: float = 0.5,
+        latency_tolerance: float = 3.0,
+    ) -> None:
+        self.rate = max(0.01, rate)
+        self.burst = max(1.0, burst if burst is not None else self.rate)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.backoff = min(0.95, max(0.05, backoff))
+        self.latency_tolerance = max(1.0, latency_tolerance)
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._min_latency: Optional[float] = None
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    self._cond.wait(self._blocked_until - now)
+                    continue
+                if self.in_flight < int(self.limit) and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self.in_flight += 1
+                    return
+                timeout = None
+                if self._tokens < 1.0:
+                    timeout = (1.0 - self._tokens) / self.rate
+                self._cond.wait(timeout)
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._cond.notify_all()
+
+    def observe(self, status_code: int, latency: float, headers: Mapping[str, str]) -> None:
+        """Adjust limits from one response's status, time-to-headers and rate-limit headers."""
+
+        with self._cond:
+            now = time.monotonic()
+            if status_code == 429 or status_code == 503:
+                self.throttled += 1
+                self._decrease(now, latency)
+                retry_after = _retry_after(headers)
+                if retry_after is None:
+                    retry_after = max(parse_reset(headers.get("x-ratelimit-reset-requests")) or 0.0, 1.0)
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            elif status_code < 500:
+                self._observe_latency(now, latency)
+            self._apply_headers(now, headers)
+            self._cond.notify_all()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._refilled_at = now
+
+    def _observe_latency(self, now: float, latency: float) -> None:
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        else:
+            # Let the baseline drift up slowly so a permanently slower route is not "congestion" forever.
+            self._min_latency += (latency - self._min_latency) * 0.01
+        # The absolute margin keeps jitter on very fast responses from reading as congestion.
+        if latency > max(self._min_latency * self.latency_tolerance, self._min_latency + 0.5):
+            self._decrease(now, latency)
+        else:
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / max(self.limit, 1.0))
+
+    def _decrease(self, now: float, latency: float) -> None:
+        # At most one multiplicative cut per round trip, otherwise one burst of 429s collapses the limit.
+        if now - self._last_decrease < max(latency, 0.1):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_concurrency), self.limit * self.backoff)
+
+    def _apply_headers(self, now: float, headers: Mapping[str, str]) -> None:
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            try:
+                left = float(remaining)
+            except ValueError:
+                continue
+            if left <= 0 or (kind == "requests" and left < self.in_flight):
+                reset = parse_reset(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _sdk_httpx() -> ModuleType:
+    """Return the httpx package the installed openai SDK is built on (``httpx`` or ``httpx2``)."""
+
+    from openai import DefaultHttpxClient
+
+    for base in DefaultHttpxClient.__mro__[1:]:
+        root = base.__module__.split(".", 1)[0]
+        if root.startswith("httpx"):
+            return importlib.import_module(root)
+    return importlib.import_module("httpx")
+
+
+def _release_on_close(stream: Any, limiter: AdaptiveRateLimiter) -> None:
+    # Patch the instance instead of wrapping it: the client asserts the response stream
+    # is its own SyncByteStream type, which differs between httpx and httpx2.
+    close = stream.close
+    released = False
+
+    def close_and_release() -> None:
+        nonlocal released
+        try:
+            close()
+        finally:
+            if not released:
+                released = True
+                limiter.release()
+
+    stream.close = close_and_release
+
+
+class RateLimitedTransport:
+    """httpx transport that routes every request through an :class:`AdaptiveRateLimiter`.
+
+    The concurrency slot is held until the response body is closed, so streamed
+    translation and speech responses count against the limit for their whole life.
+    It wraps the ``HTTPTransport`` of whichever httpx package the openai SDK uses.
+    """
+
+    def __init__(self, limiter: AdaptiveRateLimiter, transport: Optional[Any] = None) -> None:
+        self.limiter = limiter
+        self._transport = transport or _sdk_httpx().HTTPTransport()
+
+    def __enter__(self) -> "RateLimitedTransport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def handle_request(self, request: Any) -> Any:
+        self.limiter.acquire()
+        started = time.monotonic()
+        host = getattr(request.url, "host", "")
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            self.limiter.release()
+            API_REQUESTS.labels(host, "error").inc()
+            raise
+        latency = time.monotonic() - started
+        API_REQUESTS.labels(host, response.status_code).inc()
+        API_SECONDS.labels(host).observe(latency)
+        self.limiter.observe(response.status_code, latency, response.headers)
+        if getattr(response, "is_closed", False):
+            # Transports that hand back fully read responses never close the stream again.
+            self.limiter.release()
+        else:
+            _release_on_close(response.stream, self.limiter)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+_SHARED: Dict[str, AdaptiveRateLimiter] = {}
+_SHARED_LOCK = threading.Lock()
+
+API_REQUESTS = REGISTRY.counter("api_requests", "Model API requests by host and HTTP status.", ("host", "status"))
+API_SECONDS = REGISTRY.histogram("api_seconds", "Time to the response headers of model API requests.", ("host",))
+REGISTRY.gauge("api_in_flight", "Requests in flight per shared limiter.", ("endpoint",)).set_function(
+    lambda: {(key,): limiter.in_flight for key, limiter in list(_SHARED.items())}
+)
+REGISTRY.gauge("api_concurrency_limit", "Adaptive concurrency limit per shared limiter.", ("endpoint",)).set_function(
+    lambda: {(key,): limiter.limit for key, limiter in list(_SHARED.items())}
+)
+REGISTRY.counter("api_throttled", "Responses with status 429 or 503 per shared limiter.", ("endpoint",)).set_function(
+    lambda: {(key,): limiter.throttled for key, limiter in list(_SHARED.items())}
+)
+
+
+def shared_limiter(key: str, **kwargs) -> AdaptiveRateLimiter:
+    """Return the process-wide limiter for ``key`` (one per API endpoint), creating it once."""
+
+    with _SHARED_LOCK:
+        limiter = _SHARED.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(**kwargs)
+            _SHARED[key] = limiter
+        return limiter
@@ -0,0 +1,86 @@
+"""Where startup time goes: import and initialization time per component, for ``--profile-startup``."""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+
+@dataclass(slots=True)
+class StartupPhase:
+    """One timed step of starting a component, e.g. ``("faster-whisper", "import")``."""
+
+    component: str
+    step: str
+    offset: float  # seconds from the start of the profile
+    seconds: float
+    depth: int
+    thread: str
+
+
+class StartupProfile:
+    """Timed startup steps, recorded from any thread, and when the session became ready.
+
+    Timing a phase costs two clock reads, so the profile is always recorded and
+    only reported on request.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: List[StartupPhase] = []
+        self.ready_after: Optional[float] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, component: str, step: str = "init") -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._local.depth = depth
+            name = threading.current_thread().name
+            with self._lock:
+                self.phases.append(StartupPhase(component, step, begin - self.started, end - begin, depth, name))
+
+    def ready(self) -> None:
+        """Mark the moment the first utterance can be captured (only the first call counts)."""
+
+        if self.ready_after is None:
+            self.ready_after = time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        """The phases in start order, indented by nesting, with the thread of those run in the background."""
+
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase.offset)
+        lines = []
+        for phase in phases:
+            label = "  " * phase.depth + f"{phase.component} {phase.step}"
+            where = "" if phase.thread == "MainThread" else f"  (in {phase.thread})"
+            lines.append(f"{label:<40} {phase.offset * 1000:8.0f} ms {phase.seconds * 1000:8.0f} ms{where}")
+        if self.ready_after is not None:
+            lines.append(f"{'ready to listen':<40} {self.ready_after * 1000:8.0f} ms")
+        header = f"{'component step':<40} {'start':>11} {'took':>11}"
+        return "\n".join([header, *lines])
+
+
+_PROFILE = StartupProfile()
+
+
+def startup_profile() -> StartupProfile:
+    """The process-wide startup profile, started when this module was first imported."""
+
+    return _PROFILE
+
+
+def startup_phase(component: str, step: str = "init"):
+    """Time a startup step in the process-wide profile: ``with startup_phase("openai", "import"): ...``."""
+
+    return _PROFILE.phase(component, step)
@@ -0,0 +1,304 @@
+"""Append-only transcript of a session, with subtitle and JSONL exporters that can follow it live."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, TextIO
+
+from .logging_utils import LogWriter
+
+EXPORT_FORMATS = ("srt", "vtt", "jsonl", "txt")
+TEXT_CHOICES = ("translation", "source", "both")
+
+
+@dataclass(slots=True)
+class Utterance:
+    """One recognised utterance: its source text, its translation and when it was spoken.
+
+    ``start`` and ``end`` are seconds from the start of the session (or of the
+    recording being replayed). ``translation`` is ``None`` while the translation
+    is pending and if it failed or was not requested.
+    """
+
+    index: int
+    start: float
+    end: float
+    source: str
+    language: str = ""
+    translation: Optional[str] = None
+    target_language: str = ""
+
+
+class _Assembler:
+    """Turn journal events into complete utterances, released strictly in order.
+
+    Every utterance is followed by exactly one resolution (its translation, or
+    ``None``), but resolutions can arrive out of order: a same-language utterance
+    resolves at once while an earlier one is still being translated. Only
+    pending utterances are held, so memory stays bounded by the pipeline's
+    backlog, not the session length.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[int, Utterance] = {}
+        self._resolved: Dict[int, bool] = {}
+        self._next = 0
+
+    def feed(self, event: Dict) -> List[Utterance]:
+        kind = event.get("type")
+        index = int(event.get("index", -1))
+        if kind == "utterance":
+            self._pending[index] = Utterance(
+                index=index,
+                start=float(event.get("start", 0.0)),
+                end=float(event.get("end", 0.0)),
+                source=str(event.get("source", "")),
+                language=str(event.get("language", "")),
+            )
+            if not event.get("translate", True):
+                self._resolved[index] = True
+        elif kind == "translation" and index in self._pending:
+            utterance = self._pending[index]
+            utterance.translation = event.get("text")
+            utterance.target_language = str(event.get("language", ""))
+            self._resolved[index] = True
+        return self._release()
+
+    def finish(self) -> List[Utterance]:
+        """Release everything still pending, untranslated (the session ended or was interrupted)."""
+
+        ready = [self._pending.pop(index) for index in sorted(self._pending)]
+        self._resolved.clear()
+        if ready:
+            self._next = ready[-1].index + 1
+        return ready
+
+    def _release(self) -> List[Utterance]:
+        ready: List[Utterance] = []
+        while self._resolved.pop(self._next, False):
+            ready.append(self._pending.pop(self._next))
+            self._next += 1
+        return ready
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = max(0, int(round(seconds * 1000)))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _cue_text(utterance: Utterance, text: str) -> str:
+    translation = utterance.translation
+    if text == "source" or not translation:
+        return utterance.source
+    if text == "both" and translation != utterance.source:
+        return f"{utterance.source}\n{translation}"
+    return translation
+
+
+def render(utterance: Utterance, fmt: str, number: int, text: str = "translation") -> str:
+    """Format one utterance as an SRT or WebVTT cue (numbered from 1), a JSON line or plain text."""
+
+    if fmt == "jsonl":
+        return json.dumps(asdict(utterance), ensure_ascii=False) + "\n"
+    if fmt == "txt":
+        lines = [utterance.source]
+        if utterance.translation and utterance.translation != utterance.source:
+            lines.append(utterance.translation)
+        return "\n".join(lines) + "\n\n"
+    end = max(utterance.end, utterance.start + 0.5)
+    body = _cue_text(utterance, text)
+    if fmt == "srt":
+        return f"{number}\n{_timestamp(utterance.start, ',')} --> {_timestamp(end, ',')}\n{body}\n\n"
+    if fmt == "vtt":
+        # A blank line would end the cue early.
+        body = "\n".join(line for line in body.splitlines() if line.strip())
+        return f"{number}\n{_timestamp(utterance.start, '.')} --> {_timestamp(end, '.')}\n{body}\n\n"
+    raise ValueError(f"Unknown transcript format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}")
+
+
+def header(fmt: str) -> str:
+    return "WEBVTT\n\n" if fmt == "vtt" else ""
+
+
+class TranscriptStore:
+    """Structured, append-only record of a session, spilled to a JSONL journal as it happens.
+
+    The journal at ``path`` gets one event per recognised utterance and one per
+    translation, written by a background :class:`LogWriter`, so recording never
+    blocks the pipeline. Only the last ``keep`` utterances stay in memory.
+    Completed utterances are also rendered, in order, to each export file in
+    ``exports`` (``srt``, ``vtt``, ``jsonl`` or ``txt``, next to the journal).
+    Another process can follow the journal with :func:`follow`.
+    """
+
+    def __init__(self, path: Path, keep: int = 200, exports: Sequence[str] = (), text: str = "translation") -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.recent: Deque[Utterance] = deque(maxlen=max(1, keep))
+        self.count = 0
+        self.text = text
+        self._started = time.monotonic()
+        self._assembler = _Assembler()
+        self._lock = threading.Lock()
+        self._journal = LogWriter(self.path)
+        self._exports: Dict[str, LogWriter] = {}
+        self._numbers: Dict[str, int] = {}
+        for fmt in dict.fromkeys(exports):
+            if fmt not in EXPORT_FORMATS:
+                raise ValueError(f"Unknown transcript format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}")
+            destination = self.path.with_name(f"{self.path.stem}.{fmt}")
+            if destination == self.path:
+                destination = self.path.with_name(f"{self.path.stem}.export.{fmt}")
+            self._exports[fmt] = LogWriter(destination)
+            self._numbers[fmt] = 0
+            if header(fmt):
+                self._exports[fmt].write(header(fmt))
+        self._journal.write(
+            json.dumps({"type": "session", "started": datetime.now().isoformat(timespec="seconds")}) + "\n"
+        )
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the session started, the default time base of utterances."""
+
+        return time.monotonic() - self._started
+
+    def add(
+        self,
+        source: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        language: str = "",
+        translate: bool = True,
+    ) -> int:
+        """Record an utterance and return its index; with ``translate`` a :meth:`translate` call must follow."""
+
+        end = self.elapsed if end is None else end
+        start = end if start is None else start
+        with self._lock:
+            index = self.count
+            self.count += 1
+            self._record(
+                {
+                    "type": "utterance",
+                    "index": index,
+                    "start": round(start, 3),
+                    "end": round(end, 3),
+                    "source": source,
+                    "language": language,
+                    "translate": translate,
+                }
+            )
+        return index
+
+    def translate(self, index: int, text: Optional[str], language: str = "") -> None:
+        """Attach the translation of utterance ``index``; ``None`` if translation failed."""
+
+        with self._lock:
+            self._record({"type": "translation", "index": index, "text": text, "language": language})
+
+    def close(self) -> None:
+        """Export utterances still waiting for a translation and write everything out."""
+
+        with self._lock:
+            self._export(self._assembler.finish())
+        for writer in (self._journal, *self._exports.values()):
+            writer.close()
+
+    def export_paths(self) -> List[Path]:
+        return [writer.path for writer in self._exports.values()]
+
+    def _record(self, event: Dict) -> None:
+        self._journal.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._export(self._assembler.feed(event))
+
+    def _export(self, utterances: List[Utterance]) -> None:
+        for utterance in utterances:
+            self.recent.append(utterance)
+            for fmt, writer in self._exports.items():
+                self._numbers[fmt] += 1
+                writer.write(render(utterance, fmt, self._numbers[fmt], self.text))
+
+
+def follow(path: Path, live: bool = True, poll: float = 0.5) -> Iterator[Utterance]:
+    """Yield the completed utterances of a journal in order, waiting for new ones while ``live``.
+
+    Utterances still waiting for a translation when the journal ends (without
+    ``live``) are yielded untranslated.
+    """
+
+    assembler = _Assembler()
+    path = Path(path)
+    while live and not path.exists():
+        time.sleep(poll)  # the session has not written its first batch yet
+    with path.open("r", encoding="utf-8") as handle:
+        partial = ""
+        while True:
+            line = handle.readline()
+            if line:
+                partial += line
+                if not partial.endswith("\n"):
+                    continue  # the writer has not finished this line yet
+                event, partial = partial, ""
+                try:
+                    yield from assembler.feed(json.loads(event))
+                except json.JSONDecodeError:
+                    continue
+                continue
+            if not live:
+                break
+            time.sleep(poll)
+    yield from assembler.finish()
+
+
+def export(path: Path, fmt: str, output: TextIO, live: bool = False, text: str = "translation") -> int:
+    """Render the journal at ``path`` to ``output``; returns the number of utterances written."""
+
+    output.write(header(fmt))
+    count = 0
+    for count, utterance in enumerate(follow(path, live), start=1):
+        output.write(render(utterance, fmt, count, text))
+        output.flush()
+    return count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Export or follow a session transcript journal.")
+    parser.add_argument("journal", type=Path, help="Transcript journal (.jsonl) written by a session.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="srt", help="Output format (default: srt).")
+    parser.add_argument(
+        "--text",
+        choices=TEXT_CHOICES,
+        default="translation",
+        help="Subtitle text: the translation (falling back to the source), the source, or both lines.",
+    )
+    parser.add_argument("--follow", action="store_true", help="Keep running and print utterances as they complete.")
+    parser.add_argument("-o", "--output", type=Path, help="Write to this file instead of stdout.")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    output = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        export(args.journal, args.format, output, live=args.follow, text=args.text)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
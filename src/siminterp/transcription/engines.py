@@ -1,16 +1,44 @@
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional, Protocol
+from typing import Dict, Iterable, Optional, Protocol, Sequence
 
 from ..config import AppConfig
+from ..startup import startup_phase
+
+# ``--input-language auto`` lets the model detect the spoken language per utterance.
+AUTO_LANGUAGE = "auto"
+
+# Whisper identifies the language from one 30 s window of 16 kHz audio.
+SAMPLE_RATE = 16000
+DETECTION_SECONDS = 30
+
+
+@dataclass(slots=True)
+class Transcription:
+    """Recognised text plus the spoken language the model reported, if any."""
+
+    text: str
+    language: Optional[str] = None
+    language_probability: float = 0.0
+    # When the utterance was spoken, in seconds from the start of the session; set by the pipeline.
+    start: Optional[float] = None
+    end: Optional[float] = None
 
 
 class Transcriber(Protocol):
     def transcribe_file(self, audio_path: Path, language: str) -> str:
         """Return the recognised text for the audio file."""
 
+    def transcribe(self, audio_path: Path, language: str, candidates: Sequence[str] = ()) -> Transcription:
+        """Return the recognised text and detected language for the audio file.
+
+        With ``candidates``, the spoken language is chosen among those codes and the
+        text is decoded in it, ignoring ``language``.
+        """
+
 
 class WhisperCppTranscriber:
     def __init__(self, model: str, threads: Optional[int] = None):
@@ -25,6 +53,9 @@ class WhisperCppTranscriber:
     def transcribe_file(self, audio_path: Path, language: str) -> str:
         raise NotImplementedError("whispercpp backend is disabled.")
 
+    def transcribe(self, audio_path: Path, language: str, candidates: Sequence[str] = ()) -> Transcription:
+        raise NotImplementedError("whispercpp backend is disabled.")
+
 
 class FasterWhisperTranscriber:
     def __init__(self, model_size: str, threads: Optional[int] = None, device: str = "auto"):
@@ -58,30 +89,16 @@ class FasterWhisperTranscriber:
                 pass
 
         print("DEBUG: Importing faster_whisper...")
-        from faster_whisper import WhisperModel, download_model  # type: ignore
-        from huggingface_hub import snapshot_download
+        with startup_phase("faster-whisper", "import"):
+            import ctranslate2  # type: ignore
+            from faster_whisper import WhisperModel, download_model  # type: ignore
 
-        # Determine device and compute type
-        if device == "auto":
-            try:
-                import torch
-                if torch.cuda.is_available():
-                    device = "cuda"
-                else:
-                    device = "cpu"
-            except ImportError:
-                device = "cpu"
-        
-        print(f"DEBUG: Selected device: {device}")
+        # Determine device and compute type. CTranslate2 runs the model, so it is the one to ask
+        # about GPUs; importing torch just for the check costs seconds at every start.
+        if device in ("auto", "cuda"):
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
 
-        # Fallback for CUDA if no NVIDIA libs found
-        if device == "cuda":
-            try:
-                import torch
-                if not torch.cuda.is_available():
-                    device = "cpu"
-            except ImportError:
-                device = "cpu"
+        print(f"DEBUG: Selected device: {device}")
 
         compute_type = "float16" if device == "cuda" else "int8"
         print(f"DEBUG: Selected compute_type: {compute_type}")
@@ -107,11 +124,21 @@ class FasterWhisperTranscriber:
                     "vocabulary.*",
                  ]
                  
-                 model_path = snapshot_download(
-                    repo_id=repo_id,
-                    allow_patterns=allow_patterns,
-                    tqdm_class=None # Use default tqdm which prints to stderr
-                 )
+                 with startup_phase("faster-whisper", "locate model"):
+                     from huggingface_hub import snapshot_download
+                     from huggingface_hub.utils import LocalEntryNotFoundError
+
+                     try:
+                         # A model downloaded before is used as is, without asking the Hub for updates.
+                         model_path = snapshot_download(
+                            repo_id=repo_id, allow_patterns=allow_patterns, local_files_only=True
+                         )
+                     except LocalEntryNotFoundError:
+                         model_path = snapshot_download(
+                            repo_id=repo_id,
+                            allow_patterns=allow_patterns,
+                            tqdm_class=None # Use default tqdm which prints to stderr
+                         )
                  
                  print(f"DEBUG: Model downloaded to '{model_path}'")
              except Exception as e:
@@ -123,24 +150,84 @@ class FasterWhisperTranscriber:
                     print(f"ERROR: Fallback download also failed: {e2}")
 
         # Disable VAD during loading just in case
-        self.model = WhisperModel(
-            model_path,
-            device=device,
-            compute_type=compute_type,
-            cpu_threads=cpu_threads,
-            num_workers=cpu_threads,
-            download_root=None
-        )
+        with startup_phase("faster-whisper", "load model"):
+            self.model = WhisperModel(
+                model_path,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=cpu_threads,
+                download_root=None
+            )
         print("DEBUG: Model loaded successfully.")
 
-    def transcribe_file(self, audio_path: Path, language: str) -> str:
+    def warm_up(self) -> None:
+        """Load the VAD model now rather than on the first utterance."""
+
+        import numpy as np
+
         segments, _ = self.model.transcribe(
+            np.zeros(SAMPLE_RATE, dtype=np.float32), language="en", vad_filter=True
+        )
+        list(segments)
+
+    def transcribe_file(self, audio_path: Path, language: str) -> str:
+        return self.transcribe(audio_path, language).text
+
+    def transcribe(self, audio_path: Path, language: str, candidates: Sequence[str] = ()) -> Transcription:
+        if candidates:
+            return self._transcribe_among(audio_path, candidates)
+        segments, info = self.model.transcribe(
             str(audio_path), 
+            language=None if language == AUTO_LANGUAGE else language,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=500)
+        )
+        text = _segments_to_text(segments)
+        if language != AUTO_LANGUAGE:
+            # A forced language comes back with probability 1.0, which says nothing about the speech.
+            return Transcription(text=text)
+        return Transcription(
+            text=text,
+            language=getattr(info, "language", None),
+            language_probability=float(getattr(info, "language_probability", 0.0) or 0.0),
+        )
+
+    def _transcribe_among(self, audio_path: Path, candidates: Sequence[str]) -> Transcription:
+        """Identify which of ``candidates`` is spoken from the first 30 s, then decode in it."""
+
+        from faster_whisper import decode_audio  # type: ignore
+
+        audio = decode_audio(str(audio_path), sampling_rate=SAMPLE_RATE)
+        probabilities = self._language_probabilities(audio[: DETECTION_SECONDS * SAMPLE_RATE])
+        scores = {code: probabilities.get(code, 0.0) for code in candidates}
+        # Ties (including "no information") go to the first candidate, the configured input language.
+        language = max(candidates, key=lambda code: scores[code])
+        total = sum(scores.values())
+        segments, _ = self.model.transcribe(
+            audio,
             language=language,
             vad_filter=True,
             vad_parameters=dict(min_silence_duration_ms=500)
         )
-        return _segments_to_text(segments)
+        return Transcription(
+            text=_segments_to_text(segments),
+            language=language,
+            language_probability=scores[language] / total if total else 0.0,
+        )
+
+    def _language_probabilities(self, audio) -> Dict[str, float]:
+        detect = getattr(self.model, "detect_language", None)
+        if detect is not None:
+            try:
+                _, _, all_probabilities = detect(audio=audio)
+                return dict(all_probabilities)
+            except TypeError:
+                # faster-whisper < 1.1 has no public detect_language(audio=...).
+                pass
+        # transcribe() detects the language eagerly; leaving the segment generator unread skips decoding.
+        _, info = self.model.transcribe(audio, language=None)
+        return dict(getattr(info, "all_language_probs", None) or [])
 
 
 def _segments_to_text(result: Iterable) -> str:
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Protocol, Sequence
+
+
+class Translator(Protocol):
+    def translate(
+        self,
+        sentence: str,
+        target_language: str,
+        previous_chunks: Sequence[str],
+        topic: str,
+        summary: str = "",
+    ) -> str:
+        """Return ``sentence`` rendered in ``target_language``."""
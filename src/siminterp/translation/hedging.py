@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Optional
+
+
+@dataclass(slots=True)
+class HedgeStats:
+    """Counters describing how often hedging fired and what it cost."""
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    extra_prompt_tokens: int = 0
+    extra_completion_tokens: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        if not self.requests:
+            return 0.0
+        return self.hedged / self.requests
+
+
+class HedgePolicy:
+    """Decide when to fire a duplicate request and how many duplicates are allowed.
+
+    The hedge delay tracks a percentile of recently observed time-to-first-token,
+    so only the slow tail is duplicated. The number of hedges is capped with a
+    credit bucket: every request earns ``max_rate`` credits and a hedge spends one,
+    so over any long run at most ``max_rate`` of requests are duplicated.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_rate: float = 0.1,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.1,
+        max_delay: float = 5.0,
+        window: int = 200,
+        min_samples: int = 10,
+    ) -> None:
+        self.percentile = min(100.0, max(0.0, percentile))
+        self.max_rate = min(1.0, max(0.0, max_rate))
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.stats = HedgeStats()
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._credits = 1.0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._samples)
+        rank = int(round(self.percentile / 100.0 * (len(ordered) - 1)))
+        return min(self.max_delay, max(self.min_delay, ordered[rank]))
+
+    def record_first_token(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def note_request(self) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self._credits = min(1.0 + self.max_rate * 10, self._credits + self.max_rate)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._credits < 1.0:
+                return False
+            self._credits -= 1.0
+            self.stats.hedged += 1
+            return True
+
+    def record_outcome(self, hedge_won: bool, extra_prompt_tokens: int, extra_completion_tokens: int) -> None:
+        with self._lock:
+            if hedge_won:
+                self.stats.hedge_wins += 1
+            self.stats.extra_prompt_tokens += extra_prompt_tokens
+            self.stats.extra_completion_tokens += extra_completion_tokens
+
+
+class StreamAttempt:
+    """Run one streaming request on a background thread and expose its progress.
+
+    ``open_stream`` returns the SDK stream object; ``text_of`` and ``usage_of``
+    pull the text delta and the final usage out of its events. :meth:`cancel`
+    closes the stream, which drops the HTTP connection of the losing request.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        open_stream: Callable[[], Any],
+        text_of: Callable[[Any], Optional[str]],
+        usage_of: Callable[[Any], Any],
+        progress: threading.Event,
+    ) -> None:
+        self.label = label
+        self._open_stream = open_stream
+        self._text_of = text_of
+        self._usage_of = usage_of
+        self._progress = progress
+        self.first_token = threading.Event()
+        self.done = threading.Event()
+        self.started_at = 0.0
+        self.first_token_at: Optional[float] = None
+        self.parts: list[str] = []
+        self.usage: Any = None
+        self.error: Optional[BaseException] = None
+        self.cancelled = False
+        self._stream: Any = None
+        self._thread = threading.Thread(target=self._run, name=f"hedge-{label}", daemon=True)
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    def start(self) -> None:
+        self.started_at = time.monotonic()
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        close = getattr(self._stream, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+    def _run(self) -> None:
+        try:
+            self._stream = self._open_stream()
+            if self.cancelled:
+                self.cancel()
+                return
+            for event in self._stream:
+                if self.cancelled:
+                    break
+                usage = self._usage_of(event)
+                if usage is not None:
+                    self.usage = usage
+                delta = self._text_of(event)
+                if not delta:
+                    continue
+                if self.first_token_at is None:
+                    self.first_token_at = time.monotonic()
+                    self.first_token.set()
+                    self._progress.set()
+                self.parts.append(delta)
+        except Exception as error:  # pragma: no cover - runtime safety
+            if not self.cancelled:
+                self.error = error
+        finally:
+            self.done.set()
+            self._progress.set()
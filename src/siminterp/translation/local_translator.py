@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+from ..language import normalize_language
+
+DEFAULT_CACHE_DIR = Path(os.getenv("SIMINTERP_CACHE_DIR", Path.home() / ".cache" / "siminterp")) / "ctranslate2"
+MAX_CACHED_MODELS = 4
+
+# FLORES-200 codes used by NLLB for the languages in ..language.LANGUAGE_NAMES.
+NLLB_CODES = {
+    "en": "eng_Latn",
+    "zh": "zho_Hans",
+    "fr": "fra_Latn",
+    "es": "spa_Latn",
+    "de": "deu_Latn",
+    "ja": "jpn_Jpan",
+    "ko": "kor_Hang",
+    "ru": "rus_Cyrl",
+    "it": "ita_Latn",
+    "pt": "por_Latn",
+    "ar": "arb_Arab",
+    "hi": "hin_Deva",
+    "vi": "vie_Latn",
+    "th": "tha_Thai",
+    "id": "ind_Latn",
+    "tr": "tur_Latn",
+    "nl": "nld_Latn",
+    "pl": "pol_Latn",
+    "uk": "ukr_Cyrl",
+}
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？])\s*")
+
+
+@dataclass(slots=True)
+class _LoadedModel:
+    translator: Any
+    tokenizer: Any
+    family: str
+    lock: threading.Lock
+
+
+_MODEL_CACHE: "OrderedDict[Tuple[str, str, str], _LoadedModel]" = OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+class CTranslate2Translator:
+    """Offline sentence-level machine translation with CTranslate2 on CPU or GPU.
+
+    ``model`` is ``opus-mt`` (one Marian model per language pair, the fastest
+    option), ``nllb`` (a single multilingual model) or a path / Hugging Face
+    repo id. Transformers checkpoints are converted to int8 CTranslate2 models
+    once and kept under ``cache_dir``; loaded models are shared process-wide.
+    Conversation context is ignored: these models translate sentence by sentence.
+    """
+
+    def __init__(
+        self,
+        source_language: str,
+        model: str = "opus-mt",
+        device: str = "auto",
+        compute_type: Optional[str] = None,
+        threads: Optional[int] = None,
+        beam_size: int = 2,
+        max_batch_size: int = 16,
+        cache_dir: Optional[Path] = None,
+        local_files_only: bool = False,
+    ) -> None:
+        try:
+            import ctranslate2  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError(
+                "ctranslate2 package not installed. Install it with 'pip install ctranslate2 transformers sentencepiece'."
+            ) from exc
+
+        if device == "auto":
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        self.source_language = normalize_language(source_language)
+        self.model = model
+        self.device = device
+        self.compute_type = compute_type or ("int8_float16" if device == "cuda" else "int8")
+        self.threads = threads or max(1, (os.cpu_count() or 2) // 2)
+        self.beam_size = max(1, beam_size)
+        self.max_batch_size = max(1, max_batch_size)
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.local_files_only = local_files_only
+
+    def warm_up(self, target_language: str) -> None:
+        """Load the model for ``target_language`` and run one tiny batch through it."""
+
+        self._translate_batch(["Hello."], normalize_language(target_language))
+
+    def translate(
+        self,
+        sentence: str,
+        target_language: str,
+        previous_chunks: Sequence[str],
+        topic: str,
+        summary: str = "",
+    ) -> str:
+        sentences = [part for part in _SENTENCE_BOUNDARY.split(sentence.strip()) if part]
+        if not sentences:
+            return ""
+        target = normalize_language(target_language)
+        if target == self.source_language:
+            return sentence.strip()
+        translated = self._translate_batch(sentences, target)
+        joiner = "" if target in ("zh", "ja") else " "
+        return joiner.join(part.strip() for part in translated).strip()
+
+    def _translate_batch(self, sentences: List[str], target: str) -> List[str]:
+        loaded = self._load(target)
+        tokenizer = loaded.tokenizer
+        with loaded.lock:
+            if loaded.family == "nllb":
+                tokenizer.src_lang = _nllb_code(self.source_language)
+            batch = [tokenizer.convert_ids_to_tokens(tokenizer.encode(text)) for text in sentences]
+            target_prefix = None
+            if loaded.family == "nllb":
+                target_prefix = [[_nllb_code(target)]] * len(batch)
+            results = loaded.translator.translate_batch(
+                batch,
+                target_prefix=target_prefix,
+                beam_size=self.beam_size,
+                max_batch_size=self.max_batch_size,
+            )
+        outputs: List[str] = []
+        for result in results:
+            tokens = result.hypotheses[0]
+            if loaded.family == "nllb" and tokens:
+                tokens = tokens[1:]
+            outputs.append(tokenizer.decode(tokenizer.convert_tokens_to_ids(tokens), skip_special_tokens=True))
+        return outputs
+
+    def _load(self, target: str) -> _LoadedModel:
+        source, family = _resolve_model(self.model, self.source_language, target)
+        key = (source, self.device, self.compute_type)
+        with _MODEL_CACHE_LOCK:
+            loaded = _MODEL_CACHE.get(key)
+            if loaded is not None:
+                _MODEL_CACHE.move_to_end(key)
+                return loaded
+
+            import ctranslate2  # type: ignore
+            from transformers import AutoTokenizer  # type: ignore
+
+            model_dir = _ensure_converted(source, self.cache_dir, self.local_files_only)
+            translator = ctranslate2.Translator(
+                str(model_dir),
+                device=self.device,
+                compute_type=self.compute_type,
+                inter_threads=1,
+                intra_threads=self.threads,
+            )
+            tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+            loaded = _LoadedModel(translator=translator, tokenizer=tokenizer, family=family, lock=threading.Lock())
+            _MODEL_CACHE[key] = loaded
+            while len(_MODEL_CACHE) > MAX_CACHED_MODELS:
+                _MODEL_CACHE.popitem(last=False)
+            return loaded
+
+
+def _resolve_model(model: str, source: str, target: str) -> Tuple[str, str]:
+    name = model.strip()
+    if name in ("opus-mt", "marian"):
+        return f"Helsinki-NLP/opus-mt-{source}-{target}", "marian"
+    if name == "nllb":
+        return "facebook/nllb-200-distilled-600M", "nllb"
+    family = "nllb" if "nllb" in name.lower() else "marian"
+    return name, family
+
+
+def _nllb_code(language: str) -> str:
+    try:
+        return NLLB_CODES[language]
+    except KeyError as exc:
+        raise ValueError(f"Language '{language}' has no NLLB code mapping.") from exc
+
+
+def _ensure_converted(source: str, cache_dir: Path, local_files_only: bool) -> Path:
+    """Return a CTranslate2 model directory for ``source``, converting it on first use."""
+
+    path = Path(source).expanduser()
+    if path.is_dir() and (path / "model.bin").exists():
+        return path
+
+    output_dir = cache_dir / re.sub(r"[^A-Za-z0-9_.-]+", "--", source)
+    if (output_dir / "model.bin").exists():
+        return output_dir
+    if local_files_only:
+        raise FileNotFoundError(
+            f"No converted CTranslate2 model for '{source}' in {cache_dir} and offline mode is enabled."
+        )
+
+    try:
+        from ctranslate2.converters import TransformersConverter  # type: ignore
+        from transformers import AutoTokenizer  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError(
+            "Converting a model requires transformers and torch. Install them with "
+            "'pip install transformers sentencepiece torch' or pass an already converted model directory."
+        ) from exc
+
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    TransformersConverter(str(path) if path.is_dir() else source).convert(str(output_dir), quantization="int8")
+    AutoTokenizer.from_pretrained(str(path) if path.is_dir() else source).save_pretrained(str(output_dir))
+    return output_dir
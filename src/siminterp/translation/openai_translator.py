@@ -1,11 +1,45 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Sequence
-
-from openai import OpenAI
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence
 
+from ..dictionary import GlossaryMatcher
 from ..openai_models import RESPONSES_ONLY_MODELS
+from .hedging import HedgePolicy, StreamAttempt
+from .tokens import TokenCounter
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+SYSTEM_PROMPT = (
+    "You are a professional simultaneous interpreter. "
+    "Focus on faithful, natural-sounding translations and maintain tone. "
+    "Output ONLY the translation."
+)
+
+
+@dataclass(slots=True)
+class TranslationUsage:
+    """Token accounting reported by the provider for one or more requests."""
+
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    requests: int = 0
+
+    def add(self, other: "TranslationUsage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.cached_tokens += other.cached_tokens
+        self.completion_tokens += other.completion_tokens
+        self.requests += other.requests
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        if not self.prompt_tokens:
+            return 0.0
+        return self.cached_tokens / self.prompt_tokens
 
 
 @dataclass(slots=True)
@@ -13,74 +47,258 @@ class OpenAITranslator:
     client: OpenAI
     model: str
     temperature: float = 0.0
+    glossary: Mapping[str, str] = field(default_factory=dict)
+    context_token_budget: int = 1024
+    hedge: Optional[HedgePolicy] = None
+    hedge_client: Optional[OpenAI] = None
+    hedge_model: Optional[str] = None
+    last_usage: Optional[TranslationUsage] = field(default=None, init=False)
+    total_usage: TranslationUsage = field(default_factory=TranslationUsage, init=False)
+    _tokens: TokenCounter = field(init=False, repr=False)
+    _glossary: Optional[GlossaryMatcher] = field(default=None, init=False, repr=False)
 
-    def translate(self, sentence: str, target_language: str, previous_chunks: Sequence[str], topic: str) -> str:
-        user_prompt = self._build_prompt(sentence, target_language, previous_chunks, topic)
-        if self.model in RESPONSES_ONLY_MODELS:
-            return self._translate_with_responses(user_prompt)
-        return self._translate_with_chat_completions(user_prompt)
+    def __post_init__(self) -> None:
+        self._tokens = TokenCounter(self.model)
+        if self.glossary:
+            self._glossary = GlossaryMatcher(self.glossary)
 
-    def _build_prompt(
-        self, sentence: str, target_language: str, previous_chunks: Sequence[str], topic: str
+    def translate(
+        self,
+        sentence: str,
+        target_language: str,
+        previous_chunks: Sequence[str],
+        topic: str,
+        summary: str = "",
     ) -> str:
-        previous_context = "\n".join(chunk for chunk in previous_chunks if chunk).strip()
-        if not previous_context:
-            previous_context = "None"
+        system_prompt = self._build_system_prompt(target_language, topic)
+        user_prompt = self._build_prompt(sentence, previous_chunks)
+        return self.complete(system_prompt, user_prompt, summary=summary)
+
+    def complete(self, system_prompt: str, user_prompt: str, summary: str = "") -> str:
+        """Send one system/user exchange and return the model's text reply.
+
+        ``summary`` is sent as a separate system message after ``system_prompt``:
+        it changes only when the running brief is refreshed, so the prefix up
+        to and including it still caches between refreshes.
+        """
+
+        system_prompts = [system_prompt]
+        if summary:
+            system_prompts.append(f"Summary of the conversation so far:\n{summary}")
+        if self.hedge is not None:
+            return self._complete_hedged(system_prompts, user_prompt)
+        if self.model in RESPONSES_ONLY_MODELS:
+            return self._translate_with_responses(system_prompts, user_prompt)
+        return self._translate_with_chat_completions(system_prompts, user_prompt)
+
+    def _build_system_prompt(self, target_language: str, topic: str) -> str:
+        # Everything here stays byte-identical for a session so that providers
+        # with automatic prefix caching can reuse it across requests. Anything
+        # that changes per sentence belongs in the user message instead.
         topic_line = topic or "General conversation"
-        return (
-            "Translate the following sentence into {language}. "
-            "You must output ONLY the translation. Do not include any notes, explanations, or the original text.\n\n"
-            "Sentence: {sentence}\n"
-            "Previous Chunks: {previous}\n"
-            "Topic: {topic}"
-        ).format(language=target_language, sentence=sentence, previous=previous_context, topic=topic_line)
-
-    def _translate_with_chat_completions(self, user_prompt: str) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model,
-            temperature=self.temperature,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a professional simultaneous interpreter. "
-                        "Focus on faithful, natural-sounding translations and maintain tone. "
-                        "Output ONLY the translation."
-                    ),
-                },
-                {"role": "user", "content": user_prompt},
-            ],
+        parts = [
+            SYSTEM_PROMPT,
+            f"Translate every sentence you receive into {target_language}. "
+            "Do not include any notes, explanations, or the original text.",
+            f"Topic: {topic_line}",
+        ]
+        if self._glossary is not None:
+            parts.append("When a glossary is given with a sentence, use its renderings for those terms.")
+        return "\n\n".join(parts)
+
+    def _build_prompt(self, sentence: str, previous_chunks: Sequence[str]) -> str:
+        context = self._select_context(previous_chunks)
+        previous_context = "\n".join(context) if context else "None"
+        prompt = f"Previous Chunks:\n{previous_context}\n\n"
+        # Only the entries that occur in this sentence are sent, so prompt size
+        # tracks what is relevant rather than the size of the glossary.
+        terms = self._glossary.relevant(sentence) if self._glossary is not None else {}
+        if terms:
+            glossary = "\n".join(f"{term} = {translation}" for term, translation in terms.items())
+            prompt += f"Glossary:\n{glossary}\n\n"
+        return prompt + f"Sentence: {sentence}"
+
+    def _select_context(self, previous_chunks: Sequence[str]) -> list[str]:
+        """Return the newest chunks whose combined size fits the token budget."""
+
+        selected: list[str] = []
+        remaining = self.context_token_budget
+        for chunk in reversed(previous_chunks):
+            chunk = chunk.strip() if chunk else ""
+            if not chunk:
+                continue
+            cost = self._tokens.count(chunk) + 1
+            if cost > remaining:
+                break
+            selected.append(chunk)
+            remaining -= cost
+        selected.reverse()
+        return selected
+
+    def _record_usage(self, usage: Optional[TranslationUsage]) -> None:
+        self.last_usage = usage
+        if usage is not None:
+            self.total_usage.add(usage)
+
+    def _complete_hedged(self, system_prompts: Sequence[str], user_prompt: str) -> str:
+        """Stream the request and race a duplicate if the first token is late.
+
+        The duplicate goes to ``hedge_client``/``hedge_model`` when configured.
+        Whichever attempt produces a token first wins and the other is closed.
+        """
+
+        policy = self.hedge
+        assert policy is not None
+        policy.note_request()
+        progress = threading.Event()
+        primary = self._stream_attempt("primary", self.client, self.model, system_prompts, user_prompt, progress)
+        attempts = [primary]
+        primary.start()
+        hedge_at: Optional[float] = time.monotonic() + policy.delay()
+
+        winner: Optional[StreamAttempt] = None
+        while winner is None:
+            progress.clear()
+            winner = next((attempt for attempt in attempts if attempt.first_token.is_set()), None)
+            if winner is not None:
+                break
+            can_hedge = len(attempts) == 1
+            if all(attempt.done.is_set() for attempt in attempts):
+                # A fast failure of the primary is retried through the hedge path.
+                if can_hedge and policy.try_acquire():
+                    attempts.append(self._start_hedge(system_prompts, user_prompt, progress))
+                    continue
+                error = next((attempt.error for attempt in attempts if attempt.error is not None), None)
+                if error is not None:
+                    raise error
+                raise ValueError("No text content returned from OpenAI response.")
+            if can_hedge and hedge_at is not None:
+                remaining = hedge_at - time.monotonic()
+                if remaining <= 0:
+                    if policy.try_acquire():
+                        attempts.append(self._start_hedge(system_prompts, user_prompt, progress))
+                    else:
+                        hedge_at = None  # out of budget: wait for the primary alone
+                    continue
+                progress.wait(remaining)
+            else:
+                progress.wait()
+
+        losers = [attempt for attempt in attempts if attempt is not winner]
+        for attempt in losers:
+            attempt.cancel()
+        winner.done.wait()
+
+        ttft = primary.time_to_first_token
+        policy.record_first_token(ttft if ttft is not None else time.monotonic() - primary.started_at)
+        if losers:
+            prompt_cost = sum(self._tokens.count(text) for text in (*system_prompts, user_prompt))
+            policy.record_outcome(
+                hedge_won=winner is not primary,
+                extra_prompt_tokens=prompt_cost * len(losers),
+                extra_completion_tokens=sum(self._tokens.count(attempt.text) for attempt in losers),
+            )
+        if winner.error is not None:
+            raise winner.error
+        self._record_usage(winner.usage)
+        return winner.text.strip()
+
+    def _start_hedge(
+        self, system_prompts: Sequence[str], user_prompt: str, progress: threading.Event
+    ) -> StreamAttempt:
+        attempt = self._stream_attempt(
+            "hedge",
+            self.hedge_client or self.client,
+            self.hedge_model or self.model,
+            system_prompts,
+            user_prompt,
+            progress,
         )
-        return response.choices[0].message.content.strip()
+        attempt.start()
+        return attempt
 
-    def _translate_with_responses(self, user_prompt: str) -> str:
-        response = self.client.responses.create(
-            model=self.model,
-            input=[
+    def _stream_attempt(
+        self,
+        label: str,
+        client: OpenAI,
+        model: str,
+        system_prompts: Sequence[str],
+        user_prompt: str,
+        progress: threading.Event,
+    ) -> StreamAttempt:
+        if model in RESPONSES_ONLY_MODELS:
+            return StreamAttempt(
+                label,
+                lambda: client.responses.create(
+                    model=model,
+                    input=self._responses_input(system_prompts, user_prompt),
+                    stream=True,
+                ),
+                _responses_event_text,
+                _responses_event_usage,
+                progress,
+            )
+        return StreamAttempt(
+            label,
+            lambda: client.chat.completions.create(
+                model=model,
+                temperature=self.temperature,
+                messages=self._chat_messages(system_prompts, user_prompt),
+                stream=True,
+                stream_options={"include_usage": True},
+            ),
+            _chat_chunk_text,
+            _chat_chunk_usage,
+            progress,
+        )
+
+    @staticmethod
+    def _chat_messages(system_prompts: Sequence[str], user_prompt: str) -> list[dict[str, Any]]:
+        messages: list[dict[str, Any]] = [{"role": "system", "content": prompt} for prompt in system_prompts]
+        messages.append({"role": "user", "content": user_prompt})
+        return messages
+
+    @staticmethod
+    def _responses_input(system_prompts: Sequence[str], user_prompt: str) -> list[dict[str, Any]]:
+        return [
+            *(
                 {
                     "role": "system",
                     "content": [
                         {
                             "type": "input_text",
-                            "text": (
-                                "You are a professional simultaneous interpreter. "
-                                "Focus on faithful, natural-sounding translations and maintain tone. "
-                                "Output ONLY the translation."
-                            ),
+                            "text": prompt,
                         }
                     ],
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "input_text",
-                            "text": user_prompt,
-                        }
-                    ],
-                },
-            ],
+                }
+                for prompt in system_prompts
+            ),
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "input_text",
+                        "text": user_prompt,
+                    }
+                ],
+            },
+        ]
+
+    def _translate_with_chat_completions(self, system_prompts: Sequence[str], user_prompt: str) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            temperature=self.temperature,
+            messages=self._chat_messages(system_prompts, user_prompt),
         )
+        self._record_usage(_usage_from_chat(getattr(response, "usage", None)))
+        return response.choices[0].message.content.strip()
+
+    def _translate_with_responses(self, system_prompts: Sequence[str], user_prompt: str) -> str:
+        response = self.client.responses.create(
+            model=self.model,
+            input=self._responses_input(system_prompts, user_prompt),
+        )
+        self._record_usage(_usage_from_responses(getattr(response, "usage", None)))
         return self._extract_response_text(response)
 
     def _extract_response_text(self, response: Any) -> str:
@@ -136,3 +354,51 @@ class OpenAITranslator:
                 texts.extend(OpenAITranslator._collect_text_blocks(item))
             return texts
         return []
+
+
+def _usage_from_chat(usage: Any) -> Optional[TranslationUsage]:
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return TranslationUsage(
+        prompt_tokens=int(getattr(usage, "prompt_tokens", 0) or 0),
+        cached_tokens=int(getattr(details, "cached_tokens", 0) or 0),
+        completion_tokens=int(getattr(usage, "completion_tokens", 0) or 0),
+        requests=1,
+    )
+
+
+def _usage_from_responses(usage: Any) -> Optional[TranslationUsage]:
+    if usage is None:
+        return None
+    details = getattr(usage, "input_tokens_details", None)
+    return TranslationUsage(
+        prompt_tokens=int(getattr(usage, "input_tokens", 0) or 0),
+        cached_tokens=int(getattr(details, "cached_tokens", 0) or 0),
+        completion_tokens=int(getattr(usage, "output_tokens", 0) or 0),
+        requests=1,
+    )
+
+
+def _chat_chunk_text(chunk: Any) -> Optional[str]:
+    choices = getattr(chunk, "choices", None)
+    if not choices:
+        return None
+    delta = getattr(choices[0], "delta", None)
+    return getattr(delta, "content", None)
+
+
+def _chat_chunk_usage(chunk: Any) -> Optional[TranslationUsage]:
+    return _usage_from_chat(getattr(chunk, "usage", None))
+
+
+def _responses_event_text(event: Any) -> Optional[str]:
+    if getattr(event, "type", None) == "response.output_text.delta":
+        return getattr(event, "delta", None)
+    return None
+
+
+def _responses_event_usage(event: Any) -> Optional[TranslationUsage]:
+    if getattr(event, "type", None) != "response.completed":
+        return None
+    return _usage_from_responses(getattr(getattr(event, "response", None), "usage", None))
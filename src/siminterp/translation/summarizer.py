@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, List, Optional
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running brief for a simultaneous interpreter. "
+    "Merge the existing brief with the newly translated passages into a single updated brief. "
+    "Keep names, roles, defined terms, numbers and open topics; drop small talk and repetition. "
+    "Write in {language}, as terse notes, at most {max_words} words. Output ONLY the brief."
+)
+
+CompleteFn = Callable[[str, str], str]
+
+
+class ContextSummarizer:
+    """Condense translated history into a short running brief off the critical path.
+
+    The translation worker calls :meth:`observe` with every translated chunk and
+    reads :attr:`brief` when building a request; neither ever waits on the model.
+    Once ``interval`` unsummarised chunks have accumulated, a background thread
+    folds them into the brief with a single completion call. Chunks not yet in
+    the brief are available as :attr:`pending`.
+
+    If summarising fails, the call is retried with an exponentially growing
+    delay (up to ``max_backoff`` seconds), and only the newest
+    ``max_pending`` chunks are kept, so a broken model neither grows the prompt
+    nor gets hammered.
+    """
+
+    def __init__(
+        self,
+        complete: CompleteFn,
+        language: str,
+        interval: int = 8,
+        max_words: int = 150,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        max_pending: Optional[int] = None,
+        max_backoff: float = 60.0,
+    ) -> None:
+        self._complete = complete
+        self.language = language
+        self.interval = max(1, interval)
+        self.max_words = max(20, max_words)
+        self.on_error = on_error
+        self.max_pending = max(self.interval, max_pending or self.interval * 4)
+        self.max_backoff = max_backoff
+        self._backoff = 0.0
+        self._brief = ""
+        self._pending: List[str] = []
+        self._first = 0  # position of _pending[0] among all observed chunks
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def brief(self) -> str:
+        with self._lock:
+            return self._brief
+
+    @property
+    def pending(self) -> List[str]:
+        """Observed chunks that are not in the brief yet, oldest first."""
+
+        with self._lock:
+            return list(self._pending)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="context-summarizer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def observe(self, chunk: str) -> None:
+        chunk = chunk.strip()
+        if not chunk:
+            return
+        with self._lock:
+            self._pending.append(chunk)
+            # Only reachable while summarising keeps failing; the oldest chunks are dropped.
+            dropped = max(0, len(self._pending) - self.max_pending)
+            del self._pending[:dropped]
+            self._first += dropped
+            ready = len(self._pending) >= self.interval
+        if ready:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            with self._lock:
+                if len(self._pending) < self.interval:
+                    continue
+                brief = self._brief
+                batch = list(self._pending)
+                first = self._first
+            try:
+                updated = self._summarize(brief, batch)
+            except Exception as error:  # pragma: no cover - runtime safety
+                # Keep the pending chunks and retry after a growing delay.
+                if self.on_error is not None:
+                    self.on_error(error)
+                self._backoff = min(self.max_backoff, max(1.0, self._backoff * 2))
+                if self._stopped.wait(self._backoff):
+                    break
+                self._wakeup.set()
+                continue
+            self._backoff = 0.0
+            with self._lock:
+                self._brief = updated
+                # Chunks dropped while the call was running came out of the batch.
+                done = max(0, first + len(batch) - self._first)
+                del self._pending[:done]
+                self._first += done
+                if len(self._pending) >= self.interval:
+                    self._wakeup.set()
+
+    def _summarize(self, brief: str, batch: List[str]) -> str:
+        system_prompt = SUMMARY_SYSTEM_PROMPT.format(language=self.language, max_words=self.max_words)
+        passages = "\n".join(batch)
+        user_prompt = f"Existing brief:\n{brief or 'None'}\n\nNew passages:\n{passages}"
+        return self._complete(system_prompt, user_prompt).strip()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Optional
+
+
+class TokenCounter:
+    """Count prompt tokens with ``tiktoken`` when available, otherwise estimate them.
+
+    The estimate counts CJK characters as one token each and everything else at
+    roughly four characters per token, which is close enough to keep a context
+    budget honest for OpenAI-compatible models that do not ship a tokenizer.
+    """
+
+    def __init__(self, model: str, cache_size: int = 4096) -> None:
+        self.model = model
+        self._encoding = _load_encoding(model)
+        self._cache: Dict[str, int] = {}
+        self._cache_size = cache_size
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+        if self._encoding is not None:
+            tokens = len(self._encoding.encode(text, disallowed_special=()))
+        else:
+            tokens = estimate_tokens(text)
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[text] = tokens
+        return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    cjk = sum(1 for char in text if _is_cjk(char))
+    other = len(text) - cjk
+    return cjk + math.ceil(other / 4)
+
+
+def _is_cjk(char: str) -> bool:
+    code = ord(char)
+    return (
+        0x3040 <= code <= 0x30FF  # Hiragana / Katakana
+        or 0x3400 <= code <= 0x4DBF  # CJK Extension A
+        or 0x4E00 <= code <= 0x9FFF  # CJK Unified Ideographs
+        or 0xAC00 <= code <= 0xD7AF  # Hangul syllables
+        or 0xF900 <= code <= 0xFAFF  # CJK Compatibility Ideographs
+    )
+
+
+def _load_encoding(model: str) -> Optional[object]:
+    try:
+        import tiktoken  # type: ignore
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # OpenAI-compatible providers (deepseek, proxies) use names tiktoken does not know.
+        pass
+    except Exception:
+        # tiktoken downloads its BPE files on first use; stay usable offline.
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
@@ -0,0 +1,227 @@
+"""Content-addressed on-disk cache of synthesized speech."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .speech import PCMEngine, TTSEngineProtocol
+
+DEFAULT_CACHE_DIR = Path(os.getenv("SIMINTERP_CACHE_DIR", Path.home() / ".cache" / "siminterp")) / "tts"
+CHUNK_BYTES = 8192
+
+# Engine attributes that change the audio produced for the same text.
+_IDENTITY_ATTRIBUTES = ("model", "model_name", "voice", "speaker", "speed", "language")
+
+
+def speech_key(engine: TTSEngineProtocol, text: str) -> str:
+    """Return the cache key for ``text`` spoken by ``engine`` (text, voice, model, speed, rate)."""
+
+    identity = {name: getattr(engine, name, None) for name in _IDENTITY_ATTRIBUTES}
+    identity["engine"] = type(engine).__name__
+    identity["sample_rate"] = engine.sample_rate
+    identity["text"] = " ".join(text.split())
+    payload = json.dumps(identity, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SpeechCache:
+    """PCM clips stored as (optionally gzip-compressed) WAV files with an LRU size limit.
+
+    File names are the content keys, so concurrent writers of the same clip are
+    harmless. Recency is the file modification time, refreshed on every hit, so
+    the LRU order survives restarts.
+    """
+
+    def __init__(
+        self, directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = 256 * 1024 * 1024, compress: bool = False
+    ) -> None:
+        self.directory = Path(directory).expanduser()
+        self.max_bytes = max(0, max_bytes)
+        self.compress = compress
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[Path, int, float]] = {}
+        self._total = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.iterdir():
+            key = _key_of(path)
+            if key is None:
+                continue
+            stat = path.stat()
+            self._index[key] = (path, stat.st_size, stat.st_mtime)
+            self._total += stat.st_size
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total
+
+    def get(self, key: str) -> Optional[Tuple[bytes, int]]:
+        """Return ``(pcm, sample_rate)`` for ``key``, or ``None`` on a miss."""
+
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        path, size, _ = entry
+        try:
+            raw = path.read_bytes()
+            if path.suffix == ".gz":
+                raw = gzip.decompress(raw)
+            with wave.open(io.BytesIO(raw), "rb") as clip:
+                rate = clip.getframerate()
+                pcm = clip.readframes(clip.getnframes())
+        except (OSError, EOFError, wave.Error):
+            self._discard(key)
+            self.misses += 1
+            return None
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._index:
+                self._index[key] = (path, size, now)
+        self.hits += 1
+        return pcm, rate
+
+    def put(self, key: str, pcm: bytes, sample_rate: int) -> None:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as clip:
+            clip.setnchannels(1)
+            clip.setsampwidth(2)
+            clip.setframerate(sample_rate)
+            clip.writeframes(pcm)
+        data = buffer.getvalue()
+        suffix = ".wav"
+        if self.compress:
+            data = gzip.compress(data, compresslevel=6)
+            suffix = ".wav.gz"
+        path = self.directory / f"{key}{suffix}"
+        handle, temp_name = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(handle, "wb") as temp:
+                temp.write(data)
+            os.replace(temp_name, path)
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+            return
+        with self._lock:
+            previous = self._index.get(key)
+            if previous is not None:
+                self._total -= previous[1]
+                if previous[0] != path:
+                    previous[0].unlink(missing_ok=True)
+            self._index[key] = (path, len(data), time.time())
+            self._total += len(data)
+            self._evict()
+
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if entry is None:
+                return
+            self._total -= entry[1]
+        entry[0].unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        if self._total <= self.max_bytes:
+            return
+        for key, (path, size, _) in sorted(self._index.items(), key=lambda item: item[1][2]):
+            if self._total <= self.max_bytes:
+                break
+            del self._index[key]
+            self._total -= size
+            path.unlink(missing_ok=True)
+
+
+def _key_of(path: Path) -> Optional[str]:
+    name = path.name
+    for suffix in (".wav.gz", ".wav"):
+        if name.endswith(suffix) and not name.startswith("."):
+            return name[: -len(suffix)]
+    return None
+
+
+class CachedTTSEngine(PCMEngine):
+    """Serve repeated phrases from a :class:`SpeechCache` instead of synthesizing them again.
+
+    Misses stream through from the wrapped engine unchanged and are stored once the
+    whole clip has been produced; an utterance cut short is not cached.
+    """
+
+    def __init__(self, engine: TTSEngineProtocol, cache: SpeechCache) -> None:
+        self.engine = engine
+        self.cache = cache
+
+    @property
+    def sample_rate(self) -> int:
+        return self.engine.sample_rate
+
+    def synthesize(self, text: str) -> Iterator[bytes]:
+        key = speech_key(self.engine, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            pcm, rate = cached
+            if rate == self.engine.sample_rate:
+                for start in range(0, len(pcm), CHUNK_BYTES):
+                    yield pcm[start : start + CHUNK_BYTES]
+                return
+        parts: List[bytes] = []
+        for chunk in self.engine.synthesize(text):
+            parts.append(bytes(chunk))
+            yield chunk
+        if parts:
+            self.cache.put(key, b"".join(parts), self.engine.sample_rate)
+
+    def prewarm(self, phrases: Iterable[str]) -> Tuple[int, int]:
+        """Synthesize every phrase not cached yet; returns ``(synthesized, already_cached)``."""
+
+        synthesized = cached = 0
+        for phrase in phrases:
+            phrase = phrase.strip()
+            if not phrase:
+                continue
+            if speech_key(self.engine, phrase) in self.cache:
+                cached += 1
+                continue
+            for _ in self.synthesize(phrase):
+                pass
+            synthesized += 1
+        return synthesized, cached
+
+
+_CACHES: Dict[Path, SpeechCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def shared_cache(
+    directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = 256 * 1024 * 1024, compress: bool = False
+) -> SpeechCache:
+    """Return the process-wide cache for ``directory`` so all engines share one index."""
+
+    directory = Path(directory).expanduser()
+    with _CACHES_LOCK:
+        cache = _CACHES.get(directory)
+        if cache is None:
+            cache = SpeechCache(directory, max_bytes=max_bytes, compress=compress)
+            _CACHES[directory] = cache
+        return cache
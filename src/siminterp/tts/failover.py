@@ -0,0 +1,254 @@
+"""Fail over between TTS providers on errors or a missed first-byte deadline."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .speech import PCMEngine, TTSEngineProtocol
+
+
+@dataclass(slots=True)
+class ProviderStats:
+    """Latency and failure counters of one provider in a :class:`FailoverTTSEngine`."""
+
+    name: str
+    requests: int = 0
+    served: int = 0
+    failures: int = 0
+    deadline_misses: int = 0
+    race_losses: int = 0
+    consecutive_failures: int = 0
+    first_byte_seconds: Optional[float] = None  # moving average over served utterances
+    unhealthy_until: float = 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.requests:
+            return 0.0
+        return self.failures / self.requests
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+
+class _Attempt:
+    """One provider synthesizing one utterance on a background thread."""
+
+    _DONE = object()
+
+    def __init__(self, name: str, engine: TTSEngineProtocol, text: str, progress: threading.Event) -> None:
+        self.name = name
+        self.engine = engine
+        self.chunks: "queue.Queue[object]" = queue.Queue()
+        self.first_byte = threading.Event()
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.cancelled = False
+        self.started_at = time.monotonic()
+        self.first_byte_at: Optional[float] = None
+        self._text = text
+        self._progress = progress
+        self._thread = threading.Thread(target=self._run, name=f"tts-{name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def time_to_first_byte(self) -> Optional[float]:
+        if self.first_byte_at is None:
+            return None
+        return self.first_byte_at - self.started_at
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def drain(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.chunks.get()
+            if chunk is self._DONE:
+                break
+            yield chunk  # type: ignore[misc]
+        if self.error is not None:
+            raise self.error
+
+    def _run(self) -> None:
+        stream = self.engine.synthesize(self._text)
+        try:
+            for chunk in stream:
+                if self.cancelled:
+                    break
+                if not chunk:
+                    continue
+                self.chunks.put(chunk)
+                if self.first_byte_at is None:
+                    self.first_byte_at = time.monotonic()
+                    self.first_byte.set()
+                    self._progress.set()
+        except BaseException as error:
+            self.error = error
+        finally:
+            getattr(stream, "close", lambda: None)()
+            self.chunks.put(self._DONE)
+            self.done.set()
+            self._progress.set()
+
+
+class FailoverTTSEngine(PCMEngine):
+    """Speak through the first healthy provider that starts producing audio in time.
+
+    Providers are tried in priority order. If one raises before its first audio
+    chunk, the next one starts at once; if one misses the first-byte deadline,
+    the next one starts alongside it and whichever produces audio first plays.
+    With ``race`` the two fastest healthy providers (by recent time to first byte)
+    start together and the loser is cancelled. A provider that fails
+    ``failure_threshold`` times in a row is skipped for ``cooldown`` seconds,
+    except as a last resort. Audio from providers with a different sample rate
+    is resampled to the primary's rate, so the player sees one format.
+
+    A provider that fails after its audio has started playing is not replaced,
+    since that would repeat the start of the sentence; its error propagates.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[Tuple[str, TTSEngineProtocol]],
+        first_byte_timeout: float = 2.0,
+        race: bool = False,
+        cooldown: float = 30.0,
+        failure_threshold: int = 2,
+    ) -> None:
+        if not providers:
+            raise ValueError("FailoverTTSEngine needs at least one provider")
+        self.providers = list(providers)
+        self.first_byte_timeout = max(0.05, first_byte_timeout)
+        self.race = race
+        self.cooldown = cooldown
+        self.failure_threshold = max(1, failure_threshold)
+        self.provider_stats: Dict[str, ProviderStats] = {name: ProviderStats(name) for name, _ in self.providers}
+        self._lock = threading.Lock()
+
+    @property
+    def sample_rate(self) -> int:
+        return self.providers[0][1].sample_rate
+
+    def synthesize(self, text: str) -> Iterator[bytes]:
+        candidates = self._candidates()
+        progress = threading.Event()
+        running: List[_Attempt] = []
+        late: List[_Attempt] = []
+        last_error: Optional[BaseException] = None
+
+        def launch() -> None:
+            name, engine = candidates.pop(0)
+            self._record(name, requests=1)
+            running.append(_Attempt(name, engine, text, progress))
+
+        launch()
+        if self.race and candidates:
+            launch()
+        winner: Optional[_Attempt] = None
+        deadline = time.monotonic() + self.first_byte_timeout
+        while winner is None:
+            progress.clear()
+            for attempt in list(running):
+                if attempt.first_byte.is_set():
+                    winner = attempt
+                    break
+                if attempt.done.is_set():
+                    # Finished without producing any audio: count it as a failure.
+                    running.remove(attempt)
+                    last_error = attempt.error or RuntimeError(f"TTS provider {attempt.name} returned no audio")
+                    self._fail(attempt.name)
+            if winner is not None:
+                break
+            now = time.monotonic()
+            if candidates and (not running or now >= deadline):
+                for attempt in running:
+                    if attempt not in late:
+                        late.append(attempt)
+                        self._record(attempt.name, deadline_misses=1)
+                launch()
+                deadline = now + self.first_byte_timeout
+                continue
+            if not running:
+                assert last_error is not None
+                raise last_error
+            progress.wait(max(0.0, deadline - now) if candidates else None)
+
+        for attempt in running:
+            if attempt is not winner:
+                attempt.cancel()
+                self._record(attempt.name, race_losses=1)
+        self._succeed(winner)
+        yield from self._stream(winner)
+
+    def summary(self) -> str:
+        parts = []
+        for stats in self.provider_stats.values():
+            latency = f"{stats.first_byte_seconds * 1000:.0f} ms" if stats.first_byte_seconds is not None else "n/a"
+            parts.append(
+                f"{stats.name}: served {stats.served}/{stats.requests}, first byte {latency}, "
+                f"{stats.failures} failed, {stats.deadline_misses} late, {stats.race_losses} lost races"
+            )
+        return "; ".join(parts)
+
+    def _candidates(self) -> List[Tuple[str, TTSEngineProtocol]]:
+        healthy = [provider for provider in self.providers if self.provider_stats[provider[0]].healthy]
+        resting = [provider for provider in self.providers if provider not in healthy]
+        if self.race:
+            # Fastest first; providers without a measurement yet keep their priority order.
+            priority = {name: index for index, (name, _) in enumerate(self.providers)}
+
+            def speed(provider: Tuple[str, TTSEngineProtocol]) -> Tuple[float, int]:
+                latency = self.provider_stats[provider[0]].first_byte_seconds
+                return (latency if latency is not None else 0.0, priority[provider[0]])
+
+            healthy.sort(key=speed)
+        return healthy + resting
+
+    def _stream(self, attempt: _Attempt) -> Iterator[bytes]:
+        rate = attempt.engine.sample_rate
+        resampler = None
+        if rate != self.sample_rate:
+            from ..audio.resample import PolyphaseResampler
+
+            resampler = PolyphaseResampler(rate, self.sample_rate)
+        try:
+            for chunk in attempt.drain():
+                yield resampler.process(chunk) if resampler is not None else chunk
+        except Exception:
+            self._fail(attempt.name)
+            raise
+        finally:
+            attempt.cancel()
+        if resampler is not None:
+            yield resampler.flush()
+
+    def _record(self, name: str, **increments: int) -> None:
+        with self._lock:
+            stats = self.provider_stats[name]
+            for field, amount in increments.items():
+                setattr(stats, field, getattr(stats, field) + amount)
+
+    def _fail(self, name: str) -> None:
+        with self._lock:
+            stats = self.provider_stats[name]
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.failure_threshold:
+                stats.unhealthy_until = time.monotonic() + self.cooldown
+
+    def _succeed(self, attempt: _Attempt) -> None:
+        latency = attempt.time_to_first_byte or 0.0
+        with self._lock:
+            stats = self.provider_stats[attempt.name]
+            stats.served += 1
+            stats.consecutive_failures = 0
+            stats.unhealthy_until = 0.0
+            if stats.first_byte_seconds is None:
+                stats.first_byte_seconds = latency
+            else:
+                stats.first_byte_seconds += (latency - stats.first_byte_seconds) * 0.2
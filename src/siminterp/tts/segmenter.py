@@ -0,0 +1,219 @@
+"""Split long text into sentences and synthesize them concurrently."""
+
+from __future__ import annotations
+
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
+from ..language import normalize_language
+from .speech import PCMEngine, TTSEngineProtocol
+
+CJK_LANGUAGES = {"zh", "ja", "ko"}
+
+# Terminators ending a sentence, followed by any closing quotes or brackets.
+_CJK_SENTENCE_END = re.compile(r"[。！？!?…]+[”’」』）)】》\"']*")
+_LATIN_SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]]*(?=\s|$)|[。！？]+[”’」』）]*")
+_CJK_CLAUSE_END = re.compile(r"[，、；：,;:]")
+_LATIN_CLAUSE_END = re.compile(r"(?:[,;:]|\s[-–—])(?=\s)")
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "st", "vs", "etc", "e.g", "i.e", "jr", "sr", "no", "fig", "approx", "inc", "ltd",
+}
+
+
+def split_text(text: str, language: Optional[str] = None, max_chars: int = 160, min_chars: int = 20) -> List[str]:
+    """Cut ``text`` into sentences, and overlong sentences into clauses.
+
+    CJK text ends sentences at full-width punctuation without a following space
+    and its length limits are halved, since each character carries more speech.
+    Segments shorter than ``min_chars`` are joined to the next one so the voice
+    does not restart for every "Yes." or "OK.".
+    """
+
+    text = " ".join(text.split())
+    if not text:
+        return []
+    cjk = language is not None and normalize_language(language) in CJK_LANGUAGES
+    limit = max(8, max_chars // 2 if cjk else max_chars)
+    if cjk:
+        min_chars //= 2
+    segments: List[str] = []
+    for sentence in _sentences(text, cjk):
+        segments.extend(_clauses(sentence, cjk, limit))
+    return _merge_short(segments, min_chars, limit, cjk)
+
+
+def _sentences(text: str, cjk: bool) -> List[str]:
+    pattern = _CJK_SENTENCE_END if cjk else _LATIN_SENTENCE_END
+    sentences: List[str] = []
+    start = 0
+    for match in pattern.finditer(text):
+        end = match.end()
+        if not cjk and match.group().startswith(".") and _is_abbreviation(text[start : match.start()]):
+            continue
+        piece = text[start:end].strip()
+        if piece:
+            sentences.append(piece)
+        start = end
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _is_abbreviation(before: str) -> bool:
+    word = before.rsplit(" ", 1)[-1].lstrip("(\"'“‘").lower()
+    # Single initials ("J. Smith") and common abbreviations do not end a sentence.
+    return (len(word) == 1 and word.isalpha()) or word in _ABBREVIATIONS
+
+
+def _clauses(sentence: str, cjk: bool, limit: int) -> List[str]:
+    if len(sentence) <= limit:
+        return [sentence]
+    pattern = _CJK_CLAUSE_END if cjk else _LATIN_CLAUSE_END
+    pieces: List[str] = []
+    start = 0
+    for match in pattern.finditer(sentence):
+        pieces.append(sentence[start : match.end()].strip())
+        start = match.end()
+    pieces.append(sentence[start:].strip())
+    # Pack clauses back together up to the limit, then hard-wrap anything still too long.
+    packed: List[str] = []
+    for piece in filter(None, pieces):
+        if packed and len(packed[-1]) + len(piece) + 1 <= limit:
+            packed[-1] = packed[-1] + ("" if cjk else " ") + piece
+        else:
+            packed.extend(_wrap(piece, cjk, limit))
+    return packed
+
+
+def _wrap(text: str, cjk: bool, limit: int) -> List[str]:
+    if len(text) <= limit:
+        return [text]
+    if cjk:
+        return [text[start : start + limit] for start in range(0, len(text), limit)]
+    lines: List[str] = []
+    line = ""
+    for word in text.split(" "):
+        if line and len(line) + len(word) + 1 > limit:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _merge_short(segments: List[str], min_chars: int, limit: int, cjk: bool) -> List[str]:
+    separator = "" if cjk else " "
+    merged: List[str] = []
+    carry = ""
+    for segment in segments:
+        if carry:
+            joined = f"{carry}{separator}{segment}"
+            if len(joined) <= limit:
+                segment = joined
+            else:
+                merged.append(carry)
+            carry = ""
+        if len(segment) < min_chars:
+            carry = segment
+        else:
+            merged.append(segment)
+    if carry:
+        if merged and len(merged[-1]) + len(carry) + 1 <= limit:
+            merged[-1] = f"{merged[-1]}{separator}{carry}"
+        else:
+            merged.append(carry)
+    return merged
+
+
+class _SegmentJob:
+    """PCM chunks of one segment, handed from a pool thread to the playing generator."""
+
+    _DONE = object()
+
+    def __init__(self) -> None:
+        self.chunks: "queue.Queue[object]" = queue.Queue()
+        self.cancelled = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def run(self, engine: TTSEngineProtocol, text: str) -> None:
+        stream = engine.synthesize(text)
+        try:
+            for chunk in stream:
+                if self.cancelled.is_set():
+                    return
+                self.chunks.put(chunk)
+        except BaseException as error:
+            self.error = error
+        finally:
+            getattr(stream, "close", lambda: None)()
+            self.chunks.put(self._DONE)
+
+    def drain(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.chunks.get()
+            if chunk is self._DONE:
+                break
+            yield chunk  # type: ignore[misc]
+        if self.error is not None:
+            raise self.error
+
+
+class SegmentedTTSEngine(PCMEngine):
+    """Synthesize long text sentence by sentence, ``max_workers`` segments at a time.
+
+    Segments are synthesized concurrently but yielded strictly in order, and all of
+    them belong to one utterance, so the player plays them back to back without a
+    gap. The first segment streams as soon as the engine produces it; later ones
+    buffer until their turn. Text that fits one segment passes straight through.
+    """
+
+    def __init__(
+        self,
+        engine: TTSEngineProtocol,
+        language: Optional[str] = None,
+        max_workers: int = 3,
+        max_chars: int = 160,
+    ) -> None:
+        self.engine = engine
+        self.language = language
+        self.max_workers = max(1, max_workers)
+        self.max_chars = max_chars
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def sample_rate(self) -> int:
+        return self.engine.sample_rate
+
+    def split(self, text: str) -> List[str]:
+        return split_text(text, self.language, max_chars=self.max_chars)
+
+    def synthesize(self, text: str) -> Iterator[bytes]:
+        segments = self.split(text)
+        if len(segments) <= 1 or self.max_workers == 1:
+            for segment in segments:
+                yield from self.engine.synthesize(segment)
+            return
+        executor = self._pool()
+        jobs = [_SegmentJob() for _ in segments]
+        futures = [executor.submit(job.run, self.engine, segment) for job, segment in zip(jobs, segments)]
+        try:
+            for job in jobs:
+                yield from job.drain()
+        finally:
+            # The consumer stopped early (or a segment failed): drop the rest of the paragraph.
+            for job, future in zip(jobs, futures):
+                future.cancel()
+                job.cancelled.set()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tts-segment")
+            return self._executor
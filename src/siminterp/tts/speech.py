@@ -1,16 +1,65 @@
 from __future__ import annotations
 
-from typing import Optional, Protocol
+import asyncio
+import concurrent.futures
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Iterator, List, Optional, Protocol, Tuple
 
-import pyaudio
-from openai import OpenAI
+from ..audio.player import shared_player
+from ..language import normalize_language
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# Stock Edge voices used when no voice is configured for a language.
+EDGE_DEFAULT_VOICES = {
+    "en": "en-US-AriaNeural",
+    "zh": "zh-CN-XiaoxiaoNeural",
+    "fr": "fr-FR-DeniseNeural",
+    "es": "es-ES-ElviraNeural",
+    "de": "de-DE-KatjaNeural",
+    "ja": "ja-JP-NanamiNeural",
+    "ko": "ko-KR-SunHiNeural",
+    "ru": "ru-RU-SvetlanaNeural",
+    "it": "it-IT-ElsaNeural",
+    "pt": "pt-BR-FranciscaNeural",
+}
 
 
 class TTSEngineProtocol(Protocol):
+    sample_rate: int
+
+    def synthesize(self, text: str) -> Iterator[bytes]:
+        """Yield 16-bit mono PCM at ``sample_rate`` for ``text``."""
+
     def speak(self, text: str, output_device_index: Optional[int]) -> None: ...
 
-class OpenAITTSEngine:
-    """Stream OpenAI text-to-speech audio through PyAudio."""
+
+class PCMEngine(ABC):
+    """Base for engines that only produce PCM; playback goes through the device's shared player.
+
+    :meth:`speak` returns once the utterance is synthesised and queued, so the
+    next sentence can be synthesised while this one plays.
+    """
+
+    sample_rate: int = 24000
+
+    @abstractmethod
+    def synthesize(self, text: str) -> Iterator[bytes]:
+        """Yield the utterance as 16-bit mono PCM at :attr:`sample_rate`."""
+
+    def speak(self, text: str, output_device_index: Optional[int]) -> None:
+        if not text:
+            return
+        shared_player(output_device_index).play(self.synthesize(text), self.sample_rate)
+
+
+class OpenAITTSEngine(PCMEngine):
+    """Stream OpenAI text-to-speech audio as 24 kHz PCM."""
+
+    sample_rate = 24000
 
     def __init__(self, client: OpenAI, model: str, voice: str, speed: float) -> None:
         self.client = client
@@ -18,417 +67,373 @@ class OpenAITTSEngine:
         self.voice = voice
         self.speed = speed
 
-    def speak(self, text: str, output_device_index: Optional[int]) -> None:
-        if not text:
-            return
+    def synthesize(self, text: str) -> Iterator[bytes]:
+        # response_format="pcm" is raw 24 kHz 16-bit mono; chunks go to the player as they arrive.
+        with self.client.audio.speech.with_streaming_response.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="pcm",
+            speed=self.speed,
+        ) as response:
+            yield from response.iter_bytes(chunk_size=4096)
 
-        audio_interface = pyaudio.PyAudio()
-        stream = None
-        try:
-            try:
-                stream = audio_interface.open(
-                    format=pyaudio.paInt16,
-                    channels=1,
-                    rate=24000,
-                    output=True,
-                    output_device_index=output_device_index,
-                )
-            except OSError as e:
-                if e.errno == -9999 or "Unanticipated host error" in str(e):
-                    # Retry once with default device if specified device fails with host error
-                    if output_device_index is not None:
-                        stream = audio_interface.open(
-                            format=pyaudio.paInt16,
-                            channels=1,
-                            rate=24000,
-                            output=True,
-                            output_device_index=None,
-                        )
-                    else:
-                        raise
-                else:
-                    raise
-
-            with self.client.audio.speech.with_streaming_response.create(
-                model=self.model,
-                voice=self.voice,
-                input=text,
-                response_format="pcm",
-                speed=self.speed,
-            ) as response:
-                # Accumulate audio to handle potential stream issues or resampling if needed
-                # However, for true streaming, we should write chunk by chunk.
-                # If invalid sample rate happens, we can't easily resample a stream on the fly without a buffer or complex logic.
-                # For simplicity and robustness against -9997, we will buffer the whole sentence for OpenAI if stream fails?
-                # Actually, the error happens at audio_interface.open(), BEFORE we write data.
-                
-                for chunk in response.iter_bytes(chunk_size=1024):
-                    if stream:
-                         stream.write(chunk)
-        except OSError as e:
-             # Handle "Invalid sample rate" error (Errno -9997) or -9999 by buffering and resampling
-             # This block catches errors from audio_interface.open() if it was outside the loop?
-             # No, open() is inside the try block.
-             # If open() fails, we are here.
-             
-             if e.errno == -9997 or e.errno == -9999 or "Invalid sample rate" in str(e) or "Unanticipated host error" in str(e):
-                 # We need to re-request or buffer the audio, then resample.
-                 # Since we are already inside the "with client..." block or passed it? 
-                 # Actually, if open() failed, we haven't started streaming from OpenAI effectively or we can restart it.
-                 # But we can't easily restart the generator.
-                 # Strategy: Since OpenAI TTS is fast, let's just use the non-streaming API or buffer it all if we detect this error?
-                 # Or better: Resample logic requires numpy.
-                 
-                 # Let's fallback to a safe implementation that downloads the whole audio, resamples, and plays.
-                 # We need to recreate the request because the previous response stream is consumed or we are in exception.
-                 
-                 fallback_rate = 48000
-                 
-                 # Re-create request to get full content (not streaming this time for simplicity in resampling)
-                 # Note: response_format='pcm' gives raw 24kHz.
-                 response = self.client.audio.speech.create(
-                    model=self.model,
-                    voice=self.voice,
-                    input=text,
-                    response_format="pcm",
-                    speed=self.speed,
-                 )
-                 # This returns binary content directly
-                 audio_data = response.content
-                 
-                 import numpy as np
-                 wav_np = np.frombuffer(audio_data, dtype=np.int16)
-                 
-                 # Resample 24000 -> 48000
-                 sample_rate = 24000
-                 duration_s = len(wav_np) / sample_rate
-                 new_num_samples = int(duration_s * fallback_rate)
-                 
-                 x_old = np.linspace(0, duration_s, len(wav_np))
-                 x_new = np.linspace(0, duration_s, new_num_samples)
-                 
-                 wav_resampled = np.interp(x_new, x_old, wav_np)
-                 wav_int16 = wav_resampled.astype(np.int16)
-                 audio_data_resampled = wav_int16.tobytes()
-                 
-                 try:
-                    stream = audio_interface.open(
-                        format=pyaudio.paInt16,
-                        channels=1,
-                        rate=fallback_rate,
-                        output=True,
-                        output_device_index=output_device_index,
-                    )
-                 except OSError:
-                     if output_device_index is not None:
-                         stream = audio_interface.open(
-                             format=pyaudio.paInt16,
-                             channels=1,
-                             rate=fallback_rate,
-                             output=True,
-                             output_device_index=None,
-                         )
-                     else:
-                         raise
-                 
-                 stream.write(audio_data_resampled)
-             else:
-                 raise
-        except Exception:
-            # Re-raise other exceptions to be logged by the worker
-            raise
-        finally:
-            if stream is not None:
-                stream.stop_stream()
-                stream.close()
-            audio_interface.terminate()
-
-class CoquiTTSEngine:
-    """Local TTS using Coqui TTS."""
-    
-    def __init__(self, model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2", speaker: Optional[str] = None, speed: float = 1.0):
+
+# Language codes XTTS was trained on; the rest of the app uses plain ISO 639-1 codes.
+XTTS_LANGUAGES = {
+    "en", "es", "fr", "de", "it", "pt", "pl", "tr", "ru", "nl", "cs", "ar", "zh-cn", "ja", "hu", "ko", "hi",
+}
+XTTS_DEFAULT_SPEAKER = "Ana Florence"
+WARMUP_TEXT = "Hello."
+
+
+def _xtts_language(language: Optional[str]) -> str:
+    code = normalize_language(language) if language else "en"
+    if code == "zh":
+        return "zh-cn"
+    return code if code in XTTS_LANGUAGES else "en"
+
+
+class CoquiTTSEngine(PCMEngine):
+    """Local TTS using Coqui TTS.
+
+    XTTS models are streamed: the speaker's conditioning latents are computed once
+    at start-up and ``inference_stream`` yields audio every ``stream_chunk_size``
+    GPT tokens, so playback starts long before the sentence is fully generated.
+    A short warm-up synthesis at start-up moves the first-call overhead (CUDA
+    kernels, caches) out of the first real utterance. Other Coqui models fall
+    back to synthesising whole sentences.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2",
+        speaker: Optional[str] = None,
+        speed: float = 1.0,
+        language: Optional[str] = None,
+        stream_chunk_size: int = 20,
+        warmup: bool = True,
+    ):
         try:
             from TTS.api import TTS
         except ImportError as exc:
             raise RuntimeError(
                 "Coqui TTS package not installed. Install it with 'pip install TTS'."
             ) from exc
-            
+
         # Check for GPU availability
         import torch
+
+        self._torch = torch
         device = "cuda" if torch.cuda.is_available() else "cpu"
-        
+
         self.tts = TTS(model_name).to(device)
         self.speaker = speaker
         self.speed = speed
         self.model_name = model_name
-        
+        self.stream_chunk_size = stream_chunk_size
+        self.language: Optional[str] = None
+        if self.tts.is_multi_lingual:
+            if "xtts" in model_name.lower():
+                self.language = _xtts_language(language)
+            elif language:
+                self.language = normalize_language(language)
+
         # Default speakers for multi-speaker models if none provided
         if not self.speaker and self.tts.is_multi_speaker:
-            # Try to find a reasonable default or let TTS handle it (it usually requires one)
-            # For XTTS v2, we might need a speaker wav or name.
-            # Let's grab the first one if available
-            if hasattr(self.tts.tts, 'speaker_manager') and self.tts.tts.speaker_manager:
-                 speakers = list(self.tts.tts.speaker_manager.speakers.keys())
-                 if speakers:
-                     self.speaker = speakers[0]
-            # Fallback: if speaker is still None but model needs it, 
-            # we might need to provide a reference wav for XTTS if it's not in speaker_manager.
-            # However, XTTS usually comes with some default speakers.
-            # If self.speaker is still None, we might fail later.
+            if hasattr(self.tts.tts, "speaker_manager") and self.tts.tts.speaker_manager:
+                speakers = list(self.tts.tts.speaker_manager.speakers.keys())
+                if speakers:
+                    self.speaker = speakers[0]
 
-    def speak(self, text: str, output_device_index: Optional[int]) -> None:
-        if not text:
+        self._model = getattr(self.tts.synthesizer, "tts_model", None)
+        self._latents = None
+        if hasattr(self._model, "inference_stream"):
+            self._latents = self._speaker_latents()
+        if warmup:
+            for _ in self.synthesize(WARMUP_TEXT):
+                pass
+
+    @property
+    def sample_rate(self) -> int:
+        # Coqui models output different sample rates; XTTS v2 is 24000 Hz.
+        return int(self.tts.synthesizer.output_sample_rate)
+
+    def _speaker_latents(self):
+        """Return XTTS ``(gpt_cond_latent, speaker_embedding)`` for the configured speaker.
+
+        ``speaker`` is either one of the model's built-in speakers or the path of a
+        reference recording to clone.
+        """
+
+        if self.speaker and os.path.isfile(self.speaker):
+            return self._model.get_conditioning_latents(audio_path=[self.speaker])
+        speakers = getattr(getattr(self._model, "speaker_manager", None), "speakers", None) or {}
+        name = self.speaker or XTTS_DEFAULT_SPEAKER
+        if name not in speakers:
+            if not speakers:
+                raise RuntimeError(
+                    f"XTTS model {self.model_name} has no built-in speakers; pass a reference WAV path as the voice."
+                )
+            name = next(iter(speakers))
+        self.speaker = name
+        entry = speakers[name]
+        return entry["gpt_cond_latent"], entry["speaker_embedding"]
+
+    def synthesize(self, text: str) -> Iterator[bytes]:
+        if self._latents is not None:
+            yield from self._stream(text)
             return
-            
-        # Coqui TTS generation (returns raw wav data usually, or we save to file/stream)
-        # For low latency, we want streaming, but standard Coqui API is often file-based or full-gen.
-        # We will use the standard generation and play it via PyAudio.
-        
-        # Since Coqui outputs varying sample rates depending on the model, we need to check.
-        # XTTS v2 is usually 24000Hz.
-        
-        # Note: Coqui's python API 'tts_to_file' saves to file. 'tts' returns waveform.
-        
-        # Handle language argument dynamically if needed. 
-        # If model is multilingual, language is required. If monolingual, it should be None.
-        language = None
-        if self.tts.is_multi_lingual:
-            language = "en"
 
-        # For XTTS, if no speaker is set, we often need to provide a reference audio file path (speaker_wav).
-        # But the simple API `tts()` usually handles speaker names if they are in the model.
-        # If we are here and self.speaker is None, and it's XTTS, we might be in trouble unless we use speaker_wav.
-        # Let's assume for now we found a speaker name or the user provided one.
-        
         kwargs = {}
         if self.speaker:
-            kwargs['speaker'] = self.speaker
-        
-        # If it's XTTS and we still have no speaker, we MUST provide one.
-        # Many XTTS models have 'Ana Florence' or similar as defaults in their config but need it passed.
-        if not self.speaker and "xtts" in self.model_name.lower():
-             # Hard fallback: Try to use 'Ana Florence' which is common in XTTS v2
-             kwargs['speaker'] = "Ana Florence"
-
-        if self.tts.is_multi_lingual and language:
-            kwargs['language'] = language
-
-        wav = self.tts.tts(text=text, **kwargs) 
-        # NOTE: Language handling might need to be dynamic based on target language config, 
-        # but Coqui's XTTS often infers or needs explicit lang. 
-        # For now we assume English or rely on model defaults. 
-        # XTTS requires language arg.
-        
-        import numpy as np
-        
-        # Convert to int16 for PyAudio
-        # Coqui output is usually float32 in [-1, 1] list or numpy array
-        wav_np = np.array(wav)
-        wav_int16 = (wav_np * 32767).astype(np.int16)
-        audio_data = wav_int16.tobytes()
-        
-        sample_rate = self.tts.synthesizer.output_sample_rate
-
-        audio_interface = pyaudio.PyAudio()
-        stream = None
+            kwargs["speaker"] = self.speaker
+        if self.language:
+            kwargs["language"] = self.language
+        yield _float_to_pcm(self.tts.tts(text=text, **kwargs))
+
+    def _stream(self, text: str) -> Iterator[bytes]:
+        gpt_cond_latent, speaker_embedding = self._latents
+        with self._torch.inference_mode():
+            chunks = self._model.inference_stream(
+                text,
+                self.language or "en",
+                gpt_cond_latent,
+                speaker_embedding,
+                stream_chunk_size=self.stream_chunk_size,
+                speed=self.speed,
+                enable_text_splitting=True,
+            )
+            for chunk in chunks:
+                yield _float_to_pcm(chunk.squeeze().cpu().numpy())
+
+
+def _float_to_pcm(wav) -> bytes:
+    import numpy as np
+
+    # Coqui output is float32 in [-1, 1] (list, numpy array or tensor); the player takes int16.
+    wav_np = np.clip(np.asarray(wav, dtype=np.float32), -1.0, 1.0)
+    return (wav_np * 32767).astype(np.int16).tobytes()
+
+
+class _MP3Feed:
+    """Bytes handed from the download coroutine to the decoder on the TTS worker thread."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, data: bytes) -> None:
+        with self._cond:
+            self._buffer += data
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def read(self, num_bytes: int) -> bytes:
+        """Block until some bytes are available; ``b""`` means the stream has ended."""
+
+        with self._cond:
+            while not self._buffer and not self._closed:
+                self._cond.wait()
+            data = bytes(self._buffer[:num_bytes])
+            del self._buffer[:num_bytes]
+            return data
+
+
+# MPEG audio Layer III tables, indexed by the header's version bits.
+_MP3_BITRATES = {
+    "1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_frame_length(header: bytes) -> Tuple[int, int]:
+    """Return ``(frame_bytes, samples_per_frame)`` for a Layer III header, ``(0, 0)`` if invalid."""
+
+    if header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return 0, 0
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return 0, 0
+    padding = (header[2] >> 1) & 0x01
+    bitrate = _MP3_BITRATES["1" if version == 3 else "2"][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    samples = 1152 if version == 3 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples
+
+
+class _IncrementalMP3Decoder:
+    """Decode an MP3 byte stream as it arrives, a few frames at a time.
+
+    miniaudio's streaming decoder waits for 16 KB of input (several seconds of
+    Edge's 48 kbit/s speech) before producing anything, so complete frames are
+    split off here and decoded in small groups instead. Each group is preceded by
+    the last few frames already decoded, which restores the bit reservoir and
+    MDCT overlap the new frames depend on; only the new frames' samples are kept,
+    so the result matches one continuous decode.
+    """
+
+    PRIMING_FRAMES = 8
+
+    def __init__(self, miniaudio, sample_rate: int) -> None:
+        self._miniaudio = miniaudio
+        self.sample_rate = sample_rate
+        self._pending = bytearray()
+        # (frame bytes, samples per frame) of the most recently decoded frames.
+        self._priming: List[Tuple[bytes, int]] = []
+        self._waiting: List[Tuple[bytes, int]] = []
+
+    def feed(self, data: bytes) -> bytes:
+        """Add downloaded bytes; returns the int16 PCM of every frame now complete."""
+
+        self._pending += data
+        frames: List[Tuple[bytes, int]] = []
+        position = 0
+        while len(self._pending) - position >= 4:
+            length, samples = _mp3_frame_length(self._pending[position : position + 4])
+            if not length:
+                # Not a frame header (ID3 tag or garbage): resynchronise one byte later.
+                position += 1
+                continue
+            if len(self._pending) - position < length:
+                break
+            frames.append((bytes(self._pending[position : position + length]), samples))
+            position += length
+        del self._pending[:position]
+        self._waiting += frames
+        if not self._waiting:
+            return b""
+        group = self._priming + self._waiting
         try:
-            try:
-                stream = audio_interface.open(
-                    format=pyaudio.paInt16,
-                    channels=1,
-                    rate=sample_rate,
-                    output=True,
-                    output_device_index=output_device_index,
-                )
-                stream.write(audio_data)
-            except OSError as e:
-                # Handle "Invalid sample rate" error (Errno -9997) by resampling
-                # Also handle -9999 "Unanticipated host error" which often happens with invalid sample rates on WASAPI
-                if e.errno == -9997 or e.errno == -9999 or "Invalid sample rate" in str(e) or "Unanticipated host error" in str(e):
-                    # Fallback to 48000Hz which is widely supported
-                    fallback_rate = 48000
-                    # If original was already 48000, try 44100
-                    if sample_rate == fallback_rate:
-                        fallback_rate = 44100
-                    
-                    # Resample using numpy linear interpolation
-                    duration_s = len(wav_np) / sample_rate
-                    new_num_samples = int(duration_s * fallback_rate)
-                    
-                    x_old = np.linspace(0, duration_s, len(wav_np))
-                    x_new = np.linspace(0, duration_s, new_num_samples)
-                    
-                    wav_resampled = np.interp(x_new, x_old, wav_np)
-                    wav_int16 = (wav_resampled * 32767).astype(np.int16)
-                    audio_data = wav_int16.tobytes()
-                    
-                    try:
-                        stream = audio_interface.open(
-                            format=pyaudio.paInt16,
-                            channels=1,
-                            rate=fallback_rate,
-                            output=True,
-                            output_device_index=output_device_index,
-                        )
-                    except OSError:
-                        # If still fails (possibly due to device index), try default device
-                        if output_device_index is not None:
-                            stream = audio_interface.open(
-                                format=pyaudio.paInt16,
-                                channels=1,
-                                rate=fallback_rate,
-                                output=True,
-                                output_device_index=None,
-                            )
-                        else:
-                            raise
-                    stream.write(audio_data)
-                else:
-                    raise
-        except Exception:
-            raise
-        finally:
-            if stream:
-                stream.stop_stream()
-                stream.close()
-            audio_interface.terminate()
+            decoded = self._miniaudio.decode(
+                b"".join(frame for frame, _ in group),
+                output_format=self._miniaudio.SampleFormat.SIGNED16,
+                nchannels=1,
+                sample_rate=self.sample_rate,
+            )
+        except self._miniaudio.DecodeError:
+            # Too few frames to sync on yet; try again with the next chunk.
+            return b""
+        # The decoder emits nothing for primed frames whose reservoir it never saw, so
+        # take the new frames' share from the end of the output rather than the start.
+        wanted = sum(samples for _, samples in self._waiting) * self.sample_rate // decoded.sample_rate
+        self._priming = group[-self.PRIMING_FRAMES :]
+        self._waiting = []
+        return decoded.samples[-wanted:].tobytes() if wanted else b""
+
+
+class _EventLoopThread:
+    """One asyncio loop on a daemon thread, shared by every Edge TTS request."""
 
-class EdgeTTSEngine:
-    """Microsoft Edge TTS engine."""
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="edge-tts-loop", daemon=True)
+        self._thread.start()
 
-    def __init__(self, voice: str = "en-US-AriaNeural", speed: float = 1.0) -> None:
+    def submit(self, coroutine) -> "concurrent.futures.Future":
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+
+_EDGE_LOOP: Optional[_EventLoopThread] = None
+_EDGE_LOOP_LOCK = threading.Lock()
+
+
+def _edge_loop() -> _EventLoopThread:
+    global _EDGE_LOOP
+    with _EDGE_LOOP_LOCK:
+        if _EDGE_LOOP is None:
+            _EDGE_LOOP = _EventLoopThread()
+        return _EDGE_LOOP
+
+
+class EdgeTTSEngine(PCMEngine):
+    """Microsoft Edge TTS engine.
+
+    MP3 chunks are downloaded on a persistent event loop and decoded frame by frame
+    as they arrive, so playback starts after the first chunk instead of after the
+    whole sentence. A dropped connection is retried and the
+    bytes already delivered are skipped in the new stream, so playback resumes
+    where it stopped.
+    """
+
+    sample_rate = 24000
+
+    def __init__(self, voice: str = "en-US-AriaNeural", speed: float = 1.0, retries: int = 3) -> None:
         self.voice = voice
         self.speed = speed
+        self.retries = max(1, retries)
 
-    def speak(self, text: str, output_device_index: Optional[int]) -> None:
-        if not text:
-            return
-
+    def synthesize(self, text: str) -> Iterator[bytes]:
         try:
             import edge_tts
             import miniaudio
-            import asyncio
         except ImportError as exc:
             raise RuntimeError(
                 "edge-tts or miniaudio package not installed. Install them with 'pip install edge-tts miniaudio'."
             ) from exc
 
+        feed = _MP3Feed()
+        download = _edge_loop().submit(self._download(edge_tts, text, feed))
+        decoder = _IncrementalMP3Decoder(miniaudio, self.sample_rate)
+        try:
+            while True:
+                data = feed.read(8192)
+                if not data:
+                    break
+                pcm = decoder.feed(data)
+                if pcm:
+                    yield pcm
+            download.result()
+        finally:
+            # Stops the download if the consumer gave up early (e.g. the pipeline stopped).
+            feed.close()
+
+    async def _download(self, edge_tts, text: str, feed: _MP3Feed) -> None:
         # Calculate rate string
         rate_val = int((self.speed - 1.0) * 100)
         sign = "+" if rate_val >= 0 else ""
         rate_str = f"{sign}{rate_val}%"
 
-        async def _generate_audio():
-            communicate = edge_tts.Communicate(text, self.voice, rate=rate_str)
-            mp3_data = b""
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio":
-                    mp3_data += chunk["data"]
-            return mp3_data
-
-        mp3_data = None
-        import time
-        # Retry up to 3 times for network resilience
-        for attempt in range(3):
-            try:
-                mp3_data = asyncio.run(_generate_audio())
-                if mp3_data:
-                    break
-            except Exception as e:
-                # Log or print error if needed, but we are inside a worker usually.
-                # If it's the last attempt, re-raise.
-                if attempt == 2:
-                    raise
-                # Wait briefly before retrying
-                time.sleep(1.0)
-
-        if not mp3_data:
-            return
-
-        # Decode MP3 to PCM
-        try:
-            decoded = miniaudio.decode(
-                mp3_data, 
-                nchannels=1, 
-                sample_rate=24000, 
-                output_format=miniaudio.SampleFormat.SIGNED16
-            )
-        except Exception:
-            raise
-
-        audio_interface = pyaudio.PyAudio()
-        stream = None
+        delivered = 0
         try:
-            try:
-                stream = audio_interface.open(
-                    format=pyaudio.paInt16,
-                    channels=decoded.nchannels,
-                    rate=decoded.sample_rate,
-                    output=True,
-                    output_device_index=output_device_index,
-                )
-                # Ensure data is bytes, decoded.samples might be memoryview or array
-                audio_data = decoded.samples
-                if hasattr(audio_data, "tobytes"):
-                     audio_data = audio_data.tobytes()
-                stream.write(audio_data)
-            except OSError as e:
-                 # Handle "Invalid sample rate" error (Errno -9997) or "Unanticipated host error" (-9999) by resampling
-                if e.errno == -9997 or e.errno == -9999 or "Invalid sample rate" in str(e) or "Unanticipated host error" in str(e):
-                    # Fallback to 48000Hz
-                    fallback_rate = 48000
-                    sample_rate = decoded.sample_rate
-                    if sample_rate == fallback_rate:
-                        fallback_rate = 44100
-                    
-                    # Get audio data as numpy array for resampling
-                    import numpy as np
-                    audio_data_bytes = decoded.samples
-                    if hasattr(audio_data_bytes, "tobytes"):
-                        audio_data_bytes = audio_data_bytes.tobytes()
-                    
-                    # Convert bytes back to numpy int16
-                    wav_np = np.frombuffer(audio_data_bytes, dtype=np.int16)
-                    
-                    # Resample
-                    duration_s = len(wav_np) / sample_rate
-                    new_num_samples = int(duration_s * fallback_rate)
-                    
-                    x_old = np.linspace(0, duration_s, len(wav_np))
-                    x_new = np.linspace(0, duration_s, new_num_samples)
-                    
-                    wav_resampled = np.interp(x_new, x_old, wav_np)
-                    wav_int16 = wav_resampled.astype(np.int16)
-                    audio_data_resampled = wav_int16.tobytes()
-                    
-                    try:
-                        stream = audio_interface.open(
-                            format=pyaudio.paInt16,
-                            channels=decoded.nchannels,
-                            rate=fallback_rate,
-                            output=True,
-                            output_device_index=output_device_index,
-                        )
-                    except OSError:
-                         # If still fails (possibly due to device index), try default device
-                        if output_device_index is not None:
-                            stream = audio_interface.open(
-                                format=pyaudio.paInt16,
-                                channels=decoded.nchannels,
-                                rate=fallback_rate,
-                                output=True,
-                                output_device_index=None,
-                            )
-                        else:
-                            raise
-                    stream.write(audio_data_resampled)
-                else:
-                    raise
-        except Exception:
-            raise
+            for attempt in range(self.retries):
+                # Synthesis is deterministic for the same text and voice, so a retry can skip
+                # what was already decoded instead of replaying the sentence from the start.
+                skip = delivered
+                try:
+                    communicate = edge_tts.Communicate(text, self.voice, rate=rate_str)
+                    async for chunk in communicate.stream():
+                        if feed.closed:
+                            return
+                        if chunk["type"] != "audio":
+                            continue
+                        data = chunk["data"]
+                        if skip:
+                            if len(data) <= skip:
+                                skip -= len(data)
+                                continue
+                            data = data[skip:]
+                            skip = 0
+                        feed.write(data)
+                        delivered += len(data)
+                    return
+                except Exception:
+                    if attempt == self.retries - 1:
+                        raise
+                    # Wait briefly before retrying
+                    await asyncio.sleep(0.5 * (attempt + 1))
         finally:
-            if stream:
-                stream.stop_stream()
-                stream.close()
-            audio_interface.terminate()
+            feed.close()
@@ -0,0 +1,6 @@
+"""Make the ``siminterp`` package under ``src/`` importable without installing it."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
@@ -0,0 +1,27 @@
+"""Hedged translation requests against the bundled mock OpenAI server."""
+
+from __future__ import annotations
+
+from openai import OpenAI
+
+from siminterp.mock_server import MockOpenAIServer, MockSettings
+from siminterp.translation.hedging import HedgePolicy
+from siminterp.translation.openai_translator import OpenAITranslator
+
+
+def test_primary_completes_after_hedge_budget_is_exhausted() -> None:
+    server = MockOpenAIServer(MockSettings(latency=0.3, seed=0))
+    base_url = server.start_in_thread()
+    try:
+        client = OpenAI(api_key="mock", base_url=base_url)
+        policy = HedgePolicy(max_rate=0.1, initial_delay=0.05)
+        translator = OpenAITranslator(client=client, model="gpt-4o-mini", hedge=policy)
+
+        # The first slow request spends the only hedge credit; the second has none left
+        # and must wait for its primary stream instead of failing.
+        assert translator.complete("Translate.", "Hello there.")
+        assert translator.complete("Translate.", "How are you?")
+        assert policy.stats.requests == 2
+        assert policy.stats.hedged == 1
+    finally:
+        server.stop()